@@ -0,0 +1,62 @@
+"""
+Throughput of TempoClock when many tasks share the same beat (chords,
+Ppar), with and without clock stats enabled. Tasks are scheduled in the
+past so the clock runs them as fast as it can. Each row runs about 100k
+tasks, runs with and without stats are interleaved and the median is
+reported. Run with `python benchmarks/bench_clock_batch.py`.
+"""
+
+import statistics
+import threading
+import time
+
+import sc3
+sc3.init()
+
+from sc3.base.clock import TempoClock
+
+
+TOTAL = 100_000
+REPEAT = 11
+
+
+def run(ntasks, stats=False):
+    nbeats = TOTAL // ntasks
+    # All the beats are already elapsed when the clock is created.
+    clock = TempoClock(1000, beats=nbeats + 1)
+    if stats:
+        clock.enable_stats()
+    total = ntasks * nbeats
+    count = 0
+    done = threading.Event()
+
+    def make_task():
+        def task():
+            nonlocal count
+            count += 1
+            if count == total:
+                done.set()
+            return 1
+        return task
+
+    with clock._sched_cond:  # Start all at once.
+        for _ in range(ntasks):
+            clock.sched_abs(1, make_task())
+        start = time.perf_counter()
+    done.wait()
+    elapsed = time.perf_counter() - start
+    clock.stop()
+    return total / elapsed
+
+
+if __name__ == '__main__':
+    for n in (1, 10, 100, 1000):
+        off = []
+        on = []
+        for _ in range(REPEAT):
+            off.append(run(n))
+            on.append(run(n, stats=True))
+        off = statistics.median(off)
+        on = statistics.median(on)
+        print(f'{n:>5} tasks per beat: {off:12.0f} awakes/s, '
+              f'stats: {on:12.0f} awakes/s ({(1 - on / off) * 100:.1f}%)')
@@ -0,0 +1,49 @@
+"""
+Overhead of functions.value for the callables used by responders and
+notifications against inspecting the signature on every call, as value
+did before. Run with `python benchmarks/bench_function_value.py`.
+"""
+
+import inspect
+import timeit
+
+from sc3.base import functions as fn
+
+
+def signature_value(obj, *args, **kwargs):
+    # Previous functions.value.
+    if callable(obj):
+        parameters = inspect.signature(obj).parameters
+        if any(p.kind == p.VAR_POSITIONAL for p in parameters.values()):
+            return obj(*args, **kwargs)
+        else:
+            nargs = len(parameters)
+            return obj(*args[:nargs], **kwargs)
+    else:
+        return obj
+
+
+class Responder():
+    def method(self, msg, time):
+        pass
+
+    def __call__(self, msg, time, addr, recv_port):
+        pass
+
+
+def func(msg, time, addr):
+    pass
+
+
+if __name__ == '__main__':
+    number = 100000
+    obj = Responder()
+    args = (['/msg', 1], 0.0, None, 57120)
+    for name, callable_ in [
+            ('function', func), ('bound method', obj.method),
+            ('callable object', obj), ('lambda', lambda *_: None)]:
+        before = timeit.timeit(
+            lambda: signature_value(callable_, *args), number=number)
+        after = timeit.timeit(lambda: fn.value(callable_, *args), number=number)
+        print(f'{name:>16}: {before / number * 1e6:6.2f} us -> '
+              f'{after / number * 1e6:6.2f} us ({before / after:.1f}x)')
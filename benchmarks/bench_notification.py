@@ -0,0 +1,40 @@
+"""
+Cost of NotificationCenter.notify for objects without registrations, as
+most nodes notified by NodeWatcher, and with one listener, against the
+previous implementation that looked up two weak dictionaries and copied
+the listeners on every notification. Run with
+`python benchmarks/bench_notification.py`.
+"""
+
+import timeit
+
+from sc3.base import functions as fn
+from sc3.base.model import NotificationCenter
+
+
+def previous_notify(registrations, obj, msg, *args, **kwargs):
+    if obj in registrations and msg in registrations[obj]:
+        for listener, action in registrations[obj][msg].copy().items():
+            fn.value(action, obj, msg, listener, *args, **kwargs)
+
+
+class Object():
+    pass
+
+
+if __name__ == '__main__':
+    number = 200000
+    free = Object()
+    node = Object()
+    listener = Object()
+    NotificationCenter.register(
+        node, '/n_end', listener, lambda obj, msg, listener: None)
+    registrations = NotificationCenter._registrations
+    for name, obj in (('no registrations', free), ('one listener', node)):
+        before = timeit.timeit(
+            lambda: previous_notify(registrations, obj, '/n_end'),
+            number=number)
+        after = timeit.timeit(
+            lambda: NotificationCenter.notify(obj, '/n_end'), number=number)
+        print(f'{name:>16}: {before / number * 1e6:5.2f} us -> '
+              f'{after / number * 1e6:5.2f} us ({before / after:.1f}x)')
@@ -0,0 +1,64 @@
+"""
+OSC message decoding cost for /b_setn replies against decoding one
+argument at a time with the get_* functions, as OscMessage did before,
+and cost of receiving a bundle of /b_setn replies when all the messages
+or only the first one are accessed (contents are decoded lazily). Run with `python benchmarks/bench_osc_decode.py`.
+"""
+
+import random
+import timeit
+
+from sc3.base import _osclib as oli
+
+
+def per_arg_decode(dgram):
+    # Previous OscMessage._parse_datagram for the i and f types.
+    address, index = oli.get_string(dgram, 0)
+    type_tag, index = oli.get_string(dgram, index)
+    params = []
+    for param in type_tag[1:]:
+        if param == 'i':
+            val, index = oli.get_int(dgram, index)
+        elif param == 'f':
+            val, index = oli.get_float(dgram, index)
+        params.append(val)
+    return params
+
+
+def make_dgram(n):
+    builder = oli.OscMessageBuilder('/b_setn')
+    for arg in (1, 0, n):
+        builder.add_arg(arg)
+    for _ in range(n):
+        builder.add_arg(random.uniform(-1, 1))
+    return builder.build().dgram
+
+
+def make_bundle(nmsgs, n):
+    builder = oli.OscBundleBuilder(oli.IMMEDIATELY)
+    for _ in range(nmsgs):
+        builder.add_content(oli.OscMessage(make_dgram(n)))
+    return builder.build().dgram
+
+
+if __name__ == '__main__':
+    for n in (16, 160, 1600):
+        dgram = make_dgram(n)
+        assert oli.OscMessage(dgram).params == per_arg_decode(dgram)
+        old = min(timeit.repeat(
+            lambda: per_arg_decode(dgram), number=100, repeat=5)) / 100
+        new = min(timeit.repeat(
+            lambda: oli.OscMessage(dgram).params,
+            number=100, repeat=5)) / 100
+        print(f'{n:>5} floats: per arg {old * 1e6:9.1f} us, '
+              f'struct cache {new * 1e6:9.1f} us ({old / new:.1f}x)')
+    for nmsgs, n in ((64, 1), (16, 400), (4, 1600)):
+        dgram = make_bundle(nmsgs, n)
+        every = min(timeit.repeat(
+            lambda: oli.OscPacket(dgram).recv_items(None),
+            number=100, repeat=5)) / 100
+        first = min(timeit.repeat(
+            lambda: oli.OscPacket(dgram).messages[0].message.params,
+            number=100, repeat=5)) / 100
+        print(f'{nmsgs:>3} x {n:>4} floats bundle: all {every * 1e6:9.1f} us, '
+              f'first {first * 1e6:9.1f} us')
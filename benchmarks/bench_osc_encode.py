@@ -0,0 +1,46 @@
+"""
+OSC message encoding cost for /b_setn messages against the previous
+builder, which concatenated one argument at a time and parsed the result
+back. Run with `python benchmarks/bench_osc_encode.py`.
+"""
+
+import random
+import timeit
+
+from sc3.base import _osclib as oli
+
+
+def concat_build(builder):
+    # Previous OscMessageBuilder.build.
+    dgram = oli.write_string(builder.address)
+    arg_types = ''.join([arg[0] for arg in builder.args])
+    dgram += oli.write_string(',' + arg_types)
+    for arg_type, value in builder.args:
+        if arg_type == builder.ARG_TYPE_STRING:
+            dgram += oli.write_string(value)
+        elif arg_type == builder.ARG_TYPE_INT:
+            dgram += oli.write_int(value)
+        elif arg_type == builder.ARG_TYPE_FLOAT:
+            dgram += oli.write_float(value)
+    return oli.OscMessage(dgram)
+
+
+def make_builder(n):
+    builder = oli.OscMessageBuilder('/b_setn')
+    for arg in (1, 0, n):
+        builder.add_arg(arg)
+    for _ in range(n):
+        builder.add_arg(random.uniform(-1, 1))
+    return builder
+
+
+if __name__ == '__main__':
+    for n in (16, 160, 1600):
+        builder = make_builder(n)
+        assert builder.build().dgram == concat_build(builder).dgram
+        old = min(timeit.repeat(
+            lambda: concat_build(builder), number=100, repeat=5)) / 100
+        new = min(timeit.repeat(
+            lambda: builder.build(), number=100, repeat=5)) / 100
+        print(f'{n:>5} floats: concat {old * 1e6:9.1f} us, '
+              f'single pass {new * 1e6:9.1f} us ({old / new:.1f}x)')
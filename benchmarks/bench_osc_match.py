@@ -0,0 +1,50 @@
+"""
+Dispatch cost of OscFunc.matching responders for received address
+patterns against testing every registered path with the re based
+matcher, as OSCMessagePatternDispatcher did before. Run with
+`python benchmarks/bench_osc_match.py`.
+"""
+
+import timeit
+
+import sc3
+sc3.init()
+
+from sc3.base.responsedefs import OscFunc
+from sc3.base._oscmatch import osc_rematch_pattern
+
+
+def linear_match(active, pattern):
+    # Previous OSCMessagePatternDispatcher.__call__ without evaluation.
+    return [
+        func for key, funcs in active.items()
+        if osc_rematch_pattern(pattern, key) for func in funcs]
+
+
+def run(nresponders, number=2000):
+    funcs = [
+        OscFunc.matching(lambda *_: None, f'/voice/{i}/{param}')
+        for i in range(nresponders // 4)
+        for param in ('freq', 'amp', 'pan', 'gate')]
+    dispatcher = OscFunc.default_matching_dispatcher
+    patterns = ['/voice/*/freq', '/voice/1/*', '/voice/[0-3]/amp', '/other']
+    before = timeit.timeit(
+        lambda: [linear_match(dispatcher.active, p) for p in patterns],
+        number=number // 10) * 10
+    cold = timeit.timeit(
+        lambda: [dispatcher._cache.clear(), *map(dispatcher._match, patterns)],
+        number=number)
+    cached = timeit.timeit(
+        lambda: [*map(dispatcher._match, patterns)], number=number)
+    for f in funcs:
+        f.free()
+    n = number * len(patterns)
+    return n / before, n / cold, n / cached
+
+
+if __name__ == '__main__':
+    for n in (16, 128, 512):
+        before, cold, cached = run(n)
+        print(f'{n:>4} responders: linear {before:10.0f} msg/s, '
+              f'trie {cold:10.0f} msg/s ({cold / before:.1f}x), '
+              f'cached {cached:10.0f} msg/s ({cached / before:.1f}x)')
@@ -0,0 +1,45 @@
+"""
+Cost of issuing and resolving /c_get style queries through the reply
+correlator against a one shot OscFunc per query, as Bus.get did before.
+Replies are passed to the dispatchers directly, without networking. Run
+with `python benchmarks/bench_reply_correlator.py`.
+"""
+
+import time
+
+import sc3
+sc3.init()
+
+from sc3.base.netaddr import NetAddr
+from sc3.base import responsedefs as rdf
+
+
+def one_shot(addr, nbuses):
+    for i in range(nbuses):
+        rdf.OscFunc(
+            lambda msg, *_: None, '/c_set', addr,
+            arg_template=[i]).one_shot()
+    dispatcher = rdf.OscFunc.default_dispatcher
+    for i in range(nbuses):
+        dispatcher(['/c_set', i, 0.5], 0.0, addr, 57120)
+
+
+def correlated(addr, nbuses):
+    correlator = rdf._reply_correlator('/c_set', addr, 1)
+    for i in range(nbuses):
+        correlator.request((i,), lambda msg: None)
+    dispatcher = rdf.OscFunc.default_dispatcher
+    for i in range(nbuses):
+        dispatcher(['/c_set', i, 0.5], 0.0, addr, 57120)
+
+
+if __name__ == '__main__':
+    addr = NetAddr('127.0.0.1', 57110)
+    for nbuses in (10, 100, 500):
+        for name, func in (('one shot', one_shot), ('correlator', correlated)):
+            rounds = 20
+            start = time.perf_counter()
+            for _ in range(rounds):
+                func(addr, nbuses)
+            rate = rounds * nbuses / (time.perf_counter() - start)
+            print(f'{nbuses:>4} buses, {name:>10}: {rate:10.0f} queries/s')
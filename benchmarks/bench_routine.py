@@ -0,0 +1,30 @@
+"""
+Cost of creating and running many short lived routines (grains) with
+Routine and LightRoutine. Run with `python benchmarks/bench_routine.py`.
+"""
+
+import timeit
+
+import sc3
+sc3.init()
+
+from sc3.base.stream import Routine, LightRoutine
+
+
+def grain():
+    yield 0.01
+    yield 0.01
+
+
+def run(cls, n=10000):
+    for _ in range(n):
+        rout = cls(grain)
+        for _ in rout:
+            pass
+
+
+if __name__ == '__main__':
+    n = 10000
+    for cls in (Routine, LightRoutine):
+        t = min(timeit.repeat(lambda: run(cls, n), number=1, repeat=5))
+        print(f'{cls.__name__:>12}: {n / t:10.0f} routines/s')
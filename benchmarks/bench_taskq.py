@@ -0,0 +1,39 @@
+"""
+Scheduler cost per tick against the number of pending tasks.
+
+Each tick does what a clock wakeup does: peek the next time, pop the task
+and reschedule it. The cost per tick should not grow with queue size.
+
+    python benchmarks/bench_taskq.py
+"""
+
+import random
+import timeit
+
+from sc3.base._taskq import TaskQueue
+
+
+def make_queue(n):
+    q = TaskQueue()
+    for i in range(n):
+        q.add(random.random() * 100, object())
+    return q
+
+
+def tick(q):
+    q.peek()
+    prio, task = q.pop()
+    q.peek()
+    q.add(prio + random.random(), task)
+
+
+def main():
+    ticks = 10_000
+    for n in (100, 1_000, 10_000, 100_000):
+        q = make_queue(n)
+        t = timeit.timeit(lambda: tick(q), number=ticks)
+        print(f'{n:>7} tasks: {t / ticks * 1e6:8.3f} us/tick')
+
+
+if __name__ == '__main__':
+    main()
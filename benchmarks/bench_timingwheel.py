@@ -0,0 +1,76 @@
+"""
+Compare TaskQueue and TimingWheel under dense loads of short-delta tasks.
+
+In the scattered workload each task has its own time (granular clouds
+with random durations), each tick pops the next task and reschedules it.
+Here TimingWheel is at best on par with TaskQueue up to about 10k tasks,
+results for larger queues vary across machines.
+
+In the grid workload tasks fall on a 10 ms grid (Pbind-like durations,
+many tasks per time), each tick pops all the due tasks at once with
+pop_due, as clocks do, and reschedules them. TimingWheel sorts each slot
+once instead of sifting every task through the heap and pulls ahead when
+there are hundreds of tasks per slot.
+
+    python benchmarks/bench_timingwheel.py
+"""
+
+import random
+import timeit
+
+from sc3.base._taskq import TaskQueue, TimingWheel
+
+
+QUEUES = (
+    ('TaskQueue', TaskQueue, ()),
+    ('TimingWheel', TimingWheel, (0.001,)))
+
+
+def make_queue(cls, n, *args):
+    q = cls(*args)
+    for i in range(n):
+        q.add(random.random() * 0.1, object())
+    return q
+
+
+def tick(q):
+    prio, task = q.pop()
+    q.peek()
+    q.add(prio + random.random() * 0.05, task)
+
+
+def make_grid_queue(cls, n, *args):
+    q = cls(*args)
+    for i in range(n):
+        q.add(random.randrange(100) * 0.01, object())
+    return q
+
+
+def grid_tick(q):
+    prio = q.peek()[0]
+    for _, task in q.pop_due(prio):
+        q.add(prio + random.randrange(1, 100) * 0.01, task)
+
+
+def main():
+    ticks = 50_000
+    print('scattered:')
+    for n in (1_000, 10_000, 100_000):
+        for name, cls, args in QUEUES:
+            random.seed(0)
+            q = make_queue(cls, n, *args)
+            t = timeit.timeit(lambda: tick(q), number=ticks)
+            print(f'{name:>12} {n:>7} tasks: {t / ticks * 1e6:8.3f} us/tick')
+    ticks = 2_000
+    print('grid (about n / 100 tasks per tick):')
+    for n in (1_000, 10_000, 100_000):
+        for name, cls, args in QUEUES:
+            random.seed(0)
+            q = make_grid_queue(cls, n, *args)
+            t = timeit.timeit(lambda: grid_tick(q), number=ticks)
+            print(f'{name:>12} {n:>7} tasks: '
+                  f'{t / ticks / (n / 100) * 1e6:8.3f} us/task')
+
+
+if __name__ == '__main__':
+    main()
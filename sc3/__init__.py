@@ -33,7 +33,23 @@ def _init_logger():
 
 _libsc3_initialized = False
 
-def init(mode='rt'):
+def init(mode='rt', *, shared_clock_thread=False, timing_wheel=None,
+         sync_nrt=False, osc_loop=None):
+    '''
+    Initialize the library in real time ('rt') or non real time ('nrt')
+    mode. If shared_clock_thread is True SystemClock and all TempoClock
+    instances are run by a single dispatcher thread instead of one
+    thread per clock (rt mode only). If timing_wheel is a number, clocks
+    and the nrt scheduler use a TimingWheel task queue with that slot
+    resolution (in seconds or beats) instead of a binary heap, it only
+    pays off when hundreds of tasks share each slot. If
+    sync_nrt is True, tasks scheduled in nrt mode are run in time order by
+    the thread that calls main.run_until() or main.run_all() instead of a
+    scheduler thread (nrt mode only). If osc_loop is an asyncio event loop,
+    OSC networking is run by that loop instead of dedicated threads, the
+    loop has to be running for messages to be sent and received (rt mode
+    only).
+    '''
     global _libsc3_initialized
     if _libsc3_initialized:
         return
@@ -51,6 +67,10 @@ def init(mode='rt'):
     else:
         raise ValueError(f"invalid mode '{mode}'")
 
+    sc3.base.main.main._shared_clock_thread = shared_clock_thread
+    sc3.base.main.main._timing_wheel = timing_wheel
+    sc3.base.main.main._sync_nrt = sync_nrt
+    sc3.base.main.main._osc_loop = osc_loop
     sc3.base.main.main._init()
     sc3.base.classlibrary.ClassLibrary.init()
     _libsc3_initialized = True
@@ -1,10 +1,11 @@
 
 from abc import ABC, abstractmethod
+import asyncio
+import collections
 import logging
 import threading
 import atexit
 import errno
-import struct
 import socket
 import time
 import subprocess
@@ -21,18 +22,191 @@ from . import functions as fn
 from . import platform as plf
 
 
-__all__ = ['OscUdpInterface', 'OscTcpInterface', 'OscNrtInterface']
+__all__ = [
+    'OscUdpInterface', 'OscTcpInterface', 'OscAsyncioUdpInterface',
+    'OscAsyncioTcpInterface', 'OscNrtInterface']
 
 
 _logger = logging.getLogger(__name__)
 
 
+def _bind_port(sock, port, port_range):
+    # Bind to the first free port in range, returns the port.
+    for i in range(port_range):
+        try:
+            sock.bind(('127.0.0.1', port))
+            return port
+        except OSError as e:
+            if e.errno == errno.EADDRINUSE and i < port_range - 1:
+                port += 1
+            elif e.errno == errno.EADDRINUSE and i == port_range - 1:
+                err = OSError(
+                    f'[Errno {errno.EADDRINUSE}] Port range already '
+                    f'in use: {port}-{port_range - 1}')
+                err.errno = errno.EADDRINUSE
+                raise err from e
+            else:
+                raise
+
+
+def _stream_batch(interface, packets, peername):
+    # Messages of the packets read at once from a TCP stream.
+    batch = []
+    for dgram in packets:
+        try:
+            batch.extend(oli.OscPacket(dgram).recv_items(peername))
+        except oli._PACKET_ERRORS:
+            _logger.warning(f'{str(interface)}: malformed packet', exc_info=True)
+    return batch
+
+
+def _loop_call(loop, func, *args):
+    # Call func in the loop's thread, asyncio objects aren't thread safe.
+    # asyncio.get_running_loop is not available in Python 3.6.
+    if asyncio._get_running_loop() is loop:
+        func(*args)
+    else:
+        loop.call_soon_threadsafe(func, *args)
+
+
+def _loop_run(loop, coro):
+    # Schedule coro in the loop from any thread.
+    if asyncio._get_running_loop() is loop:
+        return loop.create_task(coro)
+    else:
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+class _OscDispatcher():
+    # Evaluates recv functions for received messages in arrival order
+    # from its own thread. Logical time is set to the time of arrival,
+    # as when the functions were scheduled on SystemClock.
+
+    def __init__(self, interface):
+        # The thread is started by the first put and ends with stop.
+        self._interface = interface
+        self._queue = collections.deque()
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+
+    def put(self, batch, arrival, recv_port=None):
+        # batch is a list of (addr, time, msg).
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=type(self).__name__, daemon=True)
+                self._thread.start()
+            self._queue.extend([(*item, arrival, recv_port) for item in batch])
+            self._cond.notify()
+
+    def stop(self):
+        # Pending messages are discarded.
+        with self._cond:
+            self._thread = None
+            self._queue.clear()
+            self._cond.notify()
+
+    def _run(self):
+        queue = self._queue
+        thread = threading.current_thread()
+        while True:
+            with self._cond:
+                while not queue and self._thread is thread:
+                    self._cond.wait()
+                if self._thread is not thread:
+                    return
+            while queue and self._thread is thread:
+                try:
+                    item = queue.popleft()
+                except IndexError:  # Cleared by stop.
+                    break
+                self._dispatch(*item)
+
+    def _dispatch(self, addr, time, msg, arrival, recv_port):
+        addr = nad.NetAddr(addr[0], addr[1])
+        if time is None or time == oli.IMMEDIATELY:
+            time = arrival
+        else:
+            time = clk.SystemClock.osc_to_elapsed_time(time)
+        _libsc3.main.main_tt._m_seconds = arrival
+        port = self._interface.port if recv_port is None else recv_port
+        for func in tuple(self._interface.recv_functions):
+            try:
+                func(msg[:], time, addr, port)
+            except Exception:
+                _logger.error(
+                    'from %s evaluating %s', type(self).__name__,
+                    getattr(func, '__qualname__', func), exc_info=1)
+
+
+class _BundleCoalescer():
+    # Bundles sent to target from the same clock tick with the same timetag
+    # are sent as one bundle, up to max_size bytes, at the end of the tick.
+    # Pending bundles are local to each clock thread. Bundles with
+    # immediate timetag or sent outside clock ticks are sent right away.
+
+    _BUNDLE_HEADER_SIZE = 16  # '#bundle\x00' and timetag.
+
+    def __init__(self, target, max_size):
+        self.target = target
+        self.max_size = max_size
+        self._local = threading.local()
+
+    def send_bundle(self, interface, time, elements):
+        timetag = interface._get_timetag(time)
+        if timetag == oli.IMMEDIATELY:
+            interface.send_bundle(self.target, time, *elements)
+            return
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            if not clk._at_tick_end(self._flush):
+                interface.send_bundle(self.target, time, *elements)
+                return
+            pending = self._local.pending = dict()
+        contents = interface._build_contents(time, elements)
+        key = (interface, timetag)
+        try:
+            group = pending[key]
+        except KeyError:
+            group = pending[key] = [[], self._BUNDLE_HEADER_SIZE]
+        for content in contents:
+            size = 4 + content.size
+            if group[0] and group[1] + size > self.max_size:
+                self._send(interface, timetag, group[0])
+                group[0] = []
+                group[1] = self._BUNDLE_HEADER_SIZE
+            group[0].append(content)
+            group[1] += size
+
+    def _flush(self):
+        pending = self._local.pending
+        self._local.pending = None
+        for (interface, timetag), (contents, _) in pending.items():
+            if contents:
+                self._send(interface, timetag, contents)
+
+    def _send(self, interface, timetag, contents):
+        bndl_builder = oli.OscBundleBuilder(timetag)
+        for content in contents:
+            bndl_builder.add_content(content)
+        interface._send(bndl_builder.build(), self.target)
+
+
 class OscInterface(ABC):
+    # Messages sent with these addresses are built from templates when all
+    # their arguments are int, float or str (Synth, Node.set, NoteEvent).
+    _TEMPLATE_ADDRESSES = ('/s_new', '/n_set')
+    _TEMPLATE_TYPE_TAGS = {int: 'i', float: 'f', str: 's'}
+    _TEMPLATES_SIZE = 256
+
     def __init__(self, port, port_range):
         self._port = port
         self._port_range = port_range
         self._socket = None
         self._recv_functions = set()
+        self._template_addresses = set(self._TEMPLATE_ADDRESSES)
+        self._templates = dict()
+        self._dispatcher = _OscDispatcher(self)
 
     @property
     def port(self):
@@ -75,18 +249,13 @@ class OscInterface(ABC):
             time: OSC timetag as 64bits unsigned integer.
             *msg: OSC message as address followed by values.
         '''
-        addr = nad.NetAddr(addr[0], addr[1])
-
-        if time is None or time == oli.IMMEDIATELY:
-            time = _libsc3.main.elapsed_time()
-        else:
-            time = clk.SystemClock.osc_to_elapsed_time(time)
+        self._dispatcher.put(
+            [(addr, time, list(msg))], _libsc3.main.elapsed_time())
 
-        def sched_func():
-            for func in self.recv_functions:
-                func(list(msg), time, addr, self.port)
-
-        clk.SystemClock.sched(0, sched_func)  # Updates logical time.
+    def _recv_batch(self, batch, recv_port=None):
+        # batch is a list of (addr, time, msg) from the same socket read,
+        # recv_port is the local port, self.port if None.
+        self._dispatcher.put(batch, _libsc3.main.elapsed_time(), recv_port)
 
     def send_msg(self, target, *args):
         '''
@@ -114,8 +283,40 @@ class OscInterface(ABC):
     def _send(self, msg, target):
         pass
 
+    def msg_template(self, address, type_tag):
+        '''
+        Register a template for messages sent to address with arguments of
+        type_tag types ('i', 'f', 'd' or 's', e.g. 'isf'). Messages to
+        address that match a registered type tag are packed from the
+        template. Returns the template.
+        '''
+        key = (address, type_tag)
+        try:
+            return self._templates[key]
+        except KeyError:
+            pass
+        template = oli.OscMessageTemplate(address, type_tag)
+        if len(self._templates) >= self._TEMPLATES_SIZE:
+            self._templates.clear()
+        self._templates[key] = template
+        self._template_addresses.add(address)
+        return template
+
+    def _template_type_tag(self, args):
+        # Returns None if any value needs conversion by _build_msg.
+        type_tags = self._TEMPLATE_TYPE_TAGS
+        tags = [type_tags.get(type(arg)) for arg in args]
+        if None in tags or '[' in args or ']' in args:
+            return None
+        return ''.join(tags)
+
     def _build_msg(self, arg_list):
         # ['/path', arg1, arg2, ..., argN]
+        if arg_list[0] in self._template_addresses:
+            type_tag = self._template_type_tag(arg_list[1:])
+            if type_tag is not None:
+                return self.msg_template(
+                    arg_list[0], type_tag).build(*arg_list[1:])
         msg_builder = oli.OscMessageBuilder(arg_list[0])
         for arg in arg_list[1:]:
             if arg is None:
@@ -148,17 +349,24 @@ class OscInterface(ABC):
         # [time, ['/path', arg1, arg2, ..., argN], [...], ...]
         timetag = self._get_timetag(arg_list[0])
         bndl_builder = oli.OscBundleBuilder(timetag)
-        for arg in arg_list[1:]:
+        for content in self._build_contents(arg_list[0], arg_list[1:]):
+            bndl_builder.add_content(content)
+        return bndl_builder.build()
+
+    def _build_contents(self, time, elements):
+        # Messages and sub-bundles of a bundle sent at time.
+        contents = []
+        for arg in elements:
             if isinstance(arg[0], str):
-                bndl_builder.add_content(self._build_msg(arg))
+                contents.append(self._build_msg(arg))
             elif isinstance(arg[0], (int, float, type(None))):
-                self._check_subtime(arg_list[0], arg[0])
-                bndl_builder.add_content(self._build_bundle(arg))
+                self._check_subtime(time, arg[0])
+                contents.append(self._build_bundle(arg))
             else:
                 raise ValueError(
                     'elements within bundles must be valid '
                     f'OSC messages or bundles: {arg}')
-        return bndl_builder.build()
+        return contents
 
     @staticmethod
     def _get_timetag(time):
@@ -245,7 +453,7 @@ class OscUdpInterface(OscInterface):
         for i in range(self.port_range):
             try:
                 self._server = oli.OSCUDPServer(
-                    ('127.0.0.1', self._port), oli.UDPHandler)
+                    ('127.0.0.1', self._port), self._recv_batch)
                 break
             except OSError as e:
                 if e.errno == errno.EADDRINUSE and i < self.port_range - 1:
@@ -271,14 +479,48 @@ class OscUdpInterface(OscInterface):
         if not self._running:
             return
         self._server.shutdown()
+        self._server.server_close()
         self._server = None
         self._running = False
         self._server_thread = None
+        self._dispatcher.stop()
         _libsc3.main._atexitq.remove(self.stop)
 
     def running(self):
         return self._running
 
+    def open_udp_port(self, port):
+        '''
+        Open an additional port to receive messages, served by the same
+        thread. Return True if the port was opened or is already open.
+        '''
+        if not self._running:
+            raise RuntimeError(f'{type(self).__name__} is not running')
+        if port in self._server.ports:
+            return True
+        try:
+            self._server.add_socket(('127.0.0.1', port))
+            return True
+        except OSError as e:
+            _logger.warning(f'{str(self)}: could not open port {port}: {e}')
+            return False
+
+    @property
+    def ports(self):
+        '''Local ports open to receive messages.'''
+        return self._server.ports if self._server else []
+
+    def stats(self, port=None):
+        '''
+        Return a dict with the number of received, dropped and malformed
+        datagrams since start for port, the main port by default. Dropped
+        datagrams are those discarded by the system because the receive
+        buffer was full, only reported on Linux.
+        '''
+        if self._server is None:
+            return {'received': 0, 'dropped': 0, 'malformed': 0}
+        return self._server.stats(port)
+
     def _send(self, msg, target):  # override
         self._server.socket.sendto(msg.dgram, target)
 
@@ -288,31 +530,22 @@ class OscTcpInterface(OscInterface):
     OSC client over TCP. OscTcpInterface instances aren't reusable.
     '''
 
+    _RECV_SIZE = 2 ** 16
+
     def __init__(self, port=57120, port_range=10):
         super().__init__(port, port_range)
         self._tcp_thread = None
         self._run_thread = False
         self._is_connected = False
+        self._send_lock = threading.Lock()
+        self._write_buffer = None
+        self._write_buffer_size = 0
         self.proto = 'tcp'
 
     def bind(self):
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        for i in range(self.port_range):
-            try:
-                self._socket.bind(('127.0.0.1', self._port))
-                break
-            except OSError as e:
-                if e.errno == errno.EADDRINUSE and i < self.port_range - 1:
-                    self._port += 1
-                elif e.errno == errno.EADDRINUSE and i == self.port_range - 1:
-                    err = OSError(
-                        f'[Errno {errno.EADDRINUSE}] Port range already '
-                        f'in use: {self.port}-{self.port_range - 1}')
-                    err.errno = errno.EADDRINUSE
-                    raise err from e
-                else:
-                    raise
+        self._port = _bind_port(self._socket, self._port, self.port_range)
 
     def connect(self, target):
         self._socket.connect(target)  # Exception on failure.
@@ -326,23 +559,18 @@ class OscTcpInterface(OscInterface):
 
     def _tcp_run(self):
         self._run_thread = True
+        reader = oli.OscStreamReader()
+        peername = self._socket.getpeername()
         while self._run_thread:
             try:
-                data = self._socket.recv(4)
+                data = self._socket.recv(self._RECV_SIZE)
                 if len(data) == 0:
                     self._is_connected = False
                     break
-                size = struct.unpack('>i', data)[0]
-                data = self._socket.recv(size)
-                if len(data) == 0:
-                    self._is_connected = False
-                    break
-                packet = oli.OscPacket(data)
-                for timed_msg in packet.messages:
-                    msg = [timed_msg.message.address, *timed_msg.message.params]
-                    _libsc3.main._osc_interface.recv(
-                        self._socket.getpeername(), timed_msg.time, *msg)
-            except OSError as e:
+                batch = _stream_batch(self, reader.feed(data), peername)
+                if batch:
+                    _libsc3.main._osc_interface._recv_batch(batch)
+            except (OSError, oli.OscParseError) as e:
                 if self._run_thread:  # Log for not intentional disconnects.
                     _logger.error(f'{str(self)}: {str(e)}')
                 self._is_connected = False
@@ -372,18 +600,370 @@ class OscTcpInterface(OscInterface):
     def disconnect(self):
         self._run_thread = False
         self._tcp_thread = None
+        try:
+            self._flush_writes()
+        except OSError:
+            pass
         self._socket.shutdown(socket.SHUT_RDWR)
         self._is_connected = False  # Is sync.
         self._socket.close()  # OSError if underlying error.
+        self._dispatcher.stop()
         _libsc3.main._atexitq.remove(self.disconnect)
 
     @property
     def is_connected(self):
         return self._is_connected
 
+    def enable_coalescing(self, max_size=2 ** 16):
+        '''
+        Packets sent from clock tasks are written to a buffer that is sent
+        at the end of the clock tick that started it, or before if it gets
+        bigger than max_size bytes. Packets sent outside clock tasks send
+        the buffer right away.
+        '''
+        if max_size <= 0:
+            raise ValueError(f'invalid max_size {max_size}')
+        with self._send_lock:
+            self._write_buffer_size = max_size
+            if self._write_buffer is None:
+                self._write_buffer = bytearray()
+
+    def disable_coalescing(self):
+        self._flush_writes()
+        with self._send_lock:
+            self._write_buffer = None
+            self._write_buffer_size = 0
+
     def _send(self, msg, _=None):  # override
-        self._socket.send(msg.size.to_bytes(4, 'big'))
-        self._socket.send(msg.dgram)
+        # One write with the size prefix, frames from different threads
+        # can't be interleaved.
+        frame = msg.size.to_bytes(4, 'big') + msg.dgram
+        with self._send_lock:
+            buffer = self._write_buffer
+            if buffer is None:
+                self._socket.sendall(frame)
+                return
+            was_empty = not buffer
+            buffer += frame
+            # A non empty buffer has a flush registered by some tick, but
+            # frames sent outside ticks don't wait for it.
+            if len(buffer) < self._write_buffer_size and (
+                    clk._at_tick_end(self._flush_writes) if was_empty
+                    else clk._in_tick()):
+                return
+            self._socket.sendall(buffer)
+            buffer.clear()
+
+    def _flush_writes(self):
+        with self._send_lock:
+            if self._write_buffer:
+                self._socket.sendall(self._write_buffer)
+                self._write_buffer.clear()
+
+
+class _OscDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, interface, port):
+        self._interface = interface
+        self._port = port
+
+    def datagram_received(self, data, addr):
+        self._interface._datagram_received(data, addr, self._port)
+
+    def error_received(self, exc):
+        _logger.debug(f'{str(self._interface)}: {str(exc)}')
+
+    def pause_writing(self):
+        self._interface._pause_writing()
+
+    def resume_writing(self):
+        self._interface._resume_writing()
+
+
+class OscAsyncioUdpInterface(OscInterface):
+    '''
+    OSC over UDP run by an asyncio event loop instead of a receive thread.
+    Sending is thread safe, the messages are sent from the loop's thread.
+    '''
+
+    def __init__(self, port=57120, port_range=10, loop=None):
+        super().__init__(port, port_range)
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._transport = None
+        self._sockets = dict()  # port: socket
+        self._transports = dict()  # port: transport
+        self._stats = dict()  # port: [received, malformed]
+        self._pending = []
+        self._running = False
+        self._paused = False
+        self._drain_waiter = None
+        self.proto = 'udp'
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def start(self):
+        if self._running:
+            return
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self._port = _bind_port(sock, self._port, self.port_range)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+        self._running = True
+        self._add_socket(sock)
+        _libsc3.main._atexitq.add(
+            _libsc3.main._atexitprio.NETWORKING + 1, self.stop)
+
+    def open_udp_port(self, port):
+        '''
+        Open an additional port to receive messages, served by the same
+        loop. Return True if the port was opened or is already open.
+        '''
+        if not self._running:
+            raise RuntimeError(f'{type(self).__name__} is not running')
+        if port in self._sockets:
+            return True
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind(('127.0.0.1', port))
+        except OSError as e:
+            sock.close()
+            _logger.warning(f'{str(self)}: could not open port {port}: {e}')
+            return False
+        self._add_socket(sock)
+        return True
+
+    @property
+    def ports(self):
+        '''Local ports open to receive messages.'''
+        return list(self._sockets)
+
+    def _add_socket(self, sock):
+        sock.setblocking(False)
+        port = sock.getsockname()[1]
+        self._sockets[port] = sock
+        self._stats[port] = [0, 0]
+        _loop_run(self._loop, self._create_endpoint(port, sock))
+
+    async def _create_endpoint(self, port, sock):
+        transport, _ = await self._loop.create_datagram_endpoint(
+            lambda: _OscDatagramProtocol(self, port), sock=sock)
+        if not self._running:
+            transport.close()
+            return
+        self._transports[port] = transport
+        if port == self._port:
+            self._transport = transport
+            for dgram, target in self._pending:
+                transport.sendto(dgram, target)
+            self._pending.clear()
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        _loop_call(self._loop, self._close)
+        self._dispatcher.stop()
+        _libsc3.main._atexitq.remove(self.stop)
+
+    def _close(self):
+        for port, sock in list(self._sockets.items()):
+            transport = self._transports.get(port)
+            if transport is None:
+                sock.close()
+            else:
+                transport.close()
+        self._sockets.clear()
+        self._transports.clear()
+        self._transport = None
+        self._pending.clear()
+        self._resume_writing()
+
+    def running(self):
+        return self._running
+
+    def stats(self, port=None):
+        '''
+        Return a dict with the number of received, dropped and malformed
+        datagrams since start for port, the main port by default. Dropped
+        datagrams are not reported.
+        '''
+        if port is None:
+            port = self._port
+        try:
+            received, malformed = self._stats[port]
+        except KeyError:
+            raise ValueError(f'port {port} is not open') from None
+        return {'received': received, 'dropped': 0, 'malformed': malformed}
+
+    async def drain(self):
+        '''
+        Wait until the transport's write buffer is below its high water
+        mark. Call from the loop.
+        '''
+        if not self._paused:
+            return
+        if self._drain_waiter is None:
+            self._drain_waiter = self._loop.create_future()
+        await asyncio.shield(self._drain_waiter)
+
+    def _pause_writing(self):
+        self._paused = True
+
+    def _resume_writing(self):
+        self._paused = False
+        if self._drain_waiter is not None:
+            if not self._drain_waiter.done():
+                self._drain_waiter.set_result(None)
+            self._drain_waiter = None
+
+    def _datagram_received(self, data, addr, port):
+        stats = self._stats[port]
+        stats[0] += 1
+        try:
+            batch = oli.OscPacket(data).recv_items(addr)
+        except oli._PACKET_ERRORS:
+            stats[1] += 1
+            _logger.debug(
+                f'malformed datagram from {addr}: {data}', exc_info=True)
+            return
+        if batch:
+            self._recv_batch(batch, port)
+
+    def _send(self, msg, target):  # override
+        _loop_call(self._loop, self._sendto, msg.dgram, target)
+
+    def _sendto(self, dgram, target):
+        if self._transport is not None:
+            self._transport.sendto(dgram, target)
+        elif self._running:
+            self._pending.append((dgram, target))
+
+
+class OscAsyncioTcpInterface(OscInterface):
+    '''
+    OSC client over TCP run by an asyncio event loop. Instances aren't
+    reusable.
+    '''
+
+    _RECV_SIZE = 2 ** 16
+
+    def __init__(self, port=57120, port_range=10, loop=None):
+        super().__init__(port, port_range)
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._writer = None
+        self._reader_task = None
+        self._is_connected = False
+        self.proto = 'tcp'
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def bind(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._port = _bind_port(self._socket, self._port, self.port_range)
+        self._socket.setblocking(False)
+
+    async def async_connect(self, target):
+        await self._loop.sock_connect(self._socket, target)  # Exception on failure.
+        reader, self._writer = await asyncio.open_connection(sock=self._socket)
+        self._is_connected = True
+        self._reader_task = self._loop.create_task(self._read(reader))
+        _libsc3.main._atexitq.add(
+            _libsc3.main._atexitprio.NETWORKING, self.disconnect)
+
+    def connect(self, target):
+        # Blocks until connected, can't be called from the loop's thread.
+        if asyncio._get_running_loop() is self._loop:
+            raise RuntimeError("use async_connect from the loop's thread")
+        asyncio.run_coroutine_threadsafe(
+            self.async_connect(target), self._loop).result()
+
+    def try_connect(self, target, timeout=3, on_complete=None, on_failure=None):
+        async def tcp_connect_func():
+            dt = 0.2
+            attempts = int(timeout / dt)
+            for i in range(attempts):
+                try:
+                    await self.async_connect(target)
+                    fn.value(on_complete, self)
+                    return
+                except ConnectionRefusedError:
+                    await asyncio.sleep(dt)
+                except OSError as e:
+                    if e.errno == errno.EADDRNOTAVAIL:
+                        await asyncio.sleep(dt)
+                    else:
+                        raise
+            _logger.warning(f"{str(self)} couldn't establish connection")
+            fn.value(on_failure, self)
+
+        _loop_run(self._loop, tcp_connect_func())
+
+    async def _read(self, reader):
+        stream_reader = oli.OscStreamReader()
+        peername = self._socket.getpeername()
+        try:
+            while True:
+                data = await reader.read(self._RECV_SIZE)
+                if not data:
+                    break
+                batch = _stream_batch(
+                    self, stream_reader.feed(data), peername)
+                if batch:
+                    _libsc3.main._osc_interface._recv_batch(batch)
+        except (OSError, oli.OscParseError) as e:
+            if self._is_connected:  # Log for not intentional disconnects.
+                _logger.error(f'{str(self)}: {str(e)}')
+        finally:
+            self._is_connected = False
+
+    def disconnect(self):
+        self._is_connected = False
+        _loop_call(self._loop, self._close)
+        self._dispatcher.stop()
+        _libsc3.main._atexitq.remove(self.disconnect)
+
+    def _close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        else:
+            self._socket.close()
+
+    @property
+    def is_connected(self):
+        return self._is_connected
+
+    async def drain(self):
+        '''
+        Wait until the stream's write buffer is below its high water
+        mark. Call from the loop.
+        '''
+        if self._writer is not None:
+            await self._writer.drain()
+
+    def _send(self, msg, _=None):  # override
+        _loop_call(
+            self._loop, self._write, msg.size.to_bytes(4, 'big') + msg.dgram)
+
+    def _write(self, frame):
+        if self._writer is None:
+            _logger.warning(f'{str(self)}: not connected')
+            return
+        self._writer.write(frame)
 
 
 class OscNrtInterface(OscInterface):
@@ -392,6 +972,8 @@ class OscNrtInterface(OscInterface):
         self._port_range = None
         self._socket = None
         self._recv_functions = None
+        self._template_addresses = set(self._TEMPLATE_ADDRESSES)
+        self._templates = dict()
         self.proto = None
 
     def init(self):
@@ -518,7 +1100,7 @@ class OscScore():
             universal_newlines=True)
 
         def render_wait_thread():
-            # clk.defer is used so code is excecuted within _main_lock.
+            # clk.defer is used so code is excecuted by AppClock's thread.
             self._render_proc.wait()
             exit_code = self._render_proc.poll()
             if exit_code == 0:
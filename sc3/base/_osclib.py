@@ -33,14 +33,17 @@ For more information, please refer to <http://unlicense.org/>
 
 
 import struct
-import socketserver
+import re
+import socket
+import selectors
+import threading
 import sys
 import logging
 import collections
+import itertools
+import operator
 from typing import Union, Tuple, Any, Iterator, List
 
-from . import main as _libsc3
-
 
 _logger = logging.getLogger(__name__)
 
@@ -117,6 +120,10 @@ def write_string(val: str) -> bytes:
     return dgram
 
 
+# memoryview has no index(), regular expressions search buffers in place.
+_find_nul = re.compile(b'\x00').search
+
+
 def get_string(dgram: bytes, start_index: int) -> Tuple[str, int]:
     """Get a python string from the datagram, starting at pos start_index.
 
@@ -137,27 +144,28 @@ def get_string(dgram: bytes, start_index: int) -> Tuple[str, int]:
     """
     if start_index < 0:
         raise OscTypeParseError('start_index < 0')
-    offset = 0
+    if type(dgram) is memoryview:
+        match = _find_nul(dgram, start_index)
+        if match is None:
+            raise OscTypeParseError('Could not parse datagram')
+        end_index = match.start()
+    else:
+        try:
+            end_index = dgram.index(b'\x00', start_index)
+        except (ValueError, TypeError) as e:
+            raise OscTypeParseError('Could not parse datagram') from e
+    offset = end_index - start_index
+    # Align to a byte word.
+    offset += _STRING_DGRAM_PAD - offset % _STRING_DGRAM_PAD
+    # Python slices do not raise an IndexError past the last index,
+    # do it ourselves.
+    if start_index + offset > len(dgram):
+        raise OscTypeParseError('Datagram is too short')
     try:
-        if (len(dgram) > start_index + _STRING_DGRAM_PAD
-                and dgram[start_index + _STRING_DGRAM_PAD] == _EMPTY_STR_DGRAM):
-            return '', start_index + _STRING_DGRAM_PAD
-        while dgram[start_index + offset] != 0:
-            offset += 1
-        # Align to a byte word.
-        if (offset) % _STRING_DGRAM_PAD == 0:
-            offset += _STRING_DGRAM_PAD
-        else:
-            offset += (-offset % _STRING_DGRAM_PAD)
-        # Python slices do not raise an IndexError past the last index,
-        # do it ourselves.
-        if offset > len(dgram[start_index:]):
-            raise OscTypeParseError('Datagram is too short')
-        data_str = dgram[start_index:start_index + offset]
-        return data_str.replace(b'\x00', b'').decode('utf-8'), start_index + offset
-    except IndexError as e:
-        raise OscTypeParseError('Could not parse datagram') from e
-    except TypeError as e:
+        return (
+            str(dgram[start_index:end_index], 'utf-8'),
+            start_index + offset)
+    except UnicodeDecodeError as e:
         raise OscTypeParseError('Could not parse datagram') from e
 
 
@@ -187,7 +195,7 @@ def get_int(dgram: bytes, start_index: int) -> Tuple[int, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _INT_DGRAM_LEN:
+        if len(dgram) - start_index < _INT_DGRAM_LEN:
             raise OscTypeParseError('Datagram is too short')
         return (
             struct.unpack(
@@ -218,7 +226,7 @@ def get_timetag(dgram: bytes, start_index: int) -> Tuple[int, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _TIMETAG_DGRAM_LEN:
+        if len(dgram) - start_index < _TIMETAG_DGRAM_LEN:
             raise OscTypeParseError('Datagram is too short')
         return (
             struct.unpack(
@@ -254,11 +262,11 @@ def get_float(dgram: bytes, start_index: int) -> Tuple[float, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _FLOAT_DGRAM_LEN:
+        if len(dgram) - start_index < _FLOAT_DGRAM_LEN:
             # Noticed that Reaktor doesn't send the last bunch of \x00 needed to make
             # the float representation complete in some cases, thus we pad here to
             # account for that.
-            dgram = dgram + b'\x00' * (_FLOAT_DGRAM_LEN - len(dgram[start_index:]))
+            dgram = dgram + b'\x00' * (_FLOAT_DGRAM_LEN - len(dgram) + start_index)
         return (
             struct.unpack(
                 '>f', dgram[start_index:start_index + _FLOAT_DGRAM_LEN])[0],
@@ -293,7 +301,7 @@ def get_double(dgram: bytes, start_index: int) -> Tuple[float, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _DOUBLE_DGRAM_LEN:
+        if len(dgram) - start_index < _DOUBLE_DGRAM_LEN:
             raise ParseError('Datagram is too short')
         return (
             struct.unpack(
@@ -340,9 +348,9 @@ def get_blob(dgram: bytes, start_index: int) -> Tuple[bytes, int]:
     # Make the size a multiple of 32 bits.
     total_size = size + (-size % _BLOB_DGRAM_PAD)
     end_index = int_offset + size
-    if end_index - start_index > len(dgram[start_index:]):
+    if end_index > len(dgram):
         raise OscTypeParseError('Datagram is too short')
-    return dgram[int_offset:int_offset + size], int_offset + total_size
+    return bytes(dgram[int_offset:int_offset + size]), int_offset + total_size
 
 
 def write_rgba(val: bytes) -> bytes:
@@ -371,7 +379,7 @@ def get_rgba(dgram: bytes, start_index: int) -> Tuple[bytes, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _INT_DGRAM_LEN:
+        if len(dgram) - start_index < _INT_DGRAM_LEN:
             raise OscTypeParseError('Datagram is too short')
         return (
             struct.unpack(
@@ -413,7 +421,7 @@ def get_midi(dgram: bytes, start_index: int) -> Tuple[Tuple[int, int, int, int],
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _INT_DGRAM_LEN:
+        if len(dgram) - start_index < _INT_DGRAM_LEN:
             raise OscTypeParseError('Datagram is too short')
         val = struct.unpack(
             '>I', dgram[start_index:start_index + _INT_DGRAM_LEN])[0]
@@ -441,8 +449,20 @@ class OscBundle(object):
         Raises:
           ParseError: if the datagram could not be parsed into an OscBundle.
         """
-        # Interesting stuff starts after the initial b"#bundle\x00".
         self._dgram = dgram
+        self._parse_datagram()
+
+    @classmethod
+    def _unparsed(cls, dgram: bytes) -> 'OscBundle':
+        # Bundles made by OscBundleBuilder are only parsed if needed.
+        obj = cls.__new__(cls)
+        obj._dgram = dgram
+        obj._contents = None
+        return obj
+
+    def _parse_datagram(self) -> None:
+        # Interesting stuff starts after the initial b"#bundle\x00".
+        self._contents = []
         index = len(_BUNDLE_PREFIX_DGRAM)
         try:
             self._timetag, index = get_timetag(self._dgram, index)
@@ -455,27 +475,30 @@ class OscBundle(object):
     # Return type is actually List[OscBundle], but that would require import annotations from __future__, which is
     # python 3.7+ only.
     def _parse_contents(self, index: int) -> Any:
+        # Contents are memoryview slices of the datagram and messages are
+        # decoded when accessed.
         contents = []
+        view = memoryview(self._dgram)
         try:
             # An OSC Bundle Element consists of its size and its contents.
             # The size is an int32 representing the number of 8-bit bytes in the
             # contents, and will always be a multiple of 4. The contents are either
             # an OSC Message or an OSC Bundle.
-            while self._dgram[index:]:
+            while index < len(view):
                 # Get the sub content size.
-                content_size, index = get_int(self._dgram, index)
+                content_size, index = get_int(view, index)
                 # Get the datagram for the sub content.
-                content_dgram = self._dgram[index:index + content_size]
+                content_dgram = view[index:index + content_size]
                 # Increment our position index up to the next possible content.
                 index += content_size
                 # Parse the content into an OSC message or bundle.
-                if OscBundle.dgram_is_bundle(content_dgram):
+                if content_dgram[:8] == _BUNDLE_PREFIX_DGRAM:
                     contents.append(OscBundle(content_dgram))
-                elif OscMessage.dgram_is_message(content_dgram):
-                    contents.append(OscMessage(content_dgram))
+                elif content_dgram[:1] == b'/':
+                    contents.append(OscMessage._unparsed(content_dgram))
                 else:
                     _logger.warning('Could not identify content type '
-                                    f'of dgram {content_dgram}')
+                                    f'of dgram {bytes(content_dgram)}')
         except (OscTypeParseError, OscMessageParseError, IndexError) as e:
             raise OscBundleParseError(
                 "Could not parse a content datagram") from e
@@ -490,11 +513,15 @@ class OscBundle(object):
     @property
     def timetag(self) -> int:
         """Returns the timetag associated with this bundle."""
+        if self._contents is None:
+            self._parse_datagram()
         return self._timetag
 
     @property
     def num_contents(self) -> int:
         """Shortcut for len(*bundle) returning the number of elements."""
+        if self._contents is None:
+            self._parse_datagram()
         return len(self._contents)
 
     @property
@@ -505,14 +532,18 @@ class OscBundle(object):
     @property
     def dgram(self) -> bytes:
         """Returns the datagram from which this bundle was built."""
-        return self._dgram
+        return bytes(self._dgram)
 
     def content(self, index) -> Any:
         """Returns the bundle's content 0-indexed."""
+        if self._contents is None:
+            self._parse_datagram()
         return self._contents[index]
 
     def __iter__(self) -> Iterator[Any]:
         """Returns an iterator over the bundle's content."""
+        if self._contents is None:
+            self._parse_datagram()
         return iter(self._contents)
 
 
@@ -543,23 +574,135 @@ class OscBundleBuilder(object):
         Raises:
           - BuildError: if we could not build the bundle.
         """
-        dgram = _BUNDLE_PREFIX_DGRAM
+        dgram = [_BUNDLE_PREFIX_DGRAM]
         try:
-            dgram += write_timetag(self._timetag)
+            dgram.append(write_timetag(self._timetag))
             for content in self._contents:
                 if type(content) is OscMessage or type(content) is OscBundle:
-                    size = content.size
-                    dgram += write_int(size)
-                    dgram += content.dgram
+                    dgram.append(write_int(content.size))
+                    dgram.append(content.dgram)
                 else:
                     raise OscBundleBuildError(
                         'Content must be either OscBundle or OscMessage '
                         f'found {type(content).__name__}')
-            return OscBundle(dgram)
+            return OscBundle._unparsed(b''.join(dgram))
         except OscTypeBuildError as e:
             raise OscBundleBuildError('Could not build the bundle') from e
 
 
+### OSC Message Decoder ###
+
+
+# Decoding operations compiled from type tags. Consecutive fixed size
+# types are read with a single Struct, e.g. ',iif...f' is '>ii1600f'.
+# Datagrams can be bytes or a memoryview: bundle elements are memoryview
+# slices of the received datagram, not copies, and received messages are
+# decoded on first access to address or params.
+_OP_STRUCT = 0
+_OP_CONST = 1
+_OP_STRING = 2
+_OP_BLOB = 3
+_OP_MIDI = 4
+_OP_ARRAY_START = 5
+_OP_ARRAY_STOP = 6
+
+_DECODE_CODES = {'i': 'i', 'f': 'f', 'd': 'd', 'r': 'I', 't': 'Q'}
+_DECODE_CONSTS = {'T': True, 'F': False}
+_DECODE_OPS = {
+    's': _OP_STRING, 'b': _OP_BLOB, 'm': _OP_MIDI,
+    '[': _OP_ARRAY_START, ']': _OP_ARRAY_STOP}
+
+_DECODERS_CACHE_SIZE = 1024
+_decoders = dict()
+
+
+def _compile_type_tag(type_tag: str) -> Tuple[Tuple[int, Any], ...]:
+    ops = []
+    codes = []
+    depth = 0
+    for param in type_tag:
+        code = _DECODE_CODES.get(param)
+        if code is not None:
+            codes.append(code)
+            continue
+        if codes:
+            ops.append((_OP_STRUCT, struct.Struct('>' + ''.join(codes))))
+            codes = []
+        if param in _DECODE_CONSTS:
+            ops.append((_OP_CONST, _DECODE_CONSTS[param]))
+        elif param in _DECODE_OPS:
+            if param == '[':
+                depth += 1
+            elif param == ']':
+                depth -= 1
+                if depth < 0:
+                    raise OscMessageParseError(
+                        f'Unexpected closing bracket in type tag: {type_tag}')
+            ops.append((_DECODE_OPS[param], None))
+        else:
+            # TODO: Support more exotic types as described in the specification.
+            _logger.warning(f'Unhandled parameter type: {param}')
+    if codes:
+        ops.append((_OP_STRUCT, struct.Struct('>' + ''.join(codes))))
+    if depth != 0:
+        raise OscMessageParseError(
+            f'Missing closing bracket in type tag: {type_tag}')
+    return tuple(ops)
+
+
+def _decode_args(dgram: bytes, index: int, type_tag: str) -> List[Any]:
+    """Decode the arguments of a message given its type tag.
+
+    Values are read in place with unpack_from, runs of fixed size values
+    are decoded by one call to a Struct compiled and cached per type tag.
+
+    Raises:
+      ParseError if the datagram could not be parsed.
+    """
+    try:
+        ops = _decoders[type_tag]
+    except KeyError:
+        ops = _compile_type_tag(type_tag)
+        if len(_decoders) >= _DECODERS_CACHE_SIZE:
+            _decoders.clear()
+        _decoders[type_tag] = ops
+    params = []
+    param_stack = [params]
+    for op, arg in ops:
+        if op == _OP_STRUCT:
+            try:
+                param_stack[-1].extend(arg.unpack_from(dgram, index))
+            except struct.error as e:
+                missing = arg.size - (len(dgram) - index)
+                if 0 < missing < _FLOAT_DGRAM_LEN and arg.format[-1:] == 'f':
+                    # Noticed that Reaktor doesn't send the last bunch of
+                    # \x00 needed to make the float representation complete
+                    # in some cases, thus we pad here to account for that.
+                    param_stack[-1].extend(arg.unpack_from(
+                        bytes(dgram) + b'\x00' * missing, index))
+                else:
+                    raise OscTypeParseError('Datagram is too short') from e
+            index += arg.size
+        elif op == _OP_CONST:
+            param_stack[-1].append(arg)
+        elif op == _OP_STRING:
+            val, index = get_string(dgram, index)
+            param_stack[-1].append(val)
+        elif op == _OP_BLOB:
+            val, index = get_blob(dgram, index)
+            param_stack[-1].append(val)
+        elif op == _OP_MIDI:
+            val, index = get_midi(dgram, index)
+            param_stack[-1].append(val)
+        elif op == _OP_ARRAY_START:
+            array = []
+            param_stack[-1].append(array)
+            param_stack.append(array)
+        else:
+            param_stack.pop()
+    return params
+
+
 ### OSC Message ###
 
 
@@ -575,62 +718,29 @@ class OscMessage(object):
         self._parameters = []
         self._parse_datagram()
 
+    @classmethod
+    def _unparsed(cls, dgram: bytes) -> 'OscMessage':
+        # Messages made by OscMessageBuilder and received messages are only
+        # parsed if needed, errors are raised on access.
+        obj = cls.__new__(cls)
+        obj._dgram = dgram
+        obj._parameters = None
+        return obj
+
     def _parse_datagram(self) -> None:
+        self._parameters = []
+        dgram = self._dgram
         try:
-            self._address_regexp, index = get_string(self._dgram, 0)
-            if not self._dgram[index:]:
+            self._address_regexp, index = get_string(dgram, 0)
+            if index >= len(dgram):
                 # No params is legit, just return now.
                 return
 
             # Get the parameters types.
-            type_tag, index = get_string(self._dgram, index)
+            type_tag, index = get_string(dgram, index)
             if type_tag.startswith(','):
                 type_tag = type_tag[1:]
-
-            params = []
-            param_stack = [params]
-            # Parse each parameter given its type.
-            for param in type_tag:
-                if param == "i":  # Integer.
-                    val, index = get_int(self._dgram, index)
-                elif param == "f":  # Float.
-                    val, index = get_float(self._dgram, index)
-                elif param == "d":  # Double.
-                    val, index = get_double(self._dgram, index)
-                elif param == "s":  # String.
-                    val, index = get_string(self._dgram, index)
-                elif param == "b":  # Blob.
-                    val, index = get_blob(self._dgram, index)
-                elif param == "r":  # RGBA.
-                    val, index = get_rgba(self._dgram, index)
-                elif param == "m":  # MIDI.
-                    val, index = get_midi(self._dgram, index)
-                elif param == "t":  # osc time tag:
-                    val, index = get_timetag(self._dgram, index)
-                elif param == "T":  # True.
-                    val = True
-                elif param == "F":  # False.
-                    val = False
-                elif param == "[":  # Array start.
-                    array = []
-                    param_stack[-1].append(array)
-                    param_stack.append(array)
-                elif param == "]":  # Array stop.
-                    if len(param_stack) < 2:
-                        raise OscMessageParseError(
-                            'Unexpected closing bracket '
-                            f'in type tag: {type_tag}')
-                    param_stack.pop()
-                # TODO: Support more exotic types as described in the specification.
-                else:
-                    _logger.warning(f'Unhandled parameter type: {param}')
-                    continue
-                if param not in "[]":
-                    param_stack[-1].append(val)
-            if len(param_stack) != 1:
-                raise OscMessageParseError(
-                    f'Missing closing bracket in type tag: {type_tag}')
-            self._parameters = params
+            self._parameters = _decode_args(dgram, index, type_tag)
         except OscTypeParseError as e:
             raise OscMessageParseError(
                 'Found incorrect datagram, ignoring it') from e
@@ -638,6 +748,8 @@ class OscMessage(object):
     @property
     def address(self) -> str:
         """Returns the OSC address regular expression."""
+        if self._parameters is None:
+            self._parse_datagram()
         return self._address_regexp
 
     @staticmethod
@@ -653,7 +765,7 @@ class OscMessage(object):
     @property
     def dgram(self) -> bytes:
         """Returns the datagram from which this message was built."""
-        return self._dgram
+        return bytes(self._dgram)
 
     @property
     def params(self) -> List[Any]:
@@ -662,6 +774,8 @@ class OscMessage(object):
 
     def __iter__(self) -> Iterator[float]:
         """Returns an iterator over the parameters of this message."""
+        if self._parameters is None:
+            self._parse_datagram()
         return iter(self._parameters)
 
 
@@ -783,6 +897,10 @@ class OscMessageBuilder(object):
         """
         Builds an OscMessage from the current state of this builder.
 
+        The datagram is packed in one pass with a single struct format,
+        consecutive arguments of the same numeric type are packed as a run
+        (e.g. '>1600f').
+
         Raises:
           - BuildError: if the message could not be build or if the address
             was empty.
@@ -791,47 +909,164 @@ class OscMessageBuilder(object):
         """
         if not self._address:
             raise OscMessageBuildError('OSC addresses cannot be empty')
-        dgram = b''
         try:
-            # Write the address.
-            dgram += write_string(self._address)
+            address = write_string(self._address)
             if not self._args:
-                dgram += write_string(',')
-                return OscMessage(dgram)
-
-            # Write the parameters.
-            arg_types = "".join([arg[0] for arg in self._args])
-            dgram += write_string(',' + arg_types)
-            for arg_type, value in self._args:
-                if arg_type == self.ARG_TYPE_STRING:
-                    dgram += write_string(value)
-                elif arg_type == self.ARG_TYPE_INT:
-                    dgram += write_int(value)
-                elif arg_type == self.ARG_TYPE_FLOAT:
-                    dgram += write_float(value)
-                elif arg_type == self.ARG_TYPE_DOUBLE:
-                    dgram += write_double(value)
+                return OscMessage._unparsed(address + b',\x00\x00\x00')
+
+            type_tag = write_string(
+                ',' + ''.join([arg[0] for arg in self._args]))
+            fmt = ['>%ds%ds' % (len(address), len(type_tag))]
+            values = [address, type_tag]
+            for arg_type, group in itertools.groupby(self._args, _arg_type):
+                code = _FIXED_SIZE_CODES.get(arg_type)
+                if code is not None:
+                    count = len(values)
+                    values.extend(map(_arg_value, group))
+                    fmt.append('%d%s' % (len(values) - count, code))
+                elif arg_type in _NO_DATA_TYPES:
+                    continue
+                elif arg_type == self.ARG_TYPE_STRING:
+                    for _, value in group:
+                        value = write_string(value)
+                        fmt.append('%ds' % len(value))
+                        values.append(value)
                 elif arg_type == self.ARG_TYPE_BLOB:
-                    dgram += write_blob(value)
-                elif arg_type == self.ARG_TYPE_RGBA:
-                    dgram += write_rgba(value)
+                    for _, value in group:
+                        if not value:
+                            raise OscTypeBuildError(
+                                'Blob value cannot be empty')
+                        value = bytes(value)
+                        size = len(value) + (-len(value) % _BLOB_DGRAM_PAD)
+                        fmt.append('i%ds' % size)
+                        values.append(len(value))
+                        values.append(value)
                 elif arg_type == self.ARG_TYPE_MIDI:
-                    dgram += write_midi(value)
-                elif arg_type in (self.ARG_TYPE_TRUE,
-                                  self.ARG_TYPE_FALSE,
-                                  self.ARG_TYPE_ARRAY_START,
-                                  self.ARG_TYPE_ARRAY_STOP,
-                                  self.ARG_TYPE_NIL):
-                    continue
+                    for _, value in group:
+                        fmt.append('4s')
+                        values.append(write_midi(value))
                 else:
                     raise OscMessageBuildError(
                         f'Incorrect parameter type found {arg_type}')
 
-            return OscMessage(dgram)
+            try:
+                dgram = struct.pack(''.join(fmt), *values)
+            except struct.error as e:
+                raise OscTypeBuildError('Wrong argument value passed') from e
+            return OscMessage._unparsed(dgram)
         except OscTypeBuildError as e:
             raise OscMessageBuildError(f'Could not build the message') from e
 
 
+_arg_type = operator.itemgetter(0)
+_arg_value = operator.itemgetter(1)
+
+# Struct codes of fixed size argument types, packed in runs.
+_FIXED_SIZE_CODES = {
+    OscMessageBuilder.ARG_TYPE_INT: 'i',
+    OscMessageBuilder.ARG_TYPE_FLOAT: 'f',
+    OscMessageBuilder.ARG_TYPE_DOUBLE: 'd',
+    OscMessageBuilder.ARG_TYPE_RGBA: 'I'}
+
+_NO_DATA_TYPES = frozenset((
+    OscMessageBuilder.ARG_TYPE_TRUE, OscMessageBuilder.ARG_TYPE_FALSE,
+    OscMessageBuilder.ARG_TYPE_NIL, OscMessageBuilder.ARG_TYPE_ARRAY_START,
+    OscMessageBuilder.ARG_TYPE_ARRAY_STOP))
+
+
+### OSC Message Template ###
+
+
+class OscMessageTemplate(object):
+    """Pre-encoded address and type tag for messages of a fixed shape.
+
+    Only the argument values are packed each time the template is built.
+    Supported types are int, float, double and string, string arguments
+    are encoded with a bounded cache because they are mostly control names.
+    """
+
+    _SUPPORTED_ARG_TYPES = {'i': 'i', 'f': 'f', 'd': 'd', 's': None}
+    _STRINGS_CACHE_SIZE = 1024
+    _strings = dict()
+
+    def __init__(self, address: str, type_tag: str) -> None:
+        """Initialize a template for a message shape.
+
+        Args:
+          - address: The osc address of the message.
+          - type_tag: The arguments types without leading comma.
+        Raises:
+          - ValueError: if a type is not supported.
+        """
+        if not address:
+            raise OscMessageBuildError('OSC addresses cannot be empty')
+        codes = []
+        for arg_type in type_tag:
+            if arg_type not in self._SUPPORTED_ARG_TYPES:
+                raise ValueError(
+                    f'arg_type must be one of {tuple(self._SUPPORTED_ARG_TYPES)}')
+            codes.append(self._SUPPORTED_ARG_TYPES[arg_type] or '%ds')
+        self._address = address
+        self._type_tag = type_tag
+        self._prefix = write_string(address) + write_string(',' + type_tag)
+        self._nargs = len(type_tag)
+        self._string_slots = tuple(
+            i for i, arg_type in enumerate(type_tag) if arg_type == 's')
+        if self._string_slots:
+            self._struct = None
+            self._format = '>%ds' % len(self._prefix) + ''.join(codes)
+        else:
+            self._struct = struct.Struct(
+                '>%ds' % len(self._prefix) + ''.join(codes))
+
+    @property
+    def address(self) -> str:
+        """Returns the OSC address of the template."""
+        return self._address
+
+    @property
+    def type_tag(self) -> str:
+        """Returns the arguments types of the template."""
+        return self._type_tag
+
+    @classmethod
+    def _encode_string(cls, val: str) -> bytes:
+        try:
+            return cls._strings[val]
+        except KeyError:
+            pass
+        except TypeError as e:
+            raise OscTypeBuildError('Incorrect string, could not encode') from e
+        dgram = write_string(val)
+        if len(cls._strings) >= cls._STRINGS_CACHE_SIZE:
+            cls._strings.clear()
+        cls._strings[val] = dgram
+        return dgram
+
+    def build(self, *args) -> OscMessage:
+        """Builds an OscMessage from the values of the arguments.
+
+        Raises:
+          - BuildError: if the values don't match the template.
+        """
+        if len(args) != self._nargs:
+            raise OscMessageBuildError(
+                f'template {self._address} ,{self._type_tag} '
+                f'expects {self._nargs} arguments, got {len(args)}')
+        try:
+            if self._struct is not None:
+                return OscMessage._unparsed(self._struct.pack(self._prefix, *args))
+            args = list(args)
+            sizes = []
+            for i in self._string_slots:
+                args[i] = self._encode_string(args[i])
+                sizes.append(len(args[i]))
+            fmt = self._format % tuple(sizes)
+            return OscMessage._unparsed(struct.pack(fmt, self._prefix, *args))
+        except (struct.error, OscTypeBuildError) as e:
+            raise OscMessageBuildError('Could not build the message') from e
+
+
 ### OSC Packet ###
 
 
@@ -846,7 +1081,7 @@ class OscPacket():
             self._messages = self._get_bundle_messages(OscBundle(dgram))
             self._messages = sorted(self._messages, key=lambda x: x.time or 0)
         elif OscMessage.dgram_is_message(dgram):
-            self._messages = [TimedMessage(None, OscMessage(dgram))]
+            self._messages = [TimedMessage(None, OscMessage._unparsed(dgram))]
         else:
             # Empty packet (because UDP).
             raise OscParseError('OSC packet should at least contain '
@@ -856,6 +1091,14 @@ class OscPacket():
     def messages(self):
         return self._messages
 
+    def recv_items(self, client_address):
+        """Returns a list of (client_address, timetag, [address, *params])
+        for each message, as passed to OscInterface._recv_batch."""
+        return [
+            (client_address, timed_msg.time,
+             [timed_msg.message.address, *timed_msg.message.params])
+            for timed_msg in self._messages]
+
     def _get_bundle_messages(self, bundle):
         messages = []
         for content in bundle:
@@ -866,30 +1109,251 @@ class OscPacket():
         return messages
 
 
+# Exceptions raised by OscPacket for malformed packets.
+_PACKET_ERRORS = (OscParseError, ValueError, IndexError, struct.error)
+
+
+### OSC Stream ###
+
+
+class OscStreamReader(object):
+    """Splits a byte stream into int32 size prefixed OSC packets (TCP).
+
+    Data can be fed in chunks of any size, incomplete packets are kept
+    until the rest arrives.
+    """
+
+    _SIZE_STRUCT = struct.Struct('>i')
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received data and return the complete packets.
+
+        Raises:
+          - ParseError: if a packet size is negative, the stream can't be
+            read any further.
+        """
+        buffer = self._buffer
+        buffer += data
+        packets = []
+        end = len(buffer)
+        index = 0
+        while end - index >= _INT_DGRAM_LEN:
+            size = self._SIZE_STRUCT.unpack_from(buffer, index)[0]
+            if size < 0:
+                raise OscParseError(f'invalid packet size {size}')
+            start = index + _INT_DGRAM_LEN
+            if end - start < size:
+                break
+            packets.append(bytes(buffer[start:start + size]))
+            index = start + size
+        if index:
+            del buffer[:index]
+        return packets
+
+
 ### OSC Server ###
 
 
-class UDPHandler(socketserver.BaseRequestHandler):
-    def handle(self):  # override
-        packet = OscPacket(self.request[0])
-        for timed_msg in packet.messages:
-            msg = [timed_msg.message.address, *timed_msg.message.params]
-            _libsc3.main._osc_interface.recv(
-                self.client_address, timed_msg.time, *msg)
-        # NOTE: Exception are handled by BaseServer.handle_error, "The default action is to print the traceback to standard error and continue handling further requests."
-        # NOTE: "The type of self.request is different for datagram or stream services. For stream services, self.request is a socket object; for datagram services, self.request is a pair of string and socket."
+class OSCUDPServer():
+    """Receives OSC packets from non blocking UDP sockets.
+
+    The socket bound to server_address is also used for sending, more
+    receiving sockets can be added with add_socket(), all are served by
+    the same selector loop. Up to MAX_BATCH datagrams pending on a socket
+    are read on each wakeup, the rest are left for the next select so
+    a flooded socket doesn't starve the others. Datagrams are parsed and
+    passed to handler as a list of (client_address, timetag,
+    [address, *params]) along with the local port. Counts of received,
+    dropped (by the kernel because the receive buffer was full, only
+    reported on Linux) and malformed datagrams are kept per port in
+    stats().
+    """
+
+    RCVBUF_SIZE = 2 ** 22
+    MAX_BATCH = 64
+    _SO_RXQ_OVFL = 40  # Linux, not defined in socket.
+
+    def __init__(self, server_address, handler):
+        self._handler = handler
+        self._ancbufsize = 0
+        if sys.platform.startswith('linux'):
+            self._ancbufsize = socket.CMSG_SPACE(4)
+        self._lock = threading.Lock()
+        self._sockets = dict()  # port: socket, including not registered.
+        self._stats = dict()  # port: [received, dropped, malformed]
+        self._pending = []  # Sockets to register by the loop's thread.
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        try:
+            self._socket = self._new_socket(server_address)
+        except OSError:
+            self._selector.close()
+            self._wakeup_r.close()
+            self._wakeup_w.close()
+            raise
+        self._port = self._socket.getsockname()[1]
+        self._add(self._socket)
+        self._shutdown_request = False
+        self._is_shut_down = threading.Event()
+        self._is_shut_down.set()
 
+    @property
+    def socket(self):
+        return self._socket
 
-class OSCUDPServer(socketserver.UDPServer):
-    def verify_request(self, request, client_address):  # override
-        return (OscBundle.dgram_is_bundle(request[0]) or
-                OscMessage.dgram_is_message(request[0]))
+    @property
+    def server_address(self):
+        return self._socket.getsockname()
 
-    def handle_error(self, request, client_address):  # override
-        _logger.error(
-            'Exception happened during processing '
-            f'request from {client_address}',
-            exc_info=sys.exc_info())
+    @property
+    def ports(self):
+        """Local ports of all receiving sockets, the first is the main."""
+        with self._lock:
+            return list(self._sockets)
+
+    def add_socket(self, server_address):
+        """Binds a new receiving socket and returns its local port."""
+        sock = self._new_socket(server_address)
+        port = sock.getsockname()[1]
+        self._add(sock)
+        self._wakeup_w.send(b'\x00')
+        return port
+
+    def stats(self, port=None):
+        """Returns a dict with received, dropped and malformed counts for
+        port, the main socket's port by default."""
+        if port is None:
+            port = self._port
+        try:
+            received, dropped, malformed = self._stats[port]
+        except KeyError:
+            raise ValueError(f'port {port} is not open') from None
+        return {
+            'received': received,
+            'dropped': dropped,
+            'malformed': malformed}
+
+    def _new_socket(self, server_address):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, self.RCVBUF_SIZE)
+            sock.bind(server_address)
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        if self._ancbufsize:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, self._SO_RXQ_OVFL, 1)
+            except OSError:
+                pass  # No drop count, recvmsg returns no ancillary data.
+        return sock
+
+    def _add(self, sock):
+        port = sock.getsockname()[1]
+        with self._lock:
+            self._sockets[port] = sock
+            self._stats[port] = [0, 0, 0]
+            self._pending.append(sock)
+
+    def _register_pending(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+        for sock in pending:
+            self._selector.register(
+                sock, selectors.EVENT_READ, sock.getsockname()[1])
+
+    def serve_forever(self):
+        self._is_shut_down.clear()
+        try:
+            self._register_pending()
+            while not self._shutdown_request:
+                for key, _ in self._selector.select():
+                    if key.fileobj is self._wakeup_r:
+                        self._drain_wakeup()
+                        self._register_pending()
+                    else:
+                        port = key.data
+                        self._handle_datagrams(
+                            self._recv_datagrams(key.fileobj, port), port)
+        finally:
+            self._shutdown_request = False
+            self._is_shut_down.set()
+
+    def shutdown(self):
+        """Stops the serve_forever loop and waits until it's done."""
+        self._shutdown_request = True
+        self._wakeup_w.send(b'\x00')
+        self._is_shut_down.wait()
+
+    def server_close(self):
+        self._selector.close()
+        with self._lock:
+            for sock in self._sockets.values():
+                sock.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_r.recv(64):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _recv_datagrams(self, sock, port):
+        datagrams = []
+        stats = self._stats[port]
+        try:
+            if self._ancbufsize:
+                recvmsg = sock.recvmsg
+                ancbufsize = self._ancbufsize
+                for _ in range(self.MAX_BATCH):
+                    dgram, ancdata, _, addr = recvmsg(65536, ancbufsize)
+                    datagrams.append((dgram, addr))
+                    for level, type_, data in ancdata:
+                        if level == socket.SOL_SOCKET\
+                        and type_ == self._SO_RXQ_OVFL:
+                            # Kernel's total count for the socket.
+                            stats[1] = int.from_bytes(data, sys.byteorder)
+            else:
+                recvfrom = sock.recvfrom
+                for _ in range(self.MAX_BATCH):
+                    datagrams.append(recvfrom(65536))
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            # Windows raises ConnectionResetError for ICMP port unreachable
+            # on UDP sockets, the socket is still usable.
+            _logger.debug('error reading UDP socket', exc_info=True)
+        stats[0] += len(datagrams)
+        return datagrams
+
+    def _handle_datagrams(self, datagrams, port):
+        batch = []
+        for dgram, client_address in datagrams:
+            try:
+                batch.extend(OscPacket(dgram).recv_items(client_address))
+            except _PACKET_ERRORS:
+                self._stats[port][2] += 1
+                _logger.debug(
+                    f'malformed datagram from {client_address}: {dgram}',
+                    exc_info=True)
+        if not batch:
+            return
+        try:
+            self._handler(batch, port)
+        except Exception:
+            _logger.error(
+                'Exception happened during processing of OSC messages',
+                exc_info=sys.exc_info())
 
 
 # class ThreadingOSCUDPServer(socketserver.ThreadingMixIn, OSCUDPServer):
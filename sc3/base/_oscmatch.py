@@ -1,3 +1,4 @@
+import functools
 import re
 
 
@@ -151,3 +152,85 @@ def osc_match_pattern(pattern, address):
     except StopIteration:
         # pattern mal formado en algunos casos
         return False
+
+
+### Address space ###
+
+_WILDCARDS = frozenset('*?[{')
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_segment(segment):
+    # Returns None for literal segments, else the fullmatch function
+    # of the segment rewritten as re. '*' can't match '/' because
+    # addresses are matched segment by segment.
+    if _WILDCARDS.isdisjoint(segment):
+        return None
+    segment = re.sub(_rewrite_pattern, _rewrite_func, segment)
+    try:
+        return re.compile(segment).fullmatch
+    except re.error:
+        return _no_match
+
+
+def _no_match(_):
+    return None
+
+
+class OscAddressSpace():
+    # Concrete OSC addresses stored as a trie of path segments to be
+    # matched by address patterns. Literal segments of a pattern are
+    # dictionary lookups, only the children of a node are tested against
+    # a wildcard segment.
+
+    def __init__(self):
+        self._root = dict()  # segment: [children, address or None]
+
+    def add(self, address):
+        node = None
+        children = self._root
+        for segment in address.split('/'):
+            try:
+                node = children[segment]
+            except KeyError:
+                node = children[segment] = [dict(), None]
+            children = node[0]
+        node[1] = address
+
+    def remove(self, address):
+        path = []
+        children = self._root
+        for segment in address.split('/'):
+            try:
+                node = children[segment]
+            except KeyError:
+                return
+            path.append((children, segment, node))
+            children = node[0]
+        node[1] = None
+        for children, segment, node in reversed(path):  # Prune.
+            if node[0] or node[1] is not None:
+                break
+            del children[segment]
+
+    def match(self, pattern):
+        '''Return the list of stored addresses matched by pattern.'''
+        nodes = [self._root]
+        segments = pattern.split('/')
+        last = len(segments) - 1
+        for i, segment in enumerate(segments):
+            matcher = _compile_segment(segment)
+            next_nodes = []
+            for children in nodes:
+                if matcher is None:
+                    node = children.get(segment)
+                    if node is not None:
+                        next_nodes.append(node)
+                else:
+                    next_nodes.extend(
+                        node for key, node in children.items() if matcher(key))
+            if i == last:
+                return [node[1] for node in next_nodes if node[1] is not None]
+            nodes = [node[0] for node in next_nodes if node[0]]
+            if not nodes:
+                return []
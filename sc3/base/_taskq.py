@@ -1,9 +1,11 @@
 
 import heapq
 import itertools
+import bisect
+import math
 
 
-__all__ = ['TaskQueue']
+__all__ = ['TaskQueue', 'TimingWheel']
 
 
 class TaskQueue():
@@ -11,10 +13,17 @@ class TaskQueue():
     This class is an encapsulation of the algorithm found in heapq
     documentation. heapq module in itself use the same principles as
     SuperCollider's clocks implementation. TaskQueue is not thread safe.
+
+    Removed entries are marked in place and discarded lazily. The root of
+    the heap is always kept valid so peek is O(1) and the marked entries
+    are compacted when they become the majority of the heap.
     """
 
     class _REMOVED(): pass
 
+    _COMPACT_THRESHOLD = 64
+    '''Minimum number of removed entries before compaction is considered.'''
+
     def __init__(self):
         self._init()
 
@@ -37,67 +46,248 @@ class TaskQueue():
         '''Remove an existing task. Does nothing if not found.'''
         try:
             entry = self._entry_finder.pop(task)
-            entry[-1] = type(self)._REMOVED
-            self._removed_counter += 1
         except KeyError:
             return
+        entry[-1] = type(self)._REMOVED
+        self._removed_counter += 1
+        if self._removed_counter > self._COMPACT_THRESHOLD\
+        and self._removed_counter > len(self._queue) // 2:
+            self._compact()
+        else:
+            self._clean_root()
 
     def pop(self):
         '''
         Remove and return the lowest prio entry as a tuple (prio, task).
         Raise KeyError if empty.
         '''
-        while self._queue:
-            prio, count, task = heapq.heappop(self._queue)
-            if task is not type(self)._REMOVED:
-                del self._entry_finder[task]
-                return (prio, task)
-            else:
+        if not self._entry_finder:
+            raise KeyError('pop from an empty task queue')
+        prio, _, task = heapq.heappop(self._queue)
+        del self._entry_finder[task]
+        self._clean_root()
+        return (prio, task)
+
+    def pop_due(self, limit):
+        '''
+        Remove and return all the entries with prio lower or equal than
+        limit as a list of tuples (prio, task) in queue order.
+        '''
+        ret = []
+        queue = self._queue
+        entry_finder = self._entry_finder
+        removed = type(self)._REMOVED
+        while queue and queue[0][0] <= limit:
+            prio, _, task = heapq.heappop(queue)
+            if task is removed:
                 self._removed_counter -= 1
-        raise KeyError('pop from an empty task queue')
+            else:
+                del entry_finder[task]
+                ret.append((prio, task))
+        self._clean_root()
+        return ret
 
     def peek(self, smallest=True):
         '''
         Return the lowest/highest prio entry as a tuple (prio, task) without
-        removing it. Raise KeyError if empty.
+        removing it. Raise KeyError if empty. Highest prio peek is O(n).
         '''
-        if self._queue:
+        if self._entry_finder:
             if smallest:
-                prio, count, task = heapq.nsmallest(
-                    1, self._queue, key=self._small_key)[0]
+                prio, _, task = self._queue[0]
             else:
-                prio, count, task = heapq.nlargest(
-                    1, self._queue, key=self._large_key)[0]
-            if task is not self._REMOVED:
-                return (prio, task)
+                prio, _, task = max(self._entry_finder.values())
+            return (prio, task)
         raise KeyError('peek from an empty task queue')
 
-    def _small_key(self, item):
-        if item[2] is type(self)._REMOVED:
-            return [float('inf')] * 2
-        else:
-            return item[:2]
+    def _clean_root(self):
+        # Keep the root of the heap a valid entry.
+        queue = self._queue
+        removed = type(self)._REMOVED
+        while queue and queue[0][-1] is removed:
+            heapq.heappop(queue)
+            self._removed_counter -= 1
 
-    def _large_key(self, item):
-        if item[2] is type(self)._REMOVED:
-            return [float('-inf')] * 2
-        else:
-            return item[:2]
+    def _compact(self):
+        self._queue = [e for e in self._queue if e[-1] is not self._REMOVED]
+        heapq.heapify(self._queue)
+        self._removed_counter = 0
 
     def empty(self):
         '''Return True if queue is empty.'''
-        return (len(self._queue) - self._removed_counter) == 0
+        return not self._entry_finder
 
     def clear(self):
         '''Reset the queue to initial state (remove all tasks).'''
         self._init()
 
+    def __len__(self):
+        return len(self._entry_finder)
+
     def __iter__(self):
         # FIXME: Returns a generator but creates the whole list first.
-        queue = heapq.nsmallest(len(self._queue), self._queue)
+        queue = sorted(self._entry_finder.values())
         for prio, count, task in queue:
-            if task is not type(self)._REMOVED:
-                yield (prio, task)
+            yield (prio, task)
 
     # def __copy__(self):
     #     ...
+
+
+class TimingWheel():
+    """
+    Task queue with the same interface as TaskQueue that groups tasks in
+    time slots of fixed resolution. Tasks are sorted by prio once per
+    slot when the slot becomes the first one and keep exact insertion
+    order for same prio entries. Removing is O(1), entries are discarded
+    lazily. Adding to an existing slot other than the first is an O(1)
+    append, adding to the first slot once it's sorted is an insort, O(k)
+    in the slot's size, and opening a new slot pushes it in a heap of
+    occupied slots, O(log s) in the number of slots. The cost of
+    scheduling depends on the number of distinct slots in use rather
+    than on the number of tasks. This is useful for dense event loads
+    where many tasks fall within the same slot, with hundreds of tasks
+    per slot popped with pop_due it is faster than TaskQueue, with few
+    tasks per slot it is slower (see benchmarks/bench_timingwheel.py).
+    TimingWheel is not thread safe.
+    """
+
+    class _REMOVED(): pass
+
+    class _Slot():
+        __slots__ = ('entries', 'live', 'pos', 'sorted')
+
+        def __init__(self):
+            self.entries = []
+            self.live = 0
+            self.pos = 0
+            self.sorted = False
+
+    def __init__(self, resolution=0.001):
+        if resolution <= 0:
+            raise ValueError(f'invalid resolution {resolution}')
+        self._resolution = resolution
+        self._init()
+
+    def _init(self):
+        self._slots = {}
+        self._ticks = []
+        self._entry_finder = {}
+        self._counter = itertools.count()
+
+    @property
+    def resolution(self):
+        return self._resolution
+
+    def add(self, prio, task):
+        '''Add a new task or update the prio of an existing task.'''
+        if task in self._entry_finder:
+            self.remove(task)
+        tick = math.floor(prio / self._resolution)
+        entry = [prio, next(self._counter), task, tick]
+        self._entry_finder[task] = entry
+        slot = self._slots.get(tick)
+        if slot is None:
+            slot = self._slots[tick] = self._Slot()
+            heapq.heappush(self._ticks, tick)
+        if slot.sorted:
+            bisect.insort(slot.entries, entry, slot.pos)
+        else:
+            slot.entries.append(entry)
+        slot.live += 1
+
+    def remove(self, task):
+        '''Remove an existing task. Does nothing if not found.'''
+        try:
+            entry = self._entry_finder.pop(task)
+        except KeyError:
+            return
+        entry[2] = type(self)._REMOVED
+        slot = self._slots[entry[3]]
+        slot.live -= 1
+        if slot.live == 0:
+            del self._slots[entry[3]]  # Tick is discarded lazily.
+
+    def _head(self):
+        # Return the first slot with its position at the first valid entry.
+        ticks = self._ticks
+        removed = type(self)._REMOVED
+        while ticks:
+            slot = self._slots.get(ticks[0])
+            if slot is None:
+                heapq.heappop(ticks)
+                continue
+            if not slot.sorted:
+                slot.entries = [
+                    e for e in slot.entries if e[2] is not removed]
+                slot.entries.sort()
+                slot.pos = 0
+                slot.sorted = True
+            entries = slot.entries
+            while entries[slot.pos][2] is removed:
+                slot.pos += 1
+            return slot
+        return None
+
+    def pop(self):
+        '''
+        Remove and return the lowest prio entry as a tuple (prio, task).
+        Raise KeyError if empty.
+        '''
+        slot = self._head()
+        if slot is None:
+            raise KeyError('pop from an empty task queue')
+        prio, _, task, tick = slot.entries[slot.pos]
+        slot.pos += 1
+        slot.live -= 1
+        del self._entry_finder[task]
+        if slot.live == 0:
+            del self._slots[tick]
+            heapq.heappop(self._ticks)
+        elif slot.pos > 64 and slot.pos > len(slot.entries) // 2:
+            del slot.entries[:slot.pos]
+            slot.pos = 0
+        return (prio, task)
+
+    def pop_due(self, limit):
+        '''
+        Remove and return all the entries with prio lower or equal than
+        limit as a list of tuples (prio, task) in queue order.
+        '''
+        ret = []
+        while True:
+            slot = self._head()
+            if slot is None or slot.entries[slot.pos][0] > limit:
+                return ret
+            ret.append(self.pop())
+
+    def peek(self, smallest=True):
+        '''
+        Return the lowest/highest prio entry as a tuple (prio, task) without
+        removing it. Raise KeyError if empty. Highest prio peek is O(n).
+        '''
+        if smallest:
+            slot = self._head()
+            if slot is not None:
+                prio, _, task, _ = slot.entries[slot.pos]
+                return (prio, task)
+        elif self._entry_finder:
+            prio, _, task, _ = max(self._entry_finder.values())
+            return (prio, task)
+        raise KeyError('peek from an empty task queue')
+
+    def empty(self):
+        '''Return True if queue is empty.'''
+        return not self._entry_finder
+
+    def clear(self):
+        '''Reset the queue to initial state (remove all tasks).'''
+        self._init()
+
+    def __len__(self):
+        return len(self._entry_finder)
+
+    def __iter__(self):
+        queue = sorted(self._entry_finder.values())
+        for prio, count, task, tick in queue:
+            yield (prio, task)
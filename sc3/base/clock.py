@@ -2,7 +2,10 @@
 
 import logging
 import threading
+import collections
+import asyncio
 import time as _time
+import math
 import sys
 import traceback
 import weakref
@@ -18,7 +21,8 @@ from . import stream as stm
 
 
 __all__ = [
-    'SystemClock', 'Scheduler', 'AppClock', 'Quant', 'TempoClock', 'defer']
+    'SystemClock', 'Scheduler', 'AppClock', 'Quant', 'TempoClock',
+    'AsyncioClock', 'defer']
 
 
 _logger = logging.getLogger(__name__)
@@ -34,6 +38,198 @@ class ClockNotRunning(ClockError):
 
 ### Clocks for timing threads ###
 
+# Each clock owns the lock of its task queue (clocks run by the shared
+# dispatcher use the dispatcher's lock). Tasks are popped with the lock
+# acquired but run with the lock released, so a slow task only delays its
+# own clock and a task on one clock can schedule on any other clock.
+# Scheduling from other threads (sched, sched_abs, play) and changes to a
+# TempoClock time base (tempo, etempo, beats) are handed off by acquiring
+# the target clock's lock, updating the queue or time base and notifying
+# its thread to recompute the next wakeup. Logical time, main.current_tt,
+# is local to each thread in rt mode.
+
+# Condition.wait(timeout) usually wakes up late (timer slack, GIL handoff).
+# RT clocks can optionally sleep until spin_margin seconds before the
+# deadline and busy wait from there. The lateness of each wakeup is
+# recorded, along with the rest of the clock stats, only when stats are
+# enabled, in a ring buffer of _STATS_SIZE samples by default.
+
+_STATS_SIZE = 1024
+
+
+def _timed_wait(cond, timeout, margin):
+    # Call with acquired lock, the caller must recompute the timeout and
+    # call again until the deadline is reached.
+    if margin is None:
+        cond.wait(timeout)
+    elif timeout > margin:
+        cond.wait(timeout - margin)
+    else:
+        cond.release()
+        try:
+            _time.sleep(0)  # Yield the GIL while spinning.
+        finally:
+            cond.acquire()
+
+
+def _check_margin(value):
+    if value is not None and (not isinstance(value, (int, float))
+                              or isinstance(value, bool) or value < 0):
+        raise ValueError(f'invalid spin margin {value}')
+    return value
+
+
+def _percentiles(samples, percentiles):
+    # Nearest rank, None if there are no samples.
+    samples = sorted(samples)
+    n = len(samples)
+    ret = dict()
+    for p in percentiles:
+        if not 0 <= p <= 100:
+            raise ValueError(f'invalid percentile {p}')
+        if n == 0:
+            ret[p] = None
+        else:
+            ret[p] = samples[max(0, -(-p * n // 100) - 1)]
+    return ret
+
+
+# Tasks due at the same time are run as a batch, a clock tick. Code run
+# by a task can defer work to the end of the tick, e.g. to send all the
+# bundles of the tick together. Callbacks are local to each clock thread.
+
+_tick = threading.local()
+
+
+def _at_tick_end(func):
+    # Returns False if not called from a clock tick.
+    callbacks = getattr(_tick, 'callbacks', None)
+    if callbacks is None:
+        return False
+    callbacks.append(func)
+    return True
+
+
+def _in_tick():
+    # Returns True if called from a clock tick.
+    return getattr(_tick, 'callbacks', None) is not None
+
+
+def _end_tick(callbacks):
+    # Call with the clock's lock released.
+    while callbacks:
+        func = callbacks.pop(0)
+        try:
+            func()
+        except Exception:
+            _logger.error(
+                'from %s at the end of clock tick',
+                getattr(func, '__qualname__', func), exc_info=1)
+
+
+class _ClockStats():
+    # Optional instrumentation of a clock or scheduler. Wakeups are kept in
+    # a ring buffer of (time, lateness, queue depth) tuples. Task runs are
+    # kept flat in another one, a None followed by perf_counter() marks a
+    # wakeup and the tasks of each batch are followed by perf_counter() at
+    # its end. The tasks of a batch share the time since the previous
+    # counter equally. This way the hot loop appends once per task and
+    # reads the counter once per batch, the cost includes the clock's own
+    # work between batches. Aggregation is done by snapshot.
+
+    def __init__(self, size):
+        self.wakeups = collections.deque(maxlen=size)
+        self.tasks = collections.deque(maxlen=4 * size)
+        self.wakeup = self.wakeups.append  # (time, lateness, depth)
+        self.task = self.tasks.append  # None, task or perf_counter()
+
+    def _costs(self):
+        # May be taken in the middle of a batch, tasks before the first
+        # counter may be from a partly evicted batch.
+        prev = None
+        batch = []
+        for entry in list(self.tasks):
+            if entry is None:
+                prev = None
+            elif type(entry) is float:
+                if prev is not None and batch:
+                    cost = (entry - prev) / len(batch)
+                    for task in batch:
+                        yield task, cost
+                prev = entry
+                batch = []
+            else:
+                batch.append(entry)
+
+    def lateness(self, percentiles):
+        return _percentiles([w[1] for w in list(self.wakeups)], percentiles)
+
+    def snapshot(self):
+        wakeups = list(self.wakeups)
+        tasks = dict()
+        for task, cost in self._costs():
+            try:
+                key = task.func.__qualname__
+            except AttributeError:
+                key = type(task).__qualname__
+            entry = tasks.get(key)
+            if entry is None:
+                tasks[key] = {'count': 1, 'total': cost, 'max': cost}
+            else:
+                entry['count'] += 1
+                entry['total'] += cost
+                if cost > entry['max']:
+                    entry['max'] = cost
+        for entry in tasks.values():
+            entry['mean'] = entry['total'] / entry['count']
+        return {
+            'wakeups': len(wakeups),
+            'lateness': _percentiles(
+                [w[1] for w in wakeups], (50, 90, 99, 100)),
+            'queue_depth': max((w[2] for w in wakeups), default=0),
+            'tasks': tasks,
+            'history': wakeups}
+
+
+def _check_stats_size(size):
+    if not isinstance(size, int) or size < 1:
+        raise ValueError(f'invalid stats size {size}')
+    return size
+
+
+class _ClockStatsMixin():
+    # Stats interface of clocks and schedulers that keep an optional
+    # _ClockStats in _stats. SystemClock and AppClock get it through their
+    # metaclasses because their methods are called on the class.
+
+    def enable_stats(self, size=_STATS_SIZE):
+        '''
+        Record queue depth and lateness of the last size wakeups and the
+        execution time of at least the last size tasks by function name,
+        see stats(). Tasks run at the same time share the time of their
+        batch equally. Lateness is always zero for the nrt scheduler.
+        '''
+        self._stats = _ClockStats(_check_stats_size(size))
+
+    def disable_stats(self):
+        self._stats = None
+
+    def stats(self):
+        '''
+        Return a snapshot of the recorded statistics as a dictionary or
+        None if stats are not enabled.
+        '''
+        if self._stats is not None:
+            return self._stats.snapshot()
+
+    def lateness(self, percentiles=(50, 90, 99, 100)):
+        '''
+        Return a dictionary with the percentiles of the lateness in seconds
+        of the recorded wakeups or None if stats are not enabled.
+        '''
+        if self._stats is not None:
+            return self._stats.lateness(percentiles)
+
 
 class MetaClock(type):
     _pure_nrt = False  # Must be set by sub metaclasses in __init__.
@@ -88,18 +284,24 @@ class Clock(metaclass=MetaClock):
     pass
 
 
-class MetaSystemClock(MetaClock):
+class MetaSystemClock(_ClockStatsMixin, MetaClock):
     def __init__(cls, *_):
 
         def init_func(cls):
             if _libsc3.main is _libsc3.RtMain:
-                cls._task_queue = tsq.TaskQueue()
-                cls._sched_cond = threading.Condition(_libsc3.main._main_lock)
-                cls._thread = threading.Thread(
-                    target=cls._run,
-                    name=cls.__name__,
-                    daemon=True)
-                cls._thread.start()
+                cls._task_queue = _libsc3.main._new_task_queue()
+                if _libsc3.main._shared_clock_thread:
+                    cls._dispatcher = _ClockDispatcher.shared()
+                    cls._sched_cond = cls._dispatcher._sched_cond
+                    cls._thread = cls._dispatcher._thread
+                    cls._run_sched = True
+                else:
+                    cls._sched_cond = threading.Condition(threading.RLock())
+                    cls._thread = threading.Thread(
+                        target=cls._run,
+                        name=cls.__name__,
+                        daemon=True)
+                    cls._thread.start()
                 cls._sched_init()
                 _libsc3.main._atexitq.add(
                     _libsc3.main._atexitprio.CLOCKS, cls._sched_stop)
@@ -109,6 +311,16 @@ class MetaSystemClock(MetaClock):
 
         clb.ClassLibrary.add(cls, init_func)
 
+    @property
+    def spin_margin(cls):
+        '''Seconds before the deadline the clock thread starts to spin,
+        None (default) to only sleep.'''
+        return cls._spin_margin
+
+    @spin_margin.setter
+    def spin_margin(cls, value):
+        cls._spin_margin = _check_margin(value)
+
 
 class SystemClock(Clock, metaclass=MetaSystemClock):
     _SECONDS_FROM_1900_TO_1970 = 2208988800 # (int32)UL # 17 leap years
@@ -118,6 +330,11 @@ class SystemClock(Clock, metaclass=MetaSystemClock):
     _OSC_TO_NANOS = 0.2328306436538696# PyrSched.h: const double kOSCtoNanos  = 0.2328306436538696; // 1e9/pow(2,32)
     _OSC_TO_SECONDS = 2.328306436538696e-10 # PyrSched.h: const double kOSCtoSecs = 2.328306436538696e-10;  // 1/pow(2,32)
 
+    _dispatcher = None
+    _spin_margin = None
+    _batch = collections.deque()
+    _stats = None
+
     def __new__(cls):
         return cls
 
@@ -225,7 +442,15 @@ class SystemClock(Clock, metaclass=MetaSystemClock):
         # if isinstance(task, pst.PauseStream):
         #     task._next_beat = secs
         if cls._task_queue.peek()[0] != prev_time:
-            cls._sched_cond.notify_all()  # Call with acquired lock.
+            cls._sched_notify()
+
+    @classmethod
+    def _sched_notify(cls):
+        # Call with acquired lock.
+        if cls._dispatcher is None:
+            cls._sched_cond.notify_all()
+        else:
+            cls._dispatcher._update(cls)
 
     @classmethod
     def _sched_stop(cls):
@@ -237,10 +462,15 @@ class SystemClock(Clock, metaclass=MetaSystemClock):
                     cls._run_resync = False
                     cls._resync_cond.notify()
             cls._task_queue.clear()
+            cls._batch.clear()
             cls._run_sched = False
-            cls._sched_cond.notify_all()
+            if cls._dispatcher is None:
+                cls._sched_cond.notify_all()
+            else:
+                cls._dispatcher._remove(cls)
         cls._resync_thread.join()
-        cls._thread.join()
+        if cls._dispatcher is None:
+            cls._thread.join()
 
     @classmethod
     def _run(cls):
@@ -270,35 +500,86 @@ class SystemClock(Clock, metaclass=MetaSystemClock):
                     if now >= sched_secs:
                         break
                     # cls._sched_cond.wait(sched_point - now)
-                    cls._sched_cond.wait(sched_secs - now)
+                    _timed_wait(
+                        cls._sched_cond, sched_secs - now, cls._spin_margin)
                     if not cls._run_sched:
                         return
 
                 # // perform all events that are ready
-                # while not cls._task_queue.empty()\
-                # and now >= (_libsc3.main._time_of_initialization
-                #             + cls._task_queue.peek()[0]):
-                while not cls._task_queue.empty()\
-                and now >= cls._task_queue.peek()[0]:
-                    item = cls._task_queue.pop()
-                    sched_time = item[0]
-                    task = item[1]
-                    # if isinstance(task, pst.PauseStream):
-                    #     task._next_beat = None
-                    try:
-                        _libsc3.main.update_logical_time(sched_time)
-                        delta = task.__awake__(sched_time, sched_time, cls)
-                        if isinstance(delta, (int, float))\
-                        and not isinstance(delta, bool):
-                            time = sched_time + delta
-                            cls._sched_add(time, task)
-                    except stm.StopStream:
-                        pass
-                    except Exception:
-                        # Always recover.
-                        _logger.error(
-                            'from %s (%s) scheduled on SystemClock',
-                            task, task.func.__qualname__, exc_info=1)
+                cls._perform(now)
+                if not cls._run_sched:
+                    return
+
+    @classmethod
+    def _perform(cls, now):
+        # Call with acquired lock, tasks are run with the lock released.
+        # while not cls._task_queue.empty()\
+        # and now >= (_libsc3.main._time_of_initialization
+        #             + cls._task_queue.peek()[0]):
+        queue = cls._task_queue
+        batch = cls._batch
+        stats = cls._stats
+        if stats is not None:
+            if not queue.empty():
+                stats.wakeup((now, now - queue.peek()[0], len(queue)))
+            perf_counter = _time.perf_counter
+            record_task = stats.task
+            record_task(None)
+            record_task(perf_counter())
+        _tick.callbacks = tick_callbacks = []
+        while not queue.empty():
+            sched_time = queue.peek()[0]
+            if now < sched_time:
+                break
+            # All tasks due at the same time are popped at once.
+            batch.extend(queue.pop_due(sched_time))
+            _libsc3.main.update_logical_time(sched_time)
+            while batch:
+                task = batch.popleft()[1]
+                if stats is not None:
+                    record_task(task)
+                # if isinstance(task, pst.PauseStream):
+                #     task._next_beat = None
+                cls._sched_cond.release()
+                try:
+                    _libsc3.main.main_tt._m_seconds = sched_time
+                    delta = task.__awake__(sched_time, sched_time, cls)
+                except stm.StopStream:
+                    delta = None
+                except Exception:
+                    # Always recover.
+                    delta = None
+                    _logger.error(
+                        'from %s (%s) scheduled on SystemClock',
+                        task, task.func.__qualname__, exc_info=1)
+                finally:
+                    cls._sched_cond.acquire()
+                if delta is not None and cls._run_sched\
+                and isinstance(delta, (int, float))\
+                and not isinstance(delta, bool):
+                    # The clock's thread recomputes the wait after perform.
+                    queue.add(sched_time + delta, task)
+            if stats is not None:
+                record_task(perf_counter())
+            if tick_callbacks:
+                cls._sched_cond.release()
+                try:
+                    _end_tick(tick_callbacks)
+                finally:
+                    cls._sched_cond.acquire()
+        _tick.callbacks = None
+
+    # _ClockDispatcher interface.
+
+    @classmethod
+    def _next_deadline(cls):
+        if cls._task_queue.empty():
+            return None
+        return cls._task_queue.peek()[0]
+
+    @classmethod
+    def _dispatch(cls, now):
+        cls._perform(now)
 
     # sclang methods
 
@@ -312,7 +593,8 @@ class SystemClock(Clock, metaclass=MetaSystemClock):
             # BUG: queue es thisProcess.prSchedulerQueue, VER!
             while not cls._task_queue.empty():
                 item = cls._task_queue.pop()[1]
-            cls._sched_cond.notify_all()
+            cls._batch.clear()
+            cls._sched_notify()
             # BUG: llama a prClear, VER!
 
     @classmethod
@@ -358,6 +640,107 @@ class SystemClock(Clock, metaclass=MetaSystemClock):
     # luego ver también las funciones que exporta a sclang al final de todo
 
 
+# Creation and stop of the shared _ClockDispatcher.
+_shared_dispatcher_lock = threading.Lock()
+
+
+class _ClockDispatcher():
+    """
+    Single thread that runs the queues of all the clocks registered to it,
+    enabled with `sc3.init(shared_clock_thread=True)`. The dispatcher keeps
+    a merged queue of each clock's next deadline in seconds, clocks must
+    call `_update` (with the lock acquired) every time their next deadline
+    may have changed, that is when tasks are added or removed and when the
+    tempo changes. Clocks implement `_next_deadline()` and `_dispatch(now)`.
+    """
+
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        with _shared_dispatcher_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __init__(self):
+        self._sched_cond = threading.Condition(threading.RLock())
+        self._deadlines = tsq.TaskQueue()
+        self._run_sched = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name=type(self).__name__,
+            daemon=True)
+        self._thread.start()
+        _libsc3.main._atexitq.add(
+            _libsc3.main._atexitprio.CLOCKS + 4, self._stop)
+
+    def _update(self, clock):
+        # Call with acquired lock.
+        if self._deadlines.empty():
+            prev_time = None
+        else:
+            prev_time = self._deadlines.peek()[0]
+        secs = clock._next_deadline()
+        if secs is None:
+            self._deadlines.remove(clock)
+        else:
+            self._deadlines.add(secs, clock)
+        if self._deadlines.empty():
+            next_time = None
+        else:
+            next_time = self._deadlines.peek()[0]
+        if next_time != prev_time:
+            self._sched_cond.notify()
+
+    def _remove(self, clock):
+        # Call with acquired lock.
+        self._deadlines.remove(clock)
+        self._sched_cond.notify()
+
+    def _stop(self):
+        if not self._run_sched:
+            return
+        with self._sched_cond:
+            self._deadlines.clear()
+            self._run_sched = False
+            self._sched_cond.notify()
+        self._thread.join()
+        with _shared_dispatcher_lock:
+            if type(self)._shared is self:
+                type(self)._shared = None
+
+    def _run(self):
+        with self._sched_cond:
+            while True:
+                while self._deadlines.empty():
+                    self._sched_cond.wait()
+                    if not self._run_sched:
+                        return
+
+                now = 0
+                while not self._deadlines.empty():
+                    now = _libsc3.main.elapsed_time()
+                    sched_secs, clock = self._deadlines.peek()
+                    if clock is tsq.TaskQueue._REMOVED:
+                        # Should not happen, the queue keeps the root valid.
+                        self._deadlines._clean_root()
+                        continue
+                    if now >= sched_secs:
+                        break
+                    _timed_wait(
+                        self._sched_cond, sched_secs - now,
+                        clock._spin_margin)
+                    if not self._run_sched:
+                        return
+
+                for _, clock in self._deadlines.pop_due(now):
+                    clock._dispatch(now)
+                    if not self._run_sched:
+                        return
+                    self._update(clock)
+
+
 class Scheduler():
     def __init__(self, clock, drift=False, recursive=True):
         self._clock = clock
@@ -370,6 +753,10 @@ class Scheduler():
         self._expired = []
 
     def _wakeup(self, item):
+        stats = self._clock._stats
+        if stats is not None:
+            stats.task(None)
+            stats.task(_time.perf_counter())
         try:
             delta = item.__awake__(self._beats, self._seconds, self._clock)
             if isinstance(delta, (int, float)) and not isinstance(delta, bool):
@@ -380,6 +767,9 @@ class Scheduler():
             _logger.error(
                 'from %s (%s) scheduled on AppClock',
                 item, item.func.__qualname__, exc_info=1)
+        if stats is not None:
+            stats.task(item)
+            stats.task(_time.perf_counter())
 
     def play(self, task):
         self.sched(0, task)
@@ -459,12 +849,12 @@ class Scheduler():
         self._beats = self._clock.secs2beats(value)
 
 
-class MetaAppClock(MetaClock):
+class MetaAppClock(_ClockStatsMixin, MetaClock):
     def __init__(cls, *_):
 
         def init_func(cls):
             if _libsc3.main is _libsc3.RtMain:
-                cls._sched_cond = threading.Condition(_libsc3.main._main_lock)
+                cls._sched_cond = threading.Condition(threading.RLock())
                 cls._tick_cond = threading.Condition()
                 cls._scheduler = Scheduler(cls, drift=True, recursive=False)
                 cls._thread = threading.Thread(
@@ -481,6 +871,8 @@ class MetaAppClock(MetaClock):
 
 
 class AppClock(Clock, metaclass=MetaAppClock):
+    _stats = None
+
     def __new__(cls):
         return cls
 
@@ -524,7 +916,12 @@ class AppClock(Clock, metaclass=MetaAppClock):
     def _tick(cls):
         if cls.mode == _libsc3.main.NRT_MODE:
             return None
-        cls._scheduler.seconds = _libsc3.main.elapsed_time()
+        now = _libsc3.main.elapsed_time()
+        queue = cls._scheduler.queue
+        if cls._stats is not None and not queue.empty()\
+        and queue.peek()[0] <= now:
+            cls._stats.wakeup((now, now - queue.peek()[0], len(queue)))
+        cls._scheduler.seconds = now
         if cls._scheduler.queue.empty():
             return None  # check value for client::tick to stop calling itself.
         else:
@@ -548,10 +945,11 @@ class AppClock(Clock, metaclass=MetaAppClock):
     # Acá podría ir todo dentro de sched(), ergo sum chin pum: cls._tick()
 
 
-class ClockScheduler(threading.Thread):
+class ClockScheduler(_ClockStatsMixin, threading.Thread):
     def __init__(self):
-        self._sched_cond = threading.Condition(_libsc3.main._main_lock)
-        self.queue = tsq.TaskQueue()
+        self._sched_cond = threading.Condition(threading.RLock())
+        self.queue = _libsc3.main._new_task_queue()
+        self._stats = None
         threading.Thread.__init__(self)
         self.daemon = True
         self.start()
@@ -567,6 +965,9 @@ class ClockScheduler(threading.Thread):
                     if not self._run_sched:
                         return
                 while not self.queue.empty():
+                    if self._stats is not None:
+                        self._stats.wakeup(
+                            (self.queue.peek()[0], 0.0, len(self.queue)))
                     time, clock_task = self.queue.pop()
                     clock_task._wakeup(time)
 
@@ -586,6 +987,52 @@ class ClockScheduler(threading.Thread):
         _libsc3.main._atexitq.remove(self.stop)
 
 
+class SyncClockScheduler(_ClockStatsMixin):
+    """
+    Single threaded nrt scheduler enabled with `sc3.init('nrt',
+    sync_nrt=True)`. Tasks are run inline in time order by the thread that
+    calls `run_until` or `run_all`, there are no thread handoffs and the
+    result is deterministic.
+    """
+
+    def __init__(self):
+        self.queue = _libsc3.main._new_task_queue()
+        self._running = False
+        self._stats = None
+
+    def is_alive(self):
+        return True
+
+    def add(self, time, clock_task):
+        self.queue.add(time, clock_task)
+
+    def run_until(self, seconds):
+        if self._running:
+            raise ClockError('NRT scheduler is already running')
+        self._running = True
+        try:
+            queue = self.queue
+            while not queue.empty():
+                time, clock_task = queue.peek()
+                if time > seconds:
+                    break
+                if self._stats is not None:
+                    self._stats.wakeup((time, 0.0, len(queue)))
+                queue.pop()
+                clock_task._wakeup(time)
+        finally:
+            self._running = False
+        if seconds != float('inf')\
+        and seconds > _libsc3.main.elapsed_time():
+            _libsc3.main.update_logical_time(seconds)
+
+    def run_all(self):
+        self.run_until(float('inf'))
+
+    def stop(self):
+        self.queue.clear()
+
+
 class ClockTask():
     def __init__(self, beats, clock, task, scheduler):
         self.clock = clock
@@ -597,6 +1044,10 @@ class ClockTask():
             RuntimeError('ClockScheduler is not running')
 
     def _wakeup(self, time):
+        stats = self.scheduler._stats
+        if stats is not None:
+            stats.task(None)
+            stats.task(_time.perf_counter())
         try:
             # if isinstance(self.task, pst.PauseStream):
             #     self.task._next_beat = None
@@ -611,6 +1062,9 @@ class ClockTask():
             _logger.error(
                 'from %s (%s) scheduled on ClockScheduler',
                 self.task, self.task.func.__qualname__, exc_info=1)
+        if stats is not None:
+            stats.task(self.task)
+            stats.task(_time.perf_counter())
 
 
 ### Quant.sc ###
@@ -688,6 +1142,74 @@ class Quant():
 # NOTE: contraposición al tiempo lógico. La base temporal es el tempo.
 
 
+class _TempoRamp():
+    # Tempo curve from tempo0 to tempo1 in dur beats starting at beats0 and
+    # seconds0. The tempo is constant before and after the ramp, 'lin' is
+    # linear in beats and 'exp' is exponential in beats. Conversions are
+    # done in closed form by integrating the beat duration.
+
+    __slots__ = (
+        'beats0', 'seconds0', 'tempo0', 'tempo1', 'dur', 'curve',
+        '_k', 'end_beats', 'end_seconds')
+
+    def __init__(self, beats0, seconds0, tempo0, tempo1, dur, curve):
+        self.beats0 = beats0
+        self.seconds0 = seconds0
+        self.tempo0 = tempo0
+        self.tempo1 = tempo1
+        self.dur = dur
+        if curve == 'lin':
+            self._k = (tempo1 - tempo0) / dur
+        elif curve == 'exp':
+            self._k = math.log(tempo1 / tempo0) / dur
+        else:
+            raise ValueError(f"invalid curve '{curve}'")
+        self.curve = curve
+        self.end_beats = beats0 + dur
+        self.end_seconds = seconds0 + self._secs(dur)
+
+    def _secs(self, x):
+        # Seconds from the start of the ramp to x beats in the ramp.
+        k = self._k
+        if k == 0:
+            return x / self.tempo0
+        if self.curve == 'lin':
+            return math.log1p(k * x / self.tempo0) / k
+        else:
+            return -math.expm1(-k * x) / (k * self.tempo0)
+
+    def _beats(self, s):
+        # Inverse of _secs.
+        k = self._k
+        if k == 0:
+            return s * self.tempo0
+        if self.curve == 'lin':
+            return self.tempo0 * math.expm1(k * s) / k
+        else:
+            return -math.log1p(-k * self.tempo0 * s) / k
+
+    def beats2secs(self, beats):
+        if beats <= self.beats0:
+            return (beats - self.beats0) / self.tempo0 + self.seconds0
+        if beats >= self.end_beats:
+            return (beats - self.end_beats) / self.tempo1 + self.end_seconds
+        return self._secs(beats - self.beats0) + self.seconds0
+
+    def secs2beats(self, seconds):
+        if seconds <= self.seconds0:
+            return (seconds - self.seconds0) * self.tempo0 + self.beats0
+        if seconds >= self.end_seconds:
+            return (seconds - self.end_seconds) * self.tempo1 + self.end_beats
+        return self._beats(seconds - self.seconds0) + self.beats0
+
+    def tempo(self, beats):
+        x = min(max(beats - self.beats0, 0), self.dur)
+        if self.curve == 'lin':
+            return self.tempo0 + self._k * x
+        else:
+            return self.tempo0 * math.exp(self._k * x)
+
+
 class MetaTempoClock(MetaClock):
     def __init__(cls, *_):
         cls._all = weakref.WeakSet()
@@ -710,7 +1232,7 @@ class MetaTempoClock(MetaClock):
         return set(cls._all)
 
 
-class TempoClock(Clock, metaclass=MetaTempoClock):
+class TempoClock(_ClockStatsMixin, Clock, metaclass=MetaTempoClock):
     # BUG: C++ TempoClock_stopAll se usa en ./lang/LangSource/PyrLexer.cpp
     # BUG: shutdownLibrary(), no importa si hay permanentes, va para Main, VER.
 
@@ -737,15 +1259,26 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
         self.permanent = False
         type(self)._all.add(self)
 
+        self._dispatcher = None
+        self._spin_margin = None
+        self._batch = collections.deque()
+        self._stats = None
+        self._ramp = None
         if _libsc3.main is _libsc3.RtMain:
             self._pure_nrt = False
-            self._task_queue = tsq.TaskQueue()
-            self._sched_cond = threading.Condition(_libsc3.main._main_lock)
-            self._thread = threading.Thread(
-                target=self._run,
-                name=f'{type(self).__name__} id: {id(self)}',
-                daemon=True)
-            self._thread.start()
+            self._task_queue = _libsc3.main._new_task_queue()
+            if _libsc3.main._shared_clock_thread:
+                self._dispatcher = _ClockDispatcher.shared()
+                self._sched_cond = self._dispatcher._sched_cond
+                self._thread = self._dispatcher._thread
+                self._run_sched = True
+            else:
+                self._sched_cond = threading.Condition(threading.RLock())
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f'{type(self).__name__} id: {id(self)}',
+                    daemon=True)
+                self._thread.start()
             _libsc3.main._atexitq.add(
                 _libsc3.main._atexitprio.CLOCKS + 2, self._stop)
         else:
@@ -786,34 +1319,112 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
                     # the same).
                     # sched_point = _libsc3.main._time_of_initialization + sched_secs
                     # self._sched_cond.wait(sched_point - _time.time())
-                    self._sched_cond.wait(
-                        sched_secs - _libsc3.main.elapsed_time())
+                    _timed_wait(
+                        self._sched_cond,
+                        sched_secs - _libsc3.main.elapsed_time(),
+                        self._spin_margin)
                     if not self._run_sched:
                         return
 
                 # // perform all events that are ready
-                while not self._task_queue.empty()\
-                and elapsed_beats >= self._task_queue.peek()[0]:
-                    item = self._task_queue.pop()
-                    self._beats = item[0]
-                    task = item[1]
-                    # if isinstance(task, pst.PauseStream):
-                    #     task._next_beat = None
-                    try:
-                        _libsc3.main.update_logical_time(
-                            self.beats2secs(self._beats))
-                        delta = task.__awake__(
-                            self._beats, self.beats2secs(self._beats), self)
-                        if isinstance(delta, (int, float))\
-                        and not isinstance(delta, bool):
-                            time = self._beats + delta
-                            self._sched_add(time, task)
-                    except stm.StopStream:
-                        pass
-                    except Exception:
-                        _logger.error(
-                            'from %s (%s) scheduled on TempoClock id: %s',
-                            task, task.func.__qualname__, id(self), exc_info=1)
+                self._perform(elapsed_beats)
+                if not self._run_sched:
+                    return
+
+    def _perform(self, elapsed_beats):
+        # Call with acquired lock, tasks are run with the lock released.
+        queue = self._task_queue
+        batch = self._batch
+        stats = self._stats
+        if self._ramp is not None and elapsed_beats >= self._ramp.end_beats:
+            self._end_ramp()
+        if stats is not None:
+            if not queue.empty():
+                # In seconds, _beat_dur is not the tempo during a ramp.
+                now = self.beats2secs(elapsed_beats)
+                lateness = now - self.beats2secs(queue.peek()[0])
+                stats.wakeup((now, lateness, len(queue)))
+            perf_counter = _time.perf_counter
+            record_task = stats.task
+            record_task(None)
+            record_task(perf_counter())
+        _tick.callbacks = tick_callbacks = []
+        while not queue.empty():
+            beats = queue.peek()[0]
+            if elapsed_beats < beats:
+                break
+            # All tasks due at the same beat are popped at once and share
+            # the time conversion and logical time update.
+            batch.extend(queue.pop_due(beats))
+            self._beats = beats
+            seconds = self.beats2secs(beats)
+            _libsc3.main.update_logical_time(seconds)
+            while batch:
+                task = batch.popleft()[1]
+                if stats is not None:
+                    record_task(task)
+                # if isinstance(task, pst.PauseStream):
+                #     task._next_beat = None
+                self._sched_cond.release()
+                try:
+                    _libsc3.main.main_tt._m_seconds = seconds
+                    delta = task.__awake__(beats, seconds, self)
+                except stm.StopStream:
+                    delta = None
+                except Exception:
+                    delta = None
+                    _logger.error(
+                        'from %s (%s) scheduled on TempoClock id: %s',
+                        task, task.func.__qualname__, id(self), exc_info=1)
+                finally:
+                    self._sched_cond.acquire()
+                if delta is not None and self._run_sched\
+                and isinstance(delta, (int, float))\
+                and not isinstance(delta, bool):
+                    # The clock's thread recomputes the wait after perform.
+                    queue.add(beats + delta, task)
+            if stats is not None:
+                record_task(perf_counter())
+            if tick_callbacks:
+                self._sched_cond.release()
+                try:
+                    _end_tick(tick_callbacks)
+                finally:
+                    self._sched_cond.acquire()
+        _tick.callbacks = None
+
+    # _ClockDispatcher interface.
+
+    def _next_deadline(self):
+        if self._task_queue.empty():
+            return None
+        return self.beats2secs(self._task_queue.peek()[0])
+
+    def _dispatch(self, now):
+        # The deadline was computed from the beats of the first task,
+        # converting back may round below it.
+        if self._task_queue.empty():
+            return
+        elapsed_beats = max(
+            self.secs2beats(now), self._task_queue.peek()[0])
+        self._perform(elapsed_beats)
+
+    @property
+    def spin_margin(self):
+        '''Seconds before the deadline the clock thread starts to spin,
+        None (default) to only sleep.'''
+        return self._spin_margin
+
+    @spin_margin.setter
+    def spin_margin(self, value):
+        self._spin_margin = _check_margin(value)
+
+    def _sched_notify(self):
+        # Call with acquired lock.
+        if self._dispatcher is None:
+            self._sched_cond.notify()  # NOTE: es notify_one en C++
+        else:
+            self._dispatcher._update(self)
 
     def stop(self):
         # prStop -> prTempoClock_Free -> StopReq -> StopAndDelete -> Stop
@@ -838,10 +1449,15 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
             return
         with self._sched_cond:
             self._task_queue.clear()
+            self._batch.clear()
             type(self)._all.remove(self)
             self._run_sched = False
-            self._sched_cond.notify_all()  # In TempoClock::Stop is notify_all
-        self._thread.join()
+            if self._dispatcher is None:
+                self._sched_cond.notify_all()  # In TempoClock::Stop is notify_all
+            else:
+                self._dispatcher._remove(self)
+        if self._dispatcher is None:
+            self._thread.join()
         self._thread = None
         self._sched_cond = None
 
@@ -862,6 +1478,9 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
         # _TempoClock_Tempo
         if not self.running():
             raise ClockNotRunning(self)
+        ramp = self._ramp
+        if ramp is not None:
+            return ramp.tempo(self.beats)
         return self._tempo
 
     # // for setting the tempo at the current logical time
@@ -886,19 +1505,18 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
             raise ValueError(
                 f"invalid tempo {value}. The method "
                 "'etempo()' can be used instead.")
+        self._handoff(self._set_tempo_at_beat, value)
+        # en tempo_
+        mdl.NotificationCenter.notify(self, 'tempo')
+
+    def _set_tempo_at_beat(self, value):
         # TempoClock::SetTempoAtBeat
         beats = self.beats # NOTE: hay obtenerlo solo una vez porque el getter cambia al setear las variables, en C++ es el argumento de una función.
         self._base_seconds = self.beats2secs(beats)
         self._base_beats = beats
         self._tempo = value
         self._beat_dur = 1.0 / self._tempo
-        # en tempo_
-        mdl.NotificationCenter.notify(self, 'tempo')
-        if self.mode == _libsc3.main.NRT_MODE:
-            return
-        else:
-            with self._sched_cond:
-                self._sched_cond.notify() # NOTE: es notify_one en C++
+        self._ramp = None
 
     # // for setting the tempo at the current elapsed time.
     def etempo(self, value):
@@ -908,24 +1526,79 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
             raise ClockNotRunning(self)
         if value == 0.0:
             raise ValueError("tempo can't be zero")
+        self._handoff(self._set_tempo_at_time, value)
+        # etempo_
+        mdl.NotificationCenter.notify(self, 'tempo')
+
+    def _set_tempo_at_time(self, value):
         # TempoClock::SetTempoAtTime
         seconds = _libsc3.main.elapsed_time()
         self._base_beats = self.secs2beats(seconds)
         self._base_seconds = seconds
         self._tempo = value
         self._beat_dur = 1.0 / self._tempo
-        # etempo_
+        self._ramp = None
+
+    def ramp_tempo(self, value, dur, curve='lin'):
+        '''
+        Change the tempo from the current value to value in dur beats,
+        starting at the current logical time. The curve can be 'lin'
+        (tempo linear in beats) or 'exp' (exponential in beats). Beats and
+        seconds are converted in closed form so the clock's thread doesn't
+        need to be notified during the ramp. Setting tempo, etempo or beats
+        cancels the ramp.
+        '''
+        if not self.running():
+            raise ClockNotRunning(self)
+        if self._tempo < 0.0 or value <= 0.0:
+            raise ValueError('tempo ramps require positive tempos')
+        if dur <= 0.0:
+            raise ValueError(f'invalid ramp duration {dur}')
+        if curve not in ('lin', 'exp'):
+            raise ValueError(f"invalid curve '{curve}'")
+        self._handoff(self._set_ramp, value, dur, curve)
         mdl.NotificationCenter.notify(self, 'tempo')
+
+    def _set_ramp(self, value, dur, curve):
+        beats = self.beats
+        seconds = self.beats2secs(beats)
+        if self._ramp is not None:
+            self._tempo = self._ramp.tempo(beats)
+        self._base_seconds = seconds
+        self._base_beats = beats
+        self._beat_dur = 1.0 / self._tempo
+        self._ramp = _TempoRamp(
+            beats, seconds, self._tempo, value, dur, curve)
+
+    def _end_ramp(self):
+        # Called by the clock's thread (with the lock acquired) when the
+        # ramp is done, the time base is moved to the end of the ramp.
+        ramp = self._ramp
+        self._base_seconds = ramp.end_seconds
+        self._base_beats = ramp.end_beats
+        self._tempo = ramp.tempo1
+        self._beat_dur = 1.0 / self._tempo
+        self._ramp = None
+
+    def _handoff(self, func, *args):
+        # Changes to the time base from any thread are done with the clock's
+        # lock acquired and the scheduling thread is notified to recompute
+        # its wait. The lock is never held while tasks run so other threads
+        # only wait for queue operations.
         if self.mode == _libsc3.main.NRT_MODE:
-            return
+            func(*args)
         else:
             with self._sched_cond:
-                self._sched_cond.notify() # NOTE: es notify_one en C++
+                func(*args)
+                self._sched_notify()
 
     def beat_dur(self):
         # _TempoClock_BeatDur
         if not self.running():
             raise ClockNotRunning(self)
+        ramp = self._ramp
+        if ramp is not None:
+            return 1.0 / ramp.tempo(self.beats)
         return self._beat_dur
 
     def elapsed_beats(self):
@@ -945,15 +1618,16 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
         # _TempoClock_SetBeats
         if not self.running():
             raise ClockNotRunning(self)
+        self._handoff(self._set_beats, value)
+
+    def _set_beats(self, value):
         seconds = _libsc3.main.current_tt._seconds
+        if self._ramp is not None:
+            self._tempo = self._ramp.tempo(self.secs2beats(seconds))
+            self._ramp = None
         self._base_seconds = seconds
         self._base_beats = value
         self._beat_dur = 1.0 / self._tempo
-        if self.mode == _libsc3.main.NRT_MODE:
-            return
-        else:
-            with self._sched_cond:
-                self._sched_cond.notify() # NOTE: es notify_one en C++
 
     @property
     def seconds(self):
@@ -969,7 +1643,7 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
         # if isinstance(task, pst.PauseStream):
         #     task._next_beat = beats
         if self._task_queue.peek()[0] != prev_beat:
-            self._sched_cond.notify()  # *** BUG: usa notify poruqe se llama anidado, cambiar.
+            self._sched_notify()
 
     def _sched_add_nrt(self, beats, task):
         # if isinstance(task, pst.PauseStream):
@@ -1031,7 +1705,8 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
             with self._sched_cond:
                 while not self._task_queue.empty():
                     item = self._task_queue.pop()[1] # de por sí PriorityQueue es thread safe, la implementación de SuperCollider es distinta, ver SystemClock*clear.
-                self._sched_cond.notify() # NOTE: es notify_one en C++
+                self._batch.clear()
+                self._sched_notify()
 
     @property
     def beats_per_bar(self):
@@ -1065,12 +1740,18 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
         # _TempoClock_BeatsToSecs
         if not self.running():
             raise ClockNotRunning(self)
+        ramp = self._ramp
+        if ramp is not None:
+            return ramp.beats2secs(beats)
         return (beats - self._base_beats) * self._beat_dur + self._base_seconds
 
     def secs2beats(self, seconds):
         # _TempoClock_SecsToBeats
         if not self.running():
             raise ClockNotRunning(self)
+        ramp = self._ramp
+        if ramp is not None:
+            return ramp.secs2beats(seconds)
         return (seconds - self._base_seconds) * self._tempo + self._base_beats
 
     def dump(self):
@@ -1081,7 +1762,7 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
             msg += (f'\n    tempo: {self.tempo}'
                     f'\n    beats: {self.beats}'
                     f'\n    seconds: {self.seconds}'
-                    f'\n    _beat_dur: {self._beat_dur}'
+                    f'\n    _beat_dur: {self.beat_dur()}'
                     f'\n    _base_seconds: {self._base_seconds}'
                     f'\n    _base_beats: {self._base_beats}')
             print(msg)
@@ -1133,6 +1814,149 @@ class TempoClock(Clock, metaclass=MetaTempoClock):
             return self._thread is not None and self._thread.is_alive()
 
 
+### asyncio ###
+
+
+class AsyncioClock(Clock):
+    """
+    Clock that runs tasks from an asyncio event loop, with the same time
+    base as SystemClock (elapsed seconds). Tasks are scheduled with
+    `loop.call_at` and run in the loop's thread with their logical time,
+    so routines and `Condition` work the same way they do in other clocks.
+    Scheduling can be done from any thread. Only available in rt mode.
+    """
+
+    def __init__(self, loop=None):
+        if _libsc3.main is not _libsc3.RtMain:
+            raise ClockError('AsyncioClock is not available in nrt mode')
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._handles = dict()
+        self._running = True
+
+    @property
+    def loop(self):
+        return self._loop
+
+    @property
+    def mode(self):
+        return _libsc3.main.RT_MODE
+
+    def _in_loop(self):
+        # asyncio.get_running_loop is not available in Python 3.6.
+        return asyncio._get_running_loop() is self._loop
+
+    def _call_soon(self, func, *args):
+        if self._in_loop():
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _sched_add(self, secs, task):
+        # Call from the loop's thread. As in other clocks a task is
+        # scheduled once, adding it again updates its time.
+        if not self._running:
+            return
+        handle = self._handles.pop(task, None)
+        if handle is not None:
+            handle.cancel()
+        when = self._loop.time() + secs - _libsc3.main.elapsed_time()
+        self._handles[task] = self._loop.call_at(
+            when, self._wakeup, secs, task)
+
+    def _wakeup(self, secs, task):
+        del self._handles[task]
+        if _libsc3.main.elapsed_time() < secs:
+            # The loop may run handles up to its clock resolution earlier.
+            self._sched_add(secs, task)
+            return
+        _tick.callbacks = tick_callbacks = []
+        try:
+            _libsc3.main.update_logical_time(secs)
+            delta = task.__awake__(secs, secs, self)
+        except stm.StopStream:
+            delta = None
+        except Exception:
+            delta = None
+            _logger.error(
+                'from %s (%s) scheduled on AsyncioClock id: %s',
+                task, task.func.__qualname__, id(self), exc_info=1)
+        _tick.callbacks = None
+        _end_tick(tick_callbacks)
+        if isinstance(delta, (int, float)) and not isinstance(delta, bool):
+            self._sched_add(secs + delta, task)
+
+    def play(self, task, quant=None):
+        # Unused quant (needed for tempo clock compatibility).
+        self.sched(0, task)
+
+    def sched(self, delta, item):
+        if not hasattr(item, '__awake__'):
+            item = fn.Function(item)
+        item._clock = self
+        seconds = _libsc3.main.current_tt._seconds
+        seconds += delta
+        if seconds == float('inf'):
+            return
+        self._call_soon(self._sched_add, seconds, item)
+
+    def sched_abs(self, time, item):
+        if not hasattr(item, '__awake__'):
+            item = fn.Function(item)
+        item._clock = self
+        if time == float('inf'):
+            return
+        self._call_soon(self._sched_add, time, item)
+
+    def clear(self):
+        self._call_soon(self._clear)
+
+    def _clear(self):
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+
+    def stop(self):
+        self._running = False
+        self.clear()
+
+    def running(self):
+        return self._running and not self._loop.is_closed()
+
+    @property
+    def seconds(self):
+        return _libsc3.main.current_tt._seconds
+
+    # // tempo clock compatibility
+
+    @property
+    def beats(self):
+        return _libsc3.main.current_tt._seconds
+
+    def beats2secs(self, beats):
+        return beats
+
+    def secs2beats(self, secs):
+        return secs
+
+    def beats2bars(self, beats):
+        return 0
+
+    def bars2beats(self, bars):
+        return 0
+
+    def time_to_next_beat(self, quant=1):
+        return 0
+
+    def next_time_on_grid(self, quant=1, phase=0):
+        if quant == 0:
+            return self.beats + phase
+        if phase < 0:
+            phase = bi.mod(phase, quant)
+        return bi.roundup(self.beats - bi.mod(phase, quant), quant) + phase
+
+
 def defer(func, delta=None, clock=None):
     '''
     Convenience function to defer lambda functions on a clock without
@@ -1,6 +1,8 @@
 """AbstractFunction.sc"""
 
 import inspect
+import types
+import weakref
 
 from . import absobject as aob
 from . import builtins as bi
@@ -9,6 +11,37 @@ from . import builtins as bi
 __all__ = ['value', 'Function', 'function']
 
 
+# Callables' (nargs, varargs) pairs, computed once per callable.
+_arity_cache = weakref.WeakKeyDictionary()
+# Bound methods are new objects on each attribute access, their arity is
+# cached by function, self is not counted.
+_method_arity_cache = weakref.WeakKeyDictionary()
+
+
+def _signature_arity(obj):
+    parameters = inspect.signature(obj).parameters
+    varargs = any(p.kind == p.VAR_POSITIONAL for p in parameters.values())
+    return (len(parameters), varargs)
+
+
+def _arity(obj):
+    if type(obj) is types.MethodType:
+        cache = _method_arity_cache
+        key = obj.__func__
+    else:
+        cache = _arity_cache
+        key = obj
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Not hashable or can't be weakly referenced.
+        return _signature_arity(obj)
+    arity = cache[key] = _signature_arity(obj)
+    return arity
+
+
 def value(obj, *args, **kwargs):
     '''
     Utility function for optional value/function parameters like
@@ -17,11 +50,10 @@ def value(obj, *args, **kwargs):
     Spare parameters are discarded.
     '''
     if callable(obj):
-        parameters = inspect.signature(obj).parameters
-        if any(p.kind == p.VAR_POSITIONAL for p in parameters.values()):
+        nargs, varargs = _arity(obj)
+        if varargs:
             return obj(*args, **kwargs)
         else:
-            nargs = len(parameters)
             return obj(*args[:nargs], **kwargs)
     else:
         return obj
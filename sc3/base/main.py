@@ -47,12 +47,27 @@ class Process(type):
         # Main library lock.
         cls._main_lock = threading.RLock()
 
+        # Current TimeThread of each system thread.
+        cls._tls = threading.local()
+
         # Mode switch lock. Not defined behaviour.
         # cls._switch_cond = threading.Condition(cls._main_lock)
 
         # Main TimeThread random generator.
         cls._rgen = random.Random()
 
+        # Run all clocks from a single thread, set by sc3.init().
+        cls._shared_clock_thread = False
+
+        # Clocks' task queue slot resolution, set by sc3.init().
+        cls._timing_wheel = None
+
+        # Run nrt tasks only by run_until/run_all, set by sc3.init().
+        cls._sync_nrt = False
+
+        # asyncio event loop for OSC networking, set by sc3.init().
+        cls._osc_loop = None
+
         # SynthDef graph build's global state.
         cls._current_synthdef = None
         cls._def_build_lock = threading.Lock()
@@ -74,6 +89,19 @@ class Process(type):
         cls._platform._startup()
         cls._atexitq.add(cls._atexitprio.PLATFORM, cls.platform._shutdown)
 
+    @property
+    def current_tt(cls):
+        # Clocks run concurrently, each system thread
+        # starts from main_tt and has its own current_tt.
+        try:
+            return cls._tls.current_tt
+        except AttributeError:
+            return cls.main_tt
+
+    @current_tt.setter
+    def current_tt(cls, value):
+        cls._tls.current_tt = value
+
     @property
     def rgen(cls):
         return cls.current_tt.rgen
@@ -96,6 +124,13 @@ class Process(type):
             cls._atexitq.pop()[1]()
         atexit.unregister(cls.shutdown)
 
+    def _new_task_queue(cls):
+        # Task queue used by clocks and the NRT ClockScheduler.
+        if cls._timing_wheel is None:
+            return tsq.TaskQueue()
+        else:
+            return tsq.TimingWheel(cls._timing_wheel)
+
     def open_udp_port(cls, port):
         raise NotImplementedError('multiple UDP ports are not implemented')
 
@@ -127,11 +162,24 @@ class RtMain(metaclass=Process):
         # true.
         cls._time_of_initialization = time.time()  # time_since_epoch
         cls._perf_counter_time_of_initialization = time.perf_counter()  # monotonic clock.
-        cls.main_tt = stm._MainTimeThread()
+        cls.main_tt = stm._RtMainTimeThread()
         cls.current_tt = cls.main_tt
-        cls._osc_interface = osci.OscUdpInterface()
+        if cls._osc_loop is None:
+            cls._osc_interface = osci.OscUdpInterface()
+        else:
+            cls._osc_interface = osci.OscAsyncioUdpInterface(
+                loop=cls._osc_loop)
         cls._osc_interface.start()
 
+    @classmethod
+    def open_udp_port(cls, port):
+        '''
+        Open an additional UDP port to receive OSC messages. Returns True
+        if the port was opened or is already open. Responders can filter
+        by recv_port.
+        '''
+        return cls._osc_interface.open_udp_port(port)
+
     @classmethod
     def elapsed_time(cls):
         '''Physical time since library initialization.'''
@@ -170,10 +218,39 @@ class NrtMain(metaclass=Process):
         cls._time_of_initialization = 0.0
         cls.main_tt = stm._MainTimeThread()
         cls.current_tt = cls.main_tt
-        cls._clock_scheduler = clk.ClockScheduler()
+        if cls._sync_nrt:
+            cls._clock_scheduler = clk.SyncClockScheduler()
+        else:
+            cls._clock_scheduler = clk.ClockScheduler()
         cls._osc_interface = osci.OscNrtInterface()
         cls._osc_interface.init()
 
+    @classmethod
+    def run_until(cls, seconds):
+        '''
+        Run all the tasks scheduled up to seconds (inclusive) in time order
+        and advance logical time to seconds. Only available if the library
+        was initialized with sync_nrt=True.
+        '''
+        cls._check_sync_nrt()
+        cls._clock_scheduler.run_until(seconds)
+
+    @classmethod
+    def run_all(cls):
+        '''
+        Run all the scheduled tasks in time order until the queue is empty,
+        including the ones scheduled by the tasks themselves. Only available
+        if the library was initialized with sync_nrt=True.
+        '''
+        cls._check_sync_nrt()
+        cls._clock_scheduler.run_all()
+
+    @classmethod
+    def _check_sync_nrt(cls):
+        if not cls._sync_nrt:
+            raise RuntimeError(
+                'run_until and run_all require sc3.init(sync_nrt=True)')
+
     @classmethod
     def elapsed_time(cls):
         '''Physical time is main_Thread.seconds in nrt.'''
@@ -1,5 +1,6 @@
 """Model.sc"""
 
+import threading
 import weakref
 
 from . import functions as fn
@@ -10,40 +11,78 @@ __all__ = ['NotificationCenter']
 
 class NotificationCenter():
     _registrations = weakref.WeakKeyDictionary()
+    # Immutable copies of the registrations used by notify, rebuilt on
+    # register and unregister. Keyed as _registrations so objects that
+    # compare equal share their notifications, the value is {msg:
+    # ((listener_ref, action), ...)}.
+    _snapshots = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
 
     def __new__(cls):
         return cls
 
     @classmethod
     def notify(cls, obj, msg, *args, **kwargs):
-        if obj in cls._registrations and msg in cls._registrations[obj]:
-            for listener, action in cls._registrations[obj][msg].copy().items():
-                fn.value(action, obj, msg, listener, *args, **kwargs)
+        try:
+            table = cls._snapshots.get(obj)
+        except TypeError:
+            return  # Not weakly referenceable, can't be registered.
+        if table is None:
+            return
+        dead = False
+        for listener_ref, action in table.get(msg, ()):
+            listener = listener_ref()
+            if listener is None:
+                dead = True
+                continue
+            fn.value(action, obj, msg, listener, *args, **kwargs)
+        if dead:
+            with cls._lock:
+                cls._update_snapshot(obj)
 
     @classmethod
     def register(cls, obj, msg, listener, action):
-        if obj not in cls._registrations:
-            cls._registrations[obj] = dict()
-        if msg not in cls._registrations[obj]:
-            cls._registrations[obj][msg] = weakref.WeakKeyDictionary()
-        cls._registrations[obj][msg][listener] = action
+        with cls._lock:
+            if obj not in cls._registrations:
+                cls._registrations[obj] = dict()
+            if msg not in cls._registrations[obj]:
+                cls._registrations[obj][msg] = weakref.WeakKeyDictionary()
+            cls._registrations[obj][msg][listener] = action
+            cls._update_snapshot(obj)
 
     @classmethod
     def unregister(cls, obj, msg=None, listener=None):
         err = False
-        try:
-            if msg is None:
-                del cls._registrations[obj]
-            elif listener is None:
-                del cls._registrations[obj][msg]
-            else:
-                del cls._registrations[obj][msg][listener]
-        except KeyError as e:
-            err = True
+        with cls._lock:
+            try:
+                if msg is None:
+                    del cls._registrations[obj]
+                elif listener is None:
+                    del cls._registrations[obj][msg]
+                else:
+                    del cls._registrations[obj][msg][listener]
+            except KeyError as e:
+                err = True
+            cls._update_snapshot(obj)
         if err:
             raise KeyError(
                 f'no registration found for ({obj}, {msg}, {listener})')
 
+    @classmethod
+    def _update_snapshot(cls, obj):
+        # Called with the lock held.
+        table = dict()
+        for msg, listeners in cls._registrations.get(obj, dict()).items():
+            items = tuple(
+                (weakref.ref(listener), action)
+                for listener, action in listeners.items())
+            if items:
+                table[msg] = items
+        if table:
+            cls._snapshots[obj] = table
+        else:
+            cls._snapshots.pop(obj, None)
+
     @classmethod
     def register_one_shot(cls, obj, msg, listener, action):
         def one_shot_action(*args):
@@ -62,4 +101,6 @@ class NotificationCenter():
 
     @classmethod
     def clear(cls):
-        cls._registrations = weakref.WeakKeyDictionary()
+        with cls._lock:
+            cls._registrations = weakref.WeakKeyDictionary()
+            cls._snapshots = weakref.WeakKeyDictionary()
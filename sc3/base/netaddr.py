@@ -1,12 +1,16 @@
 """NetAddr.sc"""
 
+import asyncio
+import collections
 import ipaddress
 import socket
+import threading
 
 from . import stream as stm
 from . import main as _libsc3
 from . import builtins as bi
 from . import responsedefs as rdf
+from . import systemactions as sac
 from . import _oscinterface as osci
 
 
@@ -24,6 +28,7 @@ class NetAddr():
     # IP header)".
     _MAX_UDP_DGRAM_SIZE = 65507
     _SYNC_BNDL_DGRAM_SIZE = 36  # Size of bundle(latency, ['/sync', id]) dgram.
+    _COALESCE_DGRAM_SIZE = 8192  # Default max size of coalesced bundles.
 
     def __init__(self, hostname, port):
         if hostname is None:
@@ -34,6 +39,7 @@ class NetAddr():
         self._port = port
         self._target = (hostname, port)
         self._tcp_interface = None
+        self._coalescer = None
 
     @property
     def hostname(self):
@@ -87,8 +93,14 @@ class NetAddr():
         # Async.
         if self.is_connected:
             self.disconnect()
-        self._tcp_interface = osci.OscTcpInterface(
-            local_port or self.lang_port() + 1, port_range)
+        main_interface = _libsc3.main._osc_interface
+        if isinstance(main_interface, osci.OscAsyncioUdpInterface):
+            self._tcp_interface = osci.OscAsyncioTcpInterface(
+                local_port or self.lang_port() + 1, port_range,
+                main_interface.loop)
+        else:
+            self._tcp_interface = osci.OscTcpInterface(
+                local_port or self.lang_port() + 1, port_range)
         self._tcp_interface.bind()
         self._tcp_interface.try_connect(
             self._target, timeout, on_complete, on_failure)
@@ -106,6 +118,26 @@ class NetAddr():
     def has_bundle(self):
         return False
 
+    @property
+    def is_coalescing(self):
+        return self._coalescer is not None
+
+    def enable_coalescing(self, max_size=None):
+        '''
+        Bundles sent over UDP from the same clock tick with the same time
+        are merged into one bundle of up to max_size bytes and sent at the
+        end of the tick. Bundles with time None and bundles sent outside
+        clock tasks are sent right away.
+        '''
+        max_size = max_size or self._COALESCE_DGRAM_SIZE
+        if not 0 < max_size <= self._MAX_UDP_DGRAM_SIZE:
+            raise ValueError(f'invalid max_size {max_size}')
+        self._coalescer = osci._BundleCoalescer(self._target, max_size)
+
+    def disable_coalescing(self):
+        # Pending bundles are still sent at the end of the tick.
+        self._coalescer = None
+
     # def send_raw(self, raw_bytes):
     #     # send a raw message without timestamp to the addr.
     #     self._osc_interface.send_raw(self._target, raw_bytes)
@@ -114,7 +146,10 @@ class NetAddr():
         self._osc_interface.send_msg(self._target, *args)
 
     def send_bundle(self, time, *elements):
-        self._osc_interface.send_bundle(self._target, time, *elements)
+        if self._coalescer is not None and self.proto == 'udp':
+            self._coalescer.send_bundle(self._osc_interface, time, elements)
+        else:
+            self._osc_interface.send_bundle(self._target, time, *elements)
 
     def send_clumped_bundles(self, time, *elements):
         if self._calc_bndl_dgram_size(elements) > self._MAX_UDP_DGRAM_SIZE:
@@ -133,47 +168,83 @@ class NetAddr():
 
     def sync(self, condition=None, latency=None, elements=None):
         condition = condition or stm.Condition()
-        if elements is None:
-            id = self._make_sync_responder(condition)
-            self.send_bundle(latency, ['/sync', id])
+        manager = _sync_manager(self)
+        for item in self._sync_clumps(elements):
+            condition.test = False
+            manager.send(self, latency, item, self._signal_func(condition))
+            if latency is not None:
+                latency += 1e-9  # One nanosecond later each.
             yield from condition.wait()
-        else:
-            sync_size = self._SYNC_BNDL_DGRAM_SIZE
-            max_size = self._MAX_UDP_DGRAM_SIZE - sync_size
-            if self._calc_bndl_dgram_size(elements) > max_size:
-                for item in self._clump_bundle(elements, max_size):
-                    id = self._make_sync_responder(condition)
-                    item.append(['/sync', id])
-                    self.send_bundle(latency, *item)
-                    if latency is not None:
-                        latency += 1e-9  # One nanosecond later each.
-                    yield from condition.wait()
-            else:
-                id = self._make_sync_responder(condition)
-                elements = list(elements)
-                elements.append(['/sync', id])
-                self.send_bundle(latency, *elements)
-                yield from condition.wait()
-
-    def _make_sync_responder(self, condition):
-        id = bi.uid()
-
-        def resp_func(msg, *_):
-            if msg[1] == id:
-                resp.free()
+
+    async def async_sync(self, latency=None, elements=None):
+        '''Awaitable version of sync to be used from asyncio coroutines.'''
+        manager = _sync_manager(self)
+        for item in self._sync_clumps(elements):
+            future = manager.future(self, latency, item)
+            if latency is not None:
+                latency += 1e-9  # One nanosecond later each.
+            await future
+
+    def sync_many(self, elements, condition=None, latency=None):
+        '''
+        Send elements in as many bundles as needed, each followed by its
+        own /sync, without waiting in between, and wait until all of them
+        are done. To be used as a barrier for bulk loading.
+        '''
+        condition = condition or stm.Condition()
+        condition.test = False
+        manager = _sync_manager(self)
+        clumps = self._sync_clumps(elements)
+        count = len(clumps)
+
+        def done():
+            nonlocal count
+            count -= 1
+            if count == 0:
                 condition.test = True
                 condition.signal()
 
-        resp = rdf.OscFunc(resp_func, '/synced', self)
-        return id
+        for item in clumps:
+            manager.send(self, latency, item, done)
+            if latency is not None:
+                latency += 1e-9  # One nanosecond later each.
+        yield from condition.wait()
+
+    async def async_sync_many(self, elements, latency=None):
+        '''Awaitable version of sync_many.'''
+        manager = _sync_manager(self)
+        futures = []
+        for item in self._sync_clumps(elements):
+            futures.append(manager.future(self, latency, item))
+            if latency is not None:
+                latency += 1e-9  # One nanosecond later each.
+        await asyncio.gather(*futures)
+
+    def _sync_clumps(self, elements):
+        # Bundle contents to be sent each with a /sync message at the end.
+        if elements is None:
+            return [[]]
+        sync_size = self._SYNC_BNDL_DGRAM_SIZE
+        max_size = self._MAX_UDP_DGRAM_SIZE - sync_size
+        if self._calc_bndl_dgram_size(elements) > max_size:
+            return self._clump_bundle(elements, max_size)
+        else:
+            return [list(elements)]
+
+    @staticmethod
+    def _signal_func(condition):
+        def signal():
+            condition.test = True
+            condition.signal()
+        return signal
 
     def _clump_bundle(self, elements, size=8192):
         elist = []
-        for e in elements:
+        for e in elements:  # Sizes include the element size bytes.
             if isinstance(e[0], str):
-                elist.append((self._calc_msg_dgram_size(e), e))
+                elist.append((self._calc_msg_dgram_size(e) + 4, e))
             elif isinstance(e[0], (int, float)):  # bundle
-                elist.append((self._calc_bndl_dgram_size(e[1:]), e))
+                elist.append((self._calc_bndl_dgram_size(e[1:]) + 4, e))
             else:
                 raise ValueError(
                     'elements within bundles must be valid OSC '
@@ -238,6 +309,107 @@ class NetAddr():
         return f"{type(self).__name__}('{self.hostname}', {self.port})"
 
 
+class _SyncManager():
+    # Allocates /sync ids for a target and keeps one permanent /synced
+    # responder. The server replies /sync messages in the order they are
+    # received so a reply also completes the ids sent before it as
+    # immediate messages, e.g. if a reply datagram was lost. Ids sent in
+    # timed bundles are only completed by their own reply. Pending syncs
+    # are dropped by CmdPeriod. Use _sync_manager() to get the instance
+    # for a target. Equal NetAddr objects share the manager but may send
+    # by different paths (TCP, coalescing), so /sync is sent by the same
+    # addr as the commands before it. The responder matches replies by
+    # equality.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiting = dict()  # id: (ordered, func)
+        self._ordered = collections.deque()  # Immediate ids in send order.
+        self._resp = None
+
+    def send(self, addr, latency, elements, func):
+        # Send elements followed by a /sync message through addr, func is
+        # called without arguments when done. Ids are allocated and sent under the lock to
+        # keep immediate ids in order.
+        ordered = latency is None
+        with self._lock:
+            if self._resp is None:
+                self._resp = rdf.OscFunc(self._recv, '/synced', addr)
+                self._resp.permanent = True
+                sac.CmdPeriod.add(self._on_cmd_period)
+            id = bi.uid()
+            self._waiting[id] = (ordered, func)
+            if ordered:
+                self._ordered.append(id)
+            addr.send_bundle(latency, *elements, ['/sync', id])
+        return id
+
+    def future(self, addr, latency, elements):
+        # Send elements followed by a /sync message through addr and return
+        # a future of the current asyncio event loop that is set when done.
+        # Must be called from a coroutine.
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def set_result():
+            if not future.done():
+                future.set_result(None)
+
+        def done_callback(future):
+            if future.cancelled():
+                with self._lock:
+                    self._waiting.pop(id, None)
+
+        id = self.send(
+            addr, latency, elements,
+            lambda: loop.call_soon_threadsafe(set_result))
+        future.add_done_callback(done_callback)
+        return future
+
+    def _recv(self, msg, *_):
+        id = msg[1]
+        done = []
+        with self._lock:
+            try:
+                ordered, func = self._waiting.pop(id)
+            except KeyError:
+                return
+            if ordered:
+                while self._ordered:
+                    prev = self._ordered.popleft()
+                    if prev == id:
+                        break
+                    item = self._waiting.pop(prev, None)
+                    if item is not None:
+                        done.append(item[1])
+            done.append(func)
+        for func in done:
+            func()
+
+    def _on_cmd_period(self):
+        with self._lock:
+            self._waiting.clear()
+            self._ordered.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._waiting)
+
+
+_sync_managers = dict()
+_sync_managers_lock = threading.Lock()
+
+
+def _sync_manager(addr):
+    # Return the _SyncManager for the target of addr, a NetAddr.
+    with _sync_managers_lock:
+        try:
+            return _sync_managers[addr]
+        except KeyError:
+            manager = _sync_managers[addr] = _SyncManager()
+            return manager
+
+
 class BundleNetAddr(NetAddr):
     # Important difference: This class is a context manager. forkIfNeeded
     # can't be implemented, addr.sync() use it in sclang. Here sync calls are
@@ -286,6 +458,27 @@ class BundleNetAddr(NetAddr):
         self._last_sync = len(self._bundle)
         self._bundle.append([self._SYNC_FLAG, latency, elements])
 
+    async def async_sync(self, latency=None, elements=None):
+        if self._send:
+            self._send_last_bundle()
+            await self._save_addr.async_sync(latency, elements)
+        self._last_sync = len(self._bundle)
+        self._bundle.append([self._SYNC_FLAG, latency, elements])
+
+    def sync_many(self, elements, condition=None, latency=None):
+        if self._send:
+            self._send_last_bundle()
+            yield from self._save_addr.sync_many(elements, None, latency)
+        self._last_sync = len(self._bundle)
+        self._bundle.append([self._SYNC_FLAG, latency, elements])
+
+    async def async_sync_many(self, elements, latency=None):
+        if self._send:
+            self._send_last_bundle()
+            await self._save_addr.async_sync_many(elements, latency)
+        self._last_sync = len(self._bundle)
+        self._bundle.append([self._SYNC_FLAG, latency, elements])
+
     def _send_last_bundle(self):
         time = self._server.latency if self._server else None
         bundle = self._bundle[self._last_sync+1:]
@@ -1,16 +1,20 @@
 """ResponseDefs.sc"""
 
 from abc import ABC, abstractmethod
+import collections
 import inspect
 import logging
+import asyncio
+import threading
 
 from ..synth import server as srv
 from . import functions as fn
 from . import systemactions as sac
+from . import clock as clk
 from . import model as mdl
 from . import main as _libsc3
 from . import utils as utl
-from ._oscmatch import osc_rematch_pattern as _match_osc_address_pattern
+from ._oscmatch import OscAddressSpace as _OscAddressSpace
 
 
 __all__ = ['OscFunc']
@@ -323,12 +327,63 @@ class OSCMessageDispatcher(AbstractWrappingDispatcher):
 
 
 class OSCMessagePatternDispatcher(OSCMessageDispatcher):
+    # Responders' paths are kept in an address space trie, the functions
+    # matched by each received address pattern are cached until
+    # responders are added, removed or updated.
+
+    CACHE_SIZE = 1024
+
+    def __init__(self):
+        super().__init__()
+        self._address_space = _OscAddressSpace()
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()  # Trie changes and lookups.
+
+    def add(self, func_proxy):
+        super().add(func_proxy)
+        with self._lock:
+            for key in self.get_keys_for_func_proxy(func_proxy):
+                self._address_space.add(key)
+            self._clear_cache()
+
+    def remove(self, func_proxy):
+        super().remove(func_proxy)
+        with self._lock:
+            for key in self.get_keys_for_func_proxy(func_proxy):
+                if not self.active[key]:
+                    del self.active[key]
+                    self._address_space.remove(key)
+            self._clear_cache()
+
+    def update_func_for_func_proxy(self, func_proxy):
+        super().update_func_for_func_proxy(func_proxy)
+        with self._lock:
+            self._clear_cache()
+
+    def _clear_cache(self):
+        self._cache.clear()
+
+    def _match(self, pattern):
+        cache = self._cache
+        try:
+            funcs = cache[pattern]
+            cache.move_to_end(pattern)
+            return funcs
+        except KeyError:
+            pass
+        with self._lock:
+            active = self.active
+            funcs = tuple(
+                func for key in self._address_space.match(pattern)
+                for func in active.get(key, ()))
+            cache[pattern] = funcs
+            if len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
+        return funcs
+
     def __call__(self, msg, time, addr, recv_port):
-        pattern = msg[0]
-        for key, funcs in self.active.items():
-            if _match_osc_address_pattern(pattern, key):
-                for func in funcs:
-                    fn.value(func, msg, time, addr, recv_port)
+        for func in self._match(msg[0]):
+            fn.value(func, msg, time, addr, recv_port)
 
     def type_key(self):
         return 'OSC matched'
@@ -367,12 +422,8 @@ class OscFunc(AbstractResponderFunc):
         self.src_id = src_id
         self.recv_port = recv_port
         if recv_port is not None:
-            # This whould require to create another OscUdpInterface or
-            # OSCUDPServer which is something I don't want because I don't
-            # know why this is important of if it works for TCP in sclang.
-            # OscFuncRecvPortMessageMatcher and OscFuncBothMessageMatcher
-            # are needed only by this feature.
-            _libsc3.main.open_udp_port(recv_port)  # Not implemented.
+            # The port is served by the main interface's receive loop.
+            _libsc3.main.open_udp_port(recv_port)
         self.arg_template = arg_template
         self._func = func
         self.dispatcher = dispatcher or type(self).default_dispatcher
@@ -383,8 +434,9 @@ class OscFunc(AbstractResponderFunc):
     def matching(cls, func, path, src_id=None,
                  recv_port=None, arg_template=None):
         return cls(
-            func, path, src_id, recv_port, arg_template,
-            cls.default_matching_dispatcher)
+            func, path, src_id, recv_port=recv_port,
+            arg_template=arg_template,
+            dispatcher=cls.default_matching_dispatcher)
 
     @classmethod
     def __on_cmd_period(cls):  # Avoid clash.
@@ -414,6 +466,125 @@ class OscFunc(AbstractResponderFunc):
 # class OscDef(OscFunc):
 
 
+class _PendingReply():
+    __slots__ = ('_correlator', 'key', 'func', 'on_timeout')
+
+    def __init__(self, correlator, key, func, on_timeout):
+        self._correlator = correlator
+        self.key = key
+        self.func = func
+        self.on_timeout = on_timeout
+
+    def cancel(self):
+        # Return True if the request was still pending.
+        return self._correlator._remove(self)
+
+    def _expire(self):
+        if self._correlator._remove(self):
+            fn.value(self.on_timeout)
+
+
+class _ReplyCorrelator():
+    # Routes the replies of a path from src_id to pending requests by the
+    # values of the first key_size arguments of the reply, requests with
+    # the same key are replied in order. The responder is created on the
+    # first request and kept, pending requests are dropped by CmdPeriod.
+    # Use _reply_correlator() to get the instance for a path and source.
+
+    def __init__(self, path, src_id, key_size):
+        self.path = path
+        self.src_id = src_id
+        self.key_size = key_size
+        self._pending = dict()  # key: deque of _PendingReply
+        self._lock = threading.Lock()
+        self._resp = None
+
+    def request(self, key, func, timeout=None, on_timeout=None):
+        # Register func to be called with the reply message whose key
+        # arguments are equal to key (a tuple). If timeout is not None
+        # and there is no reply after timeout seconds the request is
+        # removed and on_timeout is called. Must be called before sending
+        # the message that will be replied.
+        request = _PendingReply(self, key, func, on_timeout)
+        with self._lock:
+            if self._resp is None:
+                self._resp = OscFunc(self._recv, self.path, self.src_id)
+                self._resp.permanent = True
+                sac.CmdPeriod.add(self._on_cmd_period)
+            try:
+                self._pending[key].append(request)
+            except KeyError:
+                self._pending[key] = collections.deque([request])
+        if timeout is not None:
+            clk.SystemClock.sched(timeout, lambda: request._expire())
+        return request
+
+    def future(self, key):
+        # Return a future of the current asyncio event loop that is set
+        # with the reply message. The request is removed if the future is
+        # cancelled (e.g. by asyncio.wait_for). Must be called from a
+        # coroutine before sending the message that will be replied.
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def set_result(msg):
+            if not future.done():
+                future.set_result(msg)
+
+        def done_callback(future):
+            if future.cancelled():
+                request.cancel()
+
+        request = self.request(
+            key, lambda msg: loop.call_soon_threadsafe(set_result, msg))
+        future.add_done_callback(done_callback)
+        return future
+
+    def _recv(self, msg, *_):
+        key = tuple(msg[1:1 + self.key_size])
+        with self._lock:
+            queue = self._pending.get(key)
+            if not queue:
+                return
+            request = queue.popleft()
+            if not queue:
+                del self._pending[key]
+        request.func(msg)
+
+    def _remove(self, request):
+        with self._lock:
+            queue = self._pending.get(request.key)
+            if queue is None or request not in queue:
+                return False
+            queue.remove(request)
+            if not queue:
+                del self._pending[request.key]
+            return True
+
+    def _on_cmd_period(self):
+        with self._lock:
+            self._pending.clear()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(queue) for queue in self._pending.values())
+
+
+_reply_correlators = dict()
+_reply_correlators_lock = threading.Lock()
+
+
+def _reply_correlator(path, src_id, key_size):
+    # Return the _ReplyCorrelator for path and src_id, a server's NetAddr.
+    with _reply_correlators_lock:
+        try:
+            return _reply_correlators[(path, src_id, key_size)]
+        except KeyError:
+            correlator = _ReplyCorrelator(path, src_id, key_size)
+            _reply_correlators[(path, src_id, key_size)] = correlator
+            return correlator
+
+
 ### MIDI ###
 
 # MIDI implementation needs some thought, mostly because there
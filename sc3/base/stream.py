@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 import inspect
 import enum
 import threading
+import weakref
 import random
 import logging
 
@@ -21,7 +22,7 @@ from . import clock as clk
 
 
 __all__ = [
-    'Routine', 'routine', 'FunctionStream',
+    'Routine', 'LightRoutine', 'routine', 'FunctionStream',
     'Condition', 'FlowVar', 'stream', 'embed']
 
 
@@ -143,6 +144,23 @@ class _MainTimeThread(TimeThread):
         pass
 
 
+class _RtMainTimeThread(_MainTimeThread):
+    # In rt mode clocks run concurrently, logical
+    # time is local to each system thread.
+
+    def __init__(self):  # override
+        self._local = threading.local()
+        super().__init__()
+
+    @property
+    def _m_seconds(self):
+        return getattr(self._local, 'seconds', 0.0)
+
+    @_m_seconds.setter
+    def _m_seconds(self, seconds):
+        self._local.seconds = seconds
+
+
 ### Stream.sc part 1 ###
 
 
@@ -386,74 +404,77 @@ class Routine(TimeThread, Stream):
 
     def next(self, inval=None):
         with self._state_cond:
-            if self.state == self.State.Paused:
-                raise PauseStream
+            return self._next(inval)
 
-            # Done & AlwaysYield.
-            if self.state == self.State.Done:
-                if self._terminal_value is self._SENTINEL:
-                    raise StopStream
-                else:
-                    return self._terminal_value
+    def _next(self, inval=None):
+        if self.state == self.State.Paused:
+            raise PauseStream
 
-            self.parent = _libsc3.main.current_tt
-            _libsc3.main.current_tt = self
-            if self._clock:
-                self._m_seconds = self.parent._m_seconds
+        # Done & AlwaysYield.
+        if self.state == self.State.Done:
+            if self._terminal_value is self._SENTINEL:
+                raise StopStream
             else:
-                self._m_seconds = self.parent._seconds
-
-            try:
-                self.state = self.State.Running
-                if self._iterator is None:
-                    if self._func_isgenfunc:
-                        if self._func_has_inval:
-                            self._iterator = self.func(inval)
-                        else:
-                            self._iterator = self.func()
-                        self._last_value = next(self._iterator)
+                return self._terminal_value
+
+        self.parent = _libsc3.main.current_tt
+        _libsc3.main.current_tt = self
+        if self._clock:
+            self._m_seconds = self.parent._m_seconds
+        else:
+            self._m_seconds = self.parent._seconds
+
+        try:
+            self.state = self.State.Running
+            if self._iterator is None:
+                if self._func_isgenfunc:
+                    if self._func_has_inval:
+                        self._iterator = self.func(inval)
                     else:
-                        # Comon functions for routines generate nil streams
-                        # in sclang, return value doesn't count. Check over.
-                        if self._func_has_inval:
-                            # raise AlwaysYield(self.func(inval))
-                            self.func(inval)
-                        else:
-                            # raise AlwaysYield(self.func())
-                            self.func()
-                        raise AlwaysYield(None)
+                        self._iterator = self.func()
+                    self._last_value = next(self._iterator)
                 else:
-                    self._last_value = self._iterator.send(inval)
-                self.state = self.State.Suspended
-            except StopStream:
-                self._iterator = None
-                self._last_value = None
-                self._clock = None
-                self.state = self.State.Done
-                raise
-            except StopIteration:
-                self._iterator = None
-                self._last_value = None
-                self._clock = None
-                self.state = self.State.Done
-                raise StopStream from None
-            except YieldAndReset as e:
-                self._iterator = None
-                self.state = self.State.Init
-                self._last_value = e.yield_value
-            except AlwaysYield as e:
-                self._iterator = None
-                self._terminal_value = e.terminal_value
-                self.state = self.State.Done
-                self._last_value = self._terminal_value
-            except:
-                self.state = self.State.Done  # Failure.
-                raise
-            finally:
-                _libsc3.main.current_tt = self.parent
-                self.parent = None
-
-            return self._last_value
+                    # Comon functions for routines generate nil streams
+                    # in sclang, return value doesn't count. Check over.
+                    if self._func_has_inval:
+                        # raise AlwaysYield(self.func(inval))
+                        self.func(inval)
+                    else:
+                        # raise AlwaysYield(self.func())
+                        self.func()
+                    raise AlwaysYield(None)
+            else:
+                self._last_value = self._iterator.send(inval)
+            self.state = self.State.Suspended
+        except StopStream:
+            self._iterator = None
+            self._last_value = None
+            self._clock = None
+            self.state = self.State.Done
+            raise
+        except StopIteration:
+            self._iterator = None
+            self._last_value = None
+            self._clock = None
+            self.state = self.State.Done
+            raise StopStream from None
+        except YieldAndReset as e:
+            self._iterator = None
+            self.state = self.State.Init
+            self._last_value = e.yield_value
+        except AlwaysYield as e:
+            self._iterator = None
+            self._terminal_value = e.terminal_value
+            self.state = self.State.Done
+            self._last_value = self._terminal_value
+        except:
+            self.state = self.State.Done  # Failure.
+            raise
+        finally:
+            _libsc3.main.current_tt = self.parent
+            self.parent = None
+
+        return self._last_value
 
     def reset(self):
         with self._state_cond:
@@ -497,6 +518,63 @@ class Routine(TimeThread, Stream):
         return self.next(beats)
 
 
+class _NoLock():
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+_NO_LOCK = _NoLock()
+
+# Functions' (has_inval, isgenfunc) pairs, computed once per function.
+_func_info_cache = weakref.WeakKeyDictionary()
+
+
+def _func_info(func):
+    try:
+        return _func_info_cache[func]
+    except KeyError:
+        pass
+    except TypeError:
+        raise TypeError('LightRoutine argument is not a function') from None
+    if not inspect.isfunction(func):
+        raise TypeError('LightRoutine argument is not a function')
+    info = _func_info_cache[func] = (
+        len(inspect.signature(func).parameters) > 0,
+        inspect.isgeneratorfunction(func))
+    return info
+
+
+class LightRoutine(Routine):
+    """Routine without per instance lock for short lived streams.
+
+    Has the same states and behaviour as Routine but function signatures
+    are inspected once and cached, and state changes are not synchronized.
+    It is meant for many short lived routines (grains, pattern voices)
+    that are driven by a single clock and not paused, resumed or stopped
+    from other threads.
+    """
+
+    _state_cond = _NO_LOCK
+
+    def __init__(self, func):
+        self._func_has_inval, self._func_isgenfunc = _func_info(func)
+        self.func = func
+        self.parent = None
+        self.state = self.State.Init
+        self._m_seconds = 0.0
+        self._clock = None
+        self._thread_player = None
+        self._rgen = _libsc3.main.current_tt.rgen
+        self._iterator = None
+        self._last_value = None
+        self._terminal_value = self._SENTINEL
+
+    next = Routine._next
+
+
 # decorator syntax
 class routine():
     def __new__(cls, func):
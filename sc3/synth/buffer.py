@@ -516,15 +516,14 @@ class Buffer(gpp.UGenParameter, gpp.NodeParameter):
         if self._bufnum is None:
             raise BufferAlreadyFreed('get')
 
-        def resp_func(msg, *_):
+        def resp_func(msg):
             # // The server replies with a message of the form:
             # // [/b_set, bufnum, index, value]. We want 'value,'
             # // which is at index 3.
             fn.value(action, msg[3])
 
-        rdf.OscFunc(
-            resp_func, '/b_set', self._server.addr,
-            arg_template=[self._bufnum, index]).one_shot()
+        rdf._reply_correlator('/b_set', self._server.addr, 2).request(
+            (self._bufnum, index), resp_func)
 
         self._server.send_msg(*self.get_msg(index))
 
@@ -537,15 +536,14 @@ class Buffer(gpp.UGenParameter, gpp.NodeParameter):
         if self._bufnum is None:
             raise BufferAlreadyFreed('getn')
 
-        def resp_func(msg, *_):
+        def resp_func(msg):
             # // The server replies with a message of the form:
             # // [/b_setn, bufnum, starting index, length, ...sample values].
             # // We want the sample values, which start at index 4.
             fn.value(action, msg[4:])
 
-        rdf.OscFunc(
-            resp_func, '/b_setn', self._server.addr,
-            arg_template=[self._bufnum, index]).one_shot()
+        rdf._reply_correlator('/b_setn', self._server.addr, 2).request(
+            (self._bufnum, index), resp_func)
 
         self._server.send_msg(*self.getn_msg(index, count))
 
@@ -722,13 +720,25 @@ class Buffer(gpp.UGenParameter, gpp.NodeParameter):
                     f'num_channels: {num_channels}\n'
                     f'sample_rate: {sample_rate}')  # *** BUG: o estos son print? Lo mismo pasa con s.query_tree().
 
-        def resp_func(msg, *_):
+        def resp_func(msg):
             fn.value(action, *msg)
 
-        rdf.OscFunc(
-            resp_func, '/b_info', self._server.addr,
-            arg_template=[self._bufnum]).one_shot()
+        rdf._reply_correlator('/b_info', self._server.addr, 1).request(
+            (self._bufnum,), resp_func)
+        self._server.send_msg('/b_query', self._bufnum)
+
+    async def async_query(self):
+        '''
+        Awaitable version of query to be used from asyncio coroutines,
+        returns a tuple (bufnum, num_frames, num_channels, sample_rate).
+        '''
+        if self._bufnum is None:
+            raise BufferAlreadyFreed('async_query')
+        future = rdf._reply_correlator(
+            '/b_info', self._server.addr, 1).future((self._bufnum,))
         self._server.send_msg('/b_query', self._bufnum)
+        msg = await future
+        return tuple(msg[1:])
 
     def query_msg(self):
         if self._bufnum is None:
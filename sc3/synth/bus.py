@@ -170,14 +170,13 @@ class Bus(gpp.UGenParameter, gpp.NodeParameter):
                     print(f'bus {self._rate} index: {self._index} value: {val}')
                 action = default_action_func
 
-            def get_func(msg, *_):
+            def get_func(msg):
                 # // The response is of the form [/c_set, index, value].
                 # // We want "value," which is at index 2.
                 action(msg[2])
 
-            rdf.OscFunc(
-                get_func, '/c_set', self._server.addr,
-                arg_template=[self._index]).one_shot()
+            rdf._reply_correlator('/c_set', self._server.addr, 1).request(
+                (self._index,), get_func)
             self._server.send_msg('/c_get', self._index)
         else:
             self.getn(self._num_channels, action)
@@ -196,14 +195,13 @@ class Bus(gpp.UGenParameter, gpp.NodeParameter):
                 print(f'bus {self._rate} index: {self._index} values: {vals}')
             action = default_action_func
 
-        def getn_func(msg, *_):
+        def getn_func(msg):
             # // The response is of the form [/c_set, index, count, ...values].
             # // We want the values, which are at indexes 3 and above.
             action(msg[3:])
 
-        rdf.OscFunc(
-            getn_func, '/c_setn', self._server.addr,
-            arg_template=[self._index]).one_shot()
+        rdf._reply_correlator('/c_setn', self._server.addr, 1).request(
+            (self._index,), getn_func)
         if count is None:
             count = self._num_channels
         self._server.send_msg('/c_getn', self._index, count)
@@ -200,12 +200,22 @@ class Node(gpp.NodeParameter):
                             f'\n   tail: {tail}')
                 print(msg)
 
-        rdf.OscFunc(
-            lambda msg, *_: action(*msg),
-            '/n_info', self.server.addr,
-            arg_template=[self.node_id]).one_shot()
+        rdf._reply_correlator('/n_info', self.server.addr, 1).request(
+            (self.node_id,), lambda msg: action(*msg))
         self.server.send_msg('/n_query', self.node_id)
 
+    async def async_query(self):
+        '''
+        Awaitable version of query to be used from asyncio coroutines,
+        returns the arguments of the /n_info reply as a tuple (node_id,
+        parent, prev, next, is_group[, head, tail]).
+        '''
+        future = rdf._reply_correlator(
+            '/n_info', self.server.addr, 1).future((self.node_id,))
+        self.server.send_msg('/n_query', self.node_id)
+        msg = await future
+        return tuple(msg[1:])
+
     def register(self, playing=True, running=True):
         self.server._node_watcher.register(self, playing, running)
 
@@ -656,15 +666,14 @@ class Synth(Node):
                 node_to_replace.node_id, *gpp.node_param(args)._as_osc_arg_list()] # 9
 
     def get(self, index, action):
-        def resp_func(msg, *_):
+        def resp_func(msg):
             # // The server replies with a message of the
             # // form: [/n_set, node ID, index, value].
             # // We want 'value' which is at index 3.
             fn.value(action, msg[3])
 
-        rdf.OscFunc(
-            resp_func, '/n_set', self.server.addr,
-            arg_template=[self.node_id, index]).one_shot()
+        rdf._reply_correlator('/n_set', self.server.addr, 2).request(
+            (self.node_id, index), resp_func)
 
         self.server.send_msg('/s_get', self.node_id, index)  # 44
 
@@ -672,17 +681,16 @@ class Synth(Node):
         return ['/s_get', self.node_id, index] # 44
 
     def getn(self, index, count, action):
-        def resp_func(msg, *_):
+        def resp_func(msg):
             # // The server replies with a message of the form
             # // [/n_setn, node ID, index, count, *values].
             # // We want '*values' which are at indexes 4 and above.
             fn.value(action, msg[4:])
 
-        rdf.OscFunc(
-            resp_func, '/n_setn', self.server.addr,
-            arg_template=[self.node_id, index]).one_shot()
+        rdf._reply_correlator('/n_setn', self.server.addr, 2).request(
+            (self.node_id, index), resp_func)
 
-        self.server.send_msg('/s_getn', self.node_id, index)  # 45
+        self.server.send_msg('/s_getn', self.node_id, index, count)  # 45
 
     def getn_msg(self, index, count):
         return ['/s_getn', self.node_id, index, count] # 45
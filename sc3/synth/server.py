@@ -618,6 +618,13 @@ class Server(gpp.NodeParameter, metaclass=MetaServer):
     def send_bundle(self, time, *elements):
         self.addr.send_bundle(time, *elements)
 
+    def enable_coalescing(self, max_size=None):
+        # See NetAddr.enable_coalescing.
+        self.addr.enable_coalescing(max_size)
+
+    def disable_coalescing(self):
+        self.addr.disable_coalescing()
+
     def send_synthdef(self, name, dir=None):
         # // Load from disk locally, send remote.
         dir = dir or plf.Platform.synthdef_dir
@@ -661,10 +668,41 @@ class Server(gpp.NodeParameter, metaclass=MetaServer):
 
     def sync(self, condition=None, latency=None, elements=None):
         if _libsc3.main is _libsc3.NrtMain:
+            # The score has no replies, only the wait is skipped.
+            if elements:
+                self.addr.send_bundle(latency, *elements)
             yield 0  # *** NOTE: Depends on Condition implementation.
         else:
             yield from self.addr.sync(condition, latency, elements)
 
+    async def async_sync(self, latency=None, elements=None):
+        '''Awaitable version of sync to be used from asyncio coroutines.'''
+        if _libsc3.main is _libsc3.NrtMain:
+            if elements:
+                self.addr.send_bundle(latency, *elements)
+            return
+        await self.addr.async_sync(latency, elements)
+
+    def sync_many(self, elements, condition=None, latency=None):
+        '''
+        Send elements in as many bundles as needed without waiting in
+        between and wait until the server is done with all of them.
+        '''
+        if _libsc3.main is _libsc3.NrtMain:
+            if elements:
+                self.addr.send_bundle(latency, *elements)
+            yield 0  # *** NOTE: Depends on Condition implementation.
+        else:
+            yield from self.addr.sync_many(elements, condition, latency)
+
+    async def async_sync_many(self, elements, latency=None):
+        '''Awaitable version of sync_many.'''
+        if _libsc3.main is _libsc3.NrtMain:
+            if elements:
+                self.addr.send_bundle(latency, *elements)
+            return
+        await self.addr.async_sync_many(elements, latency)
+
 
     ### Network message bundling ###
 
@@ -1,9 +1,15 @@
 
 import unittest
+import time
+import socket
 
 import sc3
 from sc3.base.netaddr import NetAddr
 from sc3.base.responsedefs import OscFunc
+from sc3.base.clock import TempoClock
+from sc3.base.stream import Routine
+from sc3.base import _oscinterface as osci
+from sc3.base import _osclib as oli
 
 sc3.init()
 
@@ -23,6 +29,93 @@ class BundleTestCase(unittest.TestCase):
             ValueError,
             lambda n: n.send_bundle(0, ['/msg', 1], [None, ['/msg', 2]]), n);
 
+    def test_msg_templates(self):
+        osc = sc3.base.main.main._osc_interface
+        msg = ['/s_new', 'default', 1001, 0, 1, 'freq', 440.0, 'out', 0]
+        dgram = osc._build_msg(msg).dgram
+        self.assertIn(('/s_new', 'siiisfsi'), osc._templates)
+        self.assertEqual(  # Same length addresses.
+            dgram[8:], osc._build_msg(['/s_neu', *msg[1:]]).dgram[8:])
+        # Values converted by _build_msg don't use templates.
+        msg = ['/n_set', 1001, 'gate', True, 'freq', None, 'arr', '[', 1, ']']
+        osc._build_msg(msg)
+        self.assertEqual(
+            [k for k in osc._templates if k[0] == '/n_set'], [])
+        template = osc.msg_template('/tmpl', 'if')
+        self.assertIs(osc.msg_template('/tmpl', 'if'), template)
+        self.assertEqual(osc._build_msg(['/tmpl', 1, 0.5]).params, [1, 0.5])
+
+    def test_coalescing(self):
+        osc = sc3.base.main.main._osc_interface
+        n = NetAddr('127.0.0.1', NetAddr.lang_port())
+        results = []
+        func = OscFunc(lambda msg, *_: results.append(msg[1]), '/coal')
+        clock = TempoClock(10)
+
+        def make_task(i):
+            return lambda: n.send_bundle(0.01, ['/coal', i])
+
+        def send(n, count):
+            received = osc.stats()['received']
+            beat = clock.beats + 1
+            for i in range(count):
+                # Routines run in logical time, same time same timetag.
+                clock.sched_abs(beat, Routine(make_task(i)))
+            time.sleep(0.2)
+            return osc.stats()['received'] - received
+
+        try:
+            self.assertEqual(send(n, 8), 8)
+            n.enable_coalescing()
+            self.assertTrue(n.is_coalescing)
+            self.assertEqual(send(n, 8), 1)
+            n.enable_coalescing(60)  # Two 16 bytes messages per bundle.
+            self.assertEqual(send(n, 8), 4)
+            # Outside clock ticks bundles are sent right away.
+            n.send_bundle(0.01, ['/coal', 8])
+            n.send_bundle(0.01, ['/coal', 9])
+            time.sleep(0.1)
+            n.disable_coalescing()
+        finally:
+            func.free()
+            clock.stop()
+        self.assertEqual(
+            results, [*range(8), *range(8), *range(8), 8, 9])
+
+    def test_tcp_send(self):
+        osc = osci.OscTcpInterface()
+        osc._socket, peer = socket.socketpair()
+        peer.settimeout(1)
+        reader = oli.OscStreamReader()
+        try:
+            osc.send_msg(None, '/a', 1)
+            self.assertEqual(
+                [oli.OscMessage(p).params for p in reader.feed(peer.recv(64))],
+                [[1]])
+            osc.enable_coalescing(100)
+            clock = TempoClock(10)
+            beat = clock.beats + 0.1
+            def make_task(i):
+                return lambda: osc.send_msg(None, '/a', i)
+
+            for i in range(4):
+                clock.sched_abs(beat, make_task(i))
+            time.sleep(0.1)
+            clock.stop()
+            self.assertEqual(
+                [oli.OscMessage(p).params for p in reader.feed(peer.recv(256))],
+                [[0], [1], [2], [3]])
+            # Pending frames of another thread's tick are sent along.
+            msg = oli.OscMessageBuilder('/b').build()
+            osc._write_buffer += msg.size.to_bytes(4, 'big') + msg.dgram
+            osc.send_msg(None, '/a', 4)
+            self.assertEqual(
+                [oli.OscMessage(p).params for p in reader.feed(peer.recv(256))],
+                [[], [4]])
+        finally:
+            osc._socket.close()
+            peer.close()
+
     # BUG: Messages should have exactly the same decimal part (as in sclang).
     # This is needed for nested bundle times. Requires low level change
     # to UDP/TCP code. Is not critical.
@@ -0,0 +1,312 @@
+
+import unittest
+import threading
+import asyncio
+import math
+import time
+
+import sc3
+from sc3.base.clock import SystemClock, AppClock, TempoClock, AsyncioClock
+from sc3.base import clock as clk
+from sc3.base.stream import Routine
+from sc3.base.netaddr import NetAddr
+from sc3.base.responsedefs import OscFunc
+
+sc3.init()
+
+from sc3.base.main import main
+
+
+class ClockLockTestCase(unittest.TestCase):
+    def test_blocked_tempo_clock(self):
+        # A blocked TempoClock doesn't delay SystemClock or OSC responders.
+        clock = TempoClock()
+        unblock = threading.Event()
+        sys_times = []
+        osc_times = []
+
+        clock.sched(0, lambda: unblock.wait(2))
+        time.sleep(0.05)
+        start = main.elapsed_time()
+        SystemClock.sched(
+            0.1, lambda: sys_times.append(main.elapsed_time()))
+        resp = OscFunc(
+            lambda *_: osc_times.append(main.elapsed_time()), '/stress')
+        NetAddr('127.0.0.1', NetAddr.lang_port()).send_msg('/stress')
+        time.sleep(0.3)
+        unblock.set()
+        resp.free()
+        clock.stop()
+
+        self.assertEqual(len(sys_times), 1)
+        self.assertLess(sys_times[0] - (start + 0.1), 0.05)
+        self.assertEqual(len(osc_times), 1)
+        self.assertLess(osc_times[0] - start, 0.1)
+
+    def test_cross_clock_sched(self):
+        # Tasks scheduling on each other's clocks don't deadlock.
+        clocks = [TempoClock(10), TempoClock(20)]
+        counts = [0, 0]
+        n = 50
+
+        def make_task(i):
+            def task():
+                counts[i] += 1
+                if counts[i] < n:
+                    clocks[1 - i].sched(0, tasks[1 - i])
+                    clocks[1 - i].tempo = 10 + counts[i]
+            return task
+
+        tasks = [make_task(0), make_task(1)]
+        clocks[0].sched(0, tasks[0])
+        clocks[1].sched(0, tasks[1])
+        time.sleep(0.3)
+        for clock in clocks:
+            clock.stop()
+        self.assertEqual(counts, [n, n])
+
+    def test_same_beat_batch(self):
+        # Tasks due at the same beat run in scheduling order, rescheduled
+        # tasks keep their order and clear stops the rest of the batch.
+        clock = TempoClock(20)
+        log = []
+
+        def make_task(i):
+            def task(beats):
+                log.append((beats, i))
+                if i == 3 and beats == 2:
+                    clock.clear()
+                    return
+                return 1
+            return task
+
+        with clock._sched_cond:
+            for i in range(5):
+                clock.sched_abs(0, make_task(i))
+        time.sleep(0.3)
+        clock.stop()
+
+        self.assertEqual(
+            log,
+            [(b, i) for b in (0, 1) for i in range(5)]
+            + [(2, 0), (2, 1), (2, 2), (2, 3)])
+
+    def test_spin_margin(self):
+        # Precision mode wakes up within the margin, lateness is recorded
+        # with stats.
+        clock = TempoClock(2)
+        clock.spin_margin = 0.005
+        self.assertIsNone(clock.lateness())
+        clock.enable_stats()
+        times = []
+
+        def task():
+            times.append(main.elapsed_time() - clock.beats2secs(clock.beats))
+            if len(times) < 20:
+                return 0.02
+
+        clock.sched(0, task)
+        time.sleep(0.4)
+        lateness = clock.lateness((0, 50, 100))
+        clock.stop()
+
+        self.assertEqual(len(times), 20)
+        self.assertEqual(list(lateness), [0, 50, 100])
+        self.assertLessEqual(lateness[0], lateness[50])
+        self.assertLessEqual(lateness[50], lateness[100])
+        self.assertLess(lateness[50], 0.002)
+        with self.assertRaises(ValueError):
+            clock.spin_margin = -1
+        clock = TempoClock()
+        clock.enable_stats()
+        self.assertEqual(clock.lateness((50,)), {50: None})
+        clock.stop()
+
+    def test_stats(self):
+        clock = TempoClock(20)
+        self.assertIsNone(clock.stats())
+        clock.enable_stats()
+
+        def chord_note():
+            pass
+
+        def rout():
+            for _ in range(3):
+                yield 1
+
+        with clock._sched_cond:
+            for _ in range(3):
+                clock.sched(0, chord_note)
+            Routine(rout).play(clock)
+        time.sleep(0.25)
+        stats = clock.stats()
+        clock.stop()
+
+        self.assertEqual(stats['wakeups'], 4)
+        self.assertEqual(stats['queue_depth'], 4)
+        self.assertEqual([h[2] for h in stats['history']], [4, 1, 1, 1])
+        self.assertEqual(set(stats['lateness']), {50, 90, 99, 100})
+        tasks = {k.split('.')[-1]: v for k, v in stats['tasks'].items()}
+        self.assertEqual(tasks['rout']['count'], 4)
+        self.assertEqual(tasks['chord_note']['count'], 3)
+        self.assertLessEqual(tasks['rout']['mean'], tasks['rout']['max'])
+        with self.assertRaises(ValueError):
+            clock.enable_stats(0)
+
+    def test_stats_ring(self):
+        # Tasks share the time of their batch, costs survive eviction and
+        # snapshots taken between the tasks and the time of the batch.
+        def func():
+            pass
+
+        task = Routine(func)
+        stats = clk._ClockStats(1)
+        for entry in (None, 1.0, task, 2.0):
+            stats.task(entry)
+        self.assertEqual(list(stats._costs()), [(task, 1.0)])
+        stats.task(task)
+        self.assertEqual(list(stats._costs()), [(task, 1.0)])
+        stats.task(task)  # The first task of the batch is evicted.
+        self.assertEqual(list(stats._costs()), [])
+        stats.task(5.0)
+        self.assertEqual(list(stats._costs()), [(task, 1.5), (task, 1.5)])
+        for entry in (None, 6.0, task, 6.5):
+            stats.task(entry)
+        self.assertEqual(list(stats._costs()), [(task, 0.5)])
+        for clock in (SystemClock, AppClock):
+            with self.subTest(clock=clock):
+                self.assertIsNone(clock.stats())
+                self.assertIsNone(clock.lateness())
+                clock.enable_stats()
+                self.assertEqual(clock.stats()['tasks'], {})
+                self.assertEqual(clock.lateness((50,)), {50: None})
+                clock.disable_stats()
+                self.assertIsNone(clock.stats())
+
+
+class TempoRampTestCase(unittest.TestCase):
+    def test_ramp(self):
+        # Routines run with their logical time.
+        clock = TempoClock(1)
+        times = []
+
+        def rout():
+            clock.ramp_tempo(2, 4)
+            times.append(main.current_tt._seconds)
+            for delta in (2, 2, 1):
+                yield delta
+                times.append(main.current_tt._seconds)
+
+        Routine(rout).play(clock)
+        time.sleep(3.4)
+        tempo = clock.tempo
+        clock.stop()
+
+        # Linear ramp: seconds = log(1 + k * beats / tempo0) / k.
+        k = 0.25
+        for i, beats in enumerate((2, 4), 1):
+            self.assertAlmostEqual(
+                times[i] - times[0], math.log1p(k * beats) / k, 9)
+        self.assertAlmostEqual(times[3] - times[2], 0.5, 9)
+        self.assertEqual(tempo, 2)
+
+    def test_lateness(self):
+        # Lateness during a ramp is converted with the ramp's tempo.
+        clock = TempoClock(10)
+        clock.enable_stats()
+        clock.ramp_tempo(100, 4)
+        beats = clock._ramp.beats0
+        time.sleep(0.2)  # Tasks can't run in the future.
+        with clock._sched_cond:
+            clock.sched_abs(beats + 2, lambda: None)
+            clock._perform(beats + 3)
+        stats = clock.stats()
+        clock.stop()
+        self.assertAlmostEqual(
+            stats['history'][-1][1],
+            clock.beats2secs(beats + 3) - clock.beats2secs(beats + 2), 9)
+
+    def test_beat_dur(self):
+        # Logical time is fixed within a routine.
+        clock = TempoClock(10)
+        clock.ramp_tempo(100, 4)
+        values = []
+
+        def rout():
+            yield 2
+            values.extend([clock.beat_dur(), clock.tempo])
+
+        Routine(rout).play(clock)
+        time.sleep(0.2)
+        clock.stop()
+        self.assertEqual(values[0], 1 / values[1])
+        self.assertGreater(values[1], 10)
+
+    def test_conversions(self):
+        clock = TempoClock(2)
+        clock.ramp_tempo(0.5, 2, 'exp')
+        beats = clock._ramp.beats0
+        for x in (-1, 0.5, 1, 1.5, 2, 3):
+            self.assertAlmostEqual(
+                clock.secs2beats(clock.beats2secs(beats + x)), beats + x, 9)
+        # Exponential ramp: seconds = (1 - exp(-k * beats)) / (k * tempo0).
+        k = math.log(0.25) / 2
+        self.assertAlmostEqual(
+            clock.beats2secs(beats + 2) - clock.beats2secs(beats),
+            -math.expm1(-k * 2) / (k * 2), 9)
+        clock.tempo = 3
+        self.assertEqual(clock.tempo, 3)
+        self.assertEqual(clock.beat_dur(), 1 / 3)
+        with self.assertRaises(ValueError):
+            clock.ramp_tempo(0, 2)
+        with self.assertRaises(ValueError):
+            clock.ramp_tempo(1, 2, 'sin')
+        clock.stop()
+
+
+class AsyncioClockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_routine(self):
+        # Routines keep logical time and can be played from other threads.
+        clock = AsyncioClock(self.loop)
+        times = []
+
+        def rout():
+            for _ in range(5):
+                times.append(main.current_tt._seconds)
+                yield 0.01
+
+        async def run():
+            threading.Thread(target=Routine(rout).play, args=(clock,)).start()
+            await asyncio.sleep(0.2)
+
+        self.loop.run_until_complete(run())
+        clock.stop()
+        self.assertEqual(len(times), 5)
+        for i in range(1, 5):
+            self.assertAlmostEqual(times[i] - times[i - 1], 0.01, 9)
+
+    def test_async_sync(self):
+        # /sync is echoed back as /synced from the same address.
+        addr = NetAddr('127.0.0.1', NetAddr.lang_port())
+        resp = OscFunc(
+            lambda msg, *_: addr.send_msg('/synced', msg[1]), '/sync')
+
+        async def run():
+            await asyncio.gather(*(addr.async_sync() for _ in range(10)))
+            return True
+
+        try:
+            self.assertTrue(self.loop.run_until_complete(
+                asyncio.wait_for(run(), 2)))
+        finally:
+            resp.free()
+
+
+if __name__ == '__main__':
+    unittest.main()
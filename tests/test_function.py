@@ -4,6 +4,7 @@ import operator
 
 import sc3
 import sc3.base.builtins as bi
+import sc3.base.functions as fn
 from sc3.base.functions import (
     Function, function, UnaryOpFunction, BinaryOpFunction, NAryOpFunction)
 
@@ -193,5 +194,39 @@ class FunctionTestCase(unittest.TestCase):
         self.assertRaisesRegex(TypeError, err_msg, f4123, 10, 100, 1000, c=3)
 
 
+    def test_value(self):
+        class Obj():
+            def method(self, a, b):
+                return (self, a, b)
+
+            def __call__(self, a):
+                return a
+
+        def f(a, b):
+            return (a, b)
+
+        def fv(a, *args):
+            return (a, *args)
+
+        obj1, obj2 = Obj(), Obj()
+        for _ in range(2):  # Cached on first call.
+            self.assertEqual(fn.value(f, 1, 2, 3), (1, 2))
+            self.assertEqual(fn.value(fv, 1, 2, 3), (1, 2, 3))
+            self.assertEqual(fn.value(f, 1, b=2), (1, 2))
+            self.assertEqual(fn.value(obj1.method, 1, 2, 3), (obj1, 1, 2))
+            self.assertEqual(fn.value(obj2.method, 1, 2, 3), (obj2, 1, 2))
+            self.assertEqual(fn.value(obj1, 1, 2, 3), 1)
+            self.assertEqual(fn.value(lambda: 1, 2, 3), 1)
+            self.assertEqual(fn.value(divmod, 7, 2, 3), (3, 1))
+            self.assertEqual(fn.value(3, 1, 2), 3)
+        self.assertEqual(fn._arity_cache[f], (2, False))
+        self.assertEqual(fn._arity_cache[fv], (2, True))
+        self.assertEqual(fn._method_arity_cache[Obj.method], (2, False))
+        self.assertNotIn(Obj.method, fn._arity_cache)
+        n = len(fn._arity_cache)
+        del f
+        self.assertEqual(len(fn._arity_cache), n - 1)  # Weak keys.
+
+
 if __name__ == '__main__':
     unittest.main()
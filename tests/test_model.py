@@ -57,7 +57,79 @@ class NotificationCenterTestCase(unittest.TestCase):
         for (o, m, l), a in zip(registrations, actions):
             self.assertIs(NotificationCenter._registrations[o][m][l], a, msg)
 
-    # TODO
+    def test_snapshots(self):
+        a = self.Object()
+        b = self.Object()
+        c = self.Object()
+        results = []
+
+        def b_action(obj, msg, listener, value):
+            results.append(('b', value))
+            # Changes are seen by the next notification.
+            NotificationCenter.unregister(obj, msg, listener)
+
+        NotificationCenter.register(a, 'changed', b, b_action)
+        NotificationCenter.register(
+            a, 'changed', c, lambda *args: results.append(('c', args[3])))
+        NotificationCenter.notify(a, 'changed', 1)
+        NotificationCenter.notify(a, 'changed', 2)
+        NotificationCenter.notify(a, 'other', 3)
+        self.assertEqual(results, [('b', 1), ('c', 1), ('c', 2)])
+
+        self.assertIn(a, NotificationCenter._snapshots)
+        del c  # Listeners and objects are weakly referenced.
+        NotificationCenter.notify(a, 'changed', 4)
+        self.assertNotIn(a, NotificationCenter._snapshots)
+        NotificationCenter.register(a, 'changed', b, b_action)
+        self.assertIn(a, NotificationCenter._snapshots)
+        n = len(NotificationCenter._snapshots)
+        del a
+        self.assertEqual(len(NotificationCenter._snapshots), n - 1)
+        self.assertEqual(len(results), 3)
+
+    def test_equal_objects(self):
+        # Objects are matched by equality, as Bus objects are.
+        class Key():
+            def __init__(self, index):
+                self.index = index
+
+            def __eq__(self, other):
+                return type(self) is type(other) and self.index == other.index
+
+            def __hash__(self):
+                return hash((type(self), self.index))
+
+        a = Key(0)
+        b = self.Object()
+        results = []
+        NotificationCenter.register(
+            a, 'changed', b, lambda *args: results.append(args[3]))
+        NotificationCenter.notify(Key(0), 'changed', 1)
+        NotificationCenter.notify(Key(1), 'changed', 2)
+        self.assertEqual(results, [1])
+        NotificationCenter.unregister(Key(0), 'changed', b)
+        NotificationCenter.notify(a, 'changed', 3)
+        self.assertEqual(results, [1])
+
+    def test_notify_not_weakrefable(self):
+        for obj in (1, 'a', (1, 2)):
+            NotificationCenter.notify(obj, 'changed', 1)
+
+    def test_unregister(self):
+        a = self.Object()
+        b = self.Object()
+        NotificationCenter.register(a, 'changed', b, lambda: None)
+        NotificationCenter.register(a, 'freed', b, lambda: None)
+        NotificationCenter.unregister(a, 'changed')
+        self.assertFalse(
+            NotificationCenter.registration_exists(a, 'changed', b))
+        self.assertTrue(NotificationCenter.registration_exists(a, 'freed', b))
+        self.assertEqual(
+            list(NotificationCenter._snapshots[a]), ['freed'])
+        NotificationCenter.unregister(a)
+        self.assertNotIn(a, NotificationCenter._snapshots)
+        with self.assertRaises(KeyError):
+            NotificationCenter.unregister(a, 'freed', b)
 
 
 if __name__ == '__main__':
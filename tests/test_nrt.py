@@ -0,0 +1,94 @@
+
+import unittest
+
+import sys
+import subprocess
+import textwrap
+
+
+class SyncNrtTestCase(unittest.TestCase):
+    # The library can be initialized once per process.
+
+    def run_script(self, script):
+        proc = subprocess.run(
+            [sys.executable, '-c', textwrap.dedent(script)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, timeout=60)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc.stdout.splitlines()
+
+    def test_run_until_run_all(self):
+        out = self.run_script('''
+            import sc3
+            sc3.init('nrt', sync_nrt=True)
+            from sc3.base.main import main
+            from sc3.base.clock import TempoClock
+            from sc3.base.stream import Routine
+
+            log = []
+            clock = TempoClock(2)
+
+            def rsys():
+                for _ in range(4):
+                    log.append(('sys', main.elapsed_time()))
+                    yield 0.5
+
+            def rtempo():
+                for _ in range(3):
+                    log.append(('tempo', clock.beats, main.elapsed_time()))
+                    yield 1
+
+            Routine(rsys).play()
+            Routine(rtempo).play(clock)
+            print(log)
+            main.run_until(1.0)
+            print(log, main.elapsed_time())
+            main.run_all()
+            print(log[6:], main.elapsed_time())
+        ''')
+        self.assertEqual(out, [
+            "[]",
+            "[('sys', 0.0), ('tempo', 0.0, 0.0), ('sys', 0.5), "
+            "('tempo', 1.0, 0.5), ('sys', 1.0), ('tempo', 2.0, 1.0)] 1.0",
+            "[('sys', 1.5)] 2.0"])
+
+    def test_threaded_nrt_error(self):
+        out = self.run_script('''
+            import sc3
+            sc3.init('nrt')
+            from sc3.base.main import main
+            try:
+                main.run_all()
+            except RuntimeError:
+                print('error')
+        ''')
+        self.assertEqual(out, ['error'])
+
+    def test_sync_many(self):
+        out = self.run_script('''
+            import asyncio
+            import sc3
+            sc3.init('nrt', sync_nrt=True)
+            from sc3.base.main import main
+            from sc3.base.stream import Routine
+            from sc3.synth.server import s
+
+            def r():
+                yield 1
+                yield from s.sync_many([['/b_alloc', i, 1024] for i in range(3)])
+                asyncio.run(s.async_sync_many([['/b_alloc', 3, 1024]]))
+                yield from s.sync(elements=[['/b_alloc', 4, 1024]])
+
+            Routine(r).play()
+            main.run_all()
+            score = main._osc_interface._osc_score
+            score.finish()
+            for bndl in score._lst_score:
+                if bndl[1][0] == '/b_alloc':
+                    print(bndl[0], *(msg[1] for msg in bndl[1:]))
+        ''')
+        self.assertEqual(out, ['1.0 0 1 2', '1.0 3', '1.0 4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
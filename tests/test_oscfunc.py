@@ -1,14 +1,21 @@
 
 import unittest
+import asyncio
+import socket
+import threading
 import time
 
 import sc3
 from sc3.base.netaddr import NetAddr
 from sc3.base.responsedefs import OscFunc
+import sc3.base.responsedefs as rdf
+import sc3.base.netaddr as nad
+from sc3.base.stream import Routine
 
 sc3.init()
 
 from sc3.base.main import main
+import sc3.base._oscinterface as osci
 
 
 class OscFuncTestCase(unittest.TestCase):
@@ -38,6 +45,238 @@ class OscFuncTestCase(unittest.TestCase):
             self.assertTrue(r[1] >= prev_time, f'{r[1]} >= {prev_time}')
             prev_time = r[1]
 
+    def test_udp_batch_stats(self):
+        n = NetAddr("127.0.0.1", NetAddr.lang_port());
+        results = []
+        func = OscFunc(lambda msg, *_: results.append(msg[1]), '/batch')
+        before = main._osc_interface.stats()
+        for i in range(100):
+            n.send_msg('/batch', i)
+        sock = main._osc_interface.socket
+        sock.sendto(b'/batch\x00\x00,i\x00\x00', ('127.0.0.1', n.port))
+        sock.sendto(b'not osc', ('127.0.0.1', n.port))
+        time.sleep(0.1)
+        func.free()
+        after = main._osc_interface.stats()
+        self.assertEqual(results, list(range(100)))
+        self.assertEqual(after['received'] - before['received'], 102)
+        self.assertEqual(after['malformed'] - before['malformed'], 2)
+        self.assertEqual(after['dropped'], 0)
+
+    def test_recv_port(self):
+        port = NetAddr.lang_port() + 100
+        self.assertTrue(main.open_udp_port(port))
+        self.assertTrue(main.open_udp_port(port))
+        self.assertIn(port, main._osc_interface.ports)
+        main_results = []
+        port_results = []
+        any_results = []
+        o1 = OscFunc(
+            lambda msg, *_: main_results.append(msg[1]), '/port',
+            recv_port=NetAddr.lang_port())
+        o2 = OscFunc(
+            lambda msg, *_: port_results.append(msg[1]), '/port',
+            recv_port=port)
+        o3 = OscFunc(lambda msg, *_: any_results.append(msg[1]), '/port')
+        NetAddr("127.0.0.1", NetAddr.lang_port()).send_msg('/port', 1)
+        NetAddr("127.0.0.1", port).send_msg('/port', 2)
+        NetAddr("127.0.0.1", port).send_msg('/port', 3)
+        time.sleep(0.1)
+        for o in (o1, o2, o3):
+            o.free()
+        self.assertEqual(main_results, [1])
+        self.assertEqual(port_results, [2, 3])
+        self.assertEqual(sorted(any_results), [1, 2, 3])
+        self.assertEqual(main._osc_interface.stats(port)['received'], 2)
+        with self.assertRaises(ValueError):
+            main._osc_interface.stats(port + 1)
+
+    def test_matching(self):
+        n = NetAddr("127.0.0.1", NetAddr.lang_port());
+        results = []
+
+        def make_func(name):
+            return lambda msg, *_: results.append((name, msg[0]))
+
+        paths = ['/mt/a/freq', '/mt/b/freq', '/mt/a/amp', '/mt/abc']
+        funcs = [OscFunc.matching(make_func(p), p) for p in paths]
+        for pattern in ['/mt/*/freq', '/mt/a/*', '/mt/a', '/mt/{a,b}/freq',
+                        '/mt/[ab]bc', '/mt/*/freq']:
+            n.send_msg(pattern)
+        time.sleep(0.1)
+        funcs[1].free()
+        n.send_msg('/mt/*/freq')
+        time.sleep(0.1)
+        funcs.append(OscFunc.matching(make_func('/mt/c/freq'), '/mt/c/freq'))
+        n.send_msg('/mt/*/freq')
+        time.sleep(0.1)
+        for f in funcs:
+            f.free()
+        self.assertEqual(sorted(results), sorted([
+            ('/mt/a/freq', '/mt/*/freq'), ('/mt/b/freq', '/mt/*/freq'),
+            ('/mt/a/freq', '/mt/a/*'), ('/mt/a/amp', '/mt/a/*'),
+            ('/mt/a/freq', '/mt/{a,b}/freq'), ('/mt/b/freq', '/mt/{a,b}/freq'),
+            ('/mt/abc', '/mt/[ab]bc'),
+            ('/mt/a/freq', '/mt/*/freq'), ('/mt/b/freq', '/mt/*/freq'),
+            ('/mt/a/freq', '/mt/*/freq'),
+            ('/mt/a/freq', '/mt/*/freq'), ('/mt/c/freq', '/mt/*/freq')]))
+
+    def test_reply_correlator(self):
+        n = NetAddr("127.0.0.1", NetAddr.lang_port());
+        correlator = rdf._reply_correlator('/rc_set', n, 2)
+        self.assertIs(correlator, rdf._reply_correlator('/rc_set', n, 2))
+        results = []
+        timeouts = []
+
+        def make_func(i):
+            return lambda msg: results.append((i, msg[3]))
+
+        for i in range(4):
+            correlator.request((1, i), make_func(i))
+        correlator.request((1, 0), make_func(4))  # Same key, in order.
+        correlator.request(
+            (2, 0), make_func(5), 0.05, lambda: timeouts.append(5))
+        self.assertTrue(correlator.request((3, 0), make_func(6)).cancel())
+        self.assertEqual(len(correlator), 6)
+        for i in reversed(range(4)):
+            n.send_msg('/rc_set', 1, i, i * 10)
+        n.send_msg('/rc_set', 1, 0, 40)
+        n.send_msg('/rc_set', 3, 0, 60)  # Cancelled.
+        n.send_msg('/rc_set', 9, 0, 90)  # Not requested.
+        time.sleep(0.2)
+        n.send_msg('/rc_set', 2, 0, 50)  # Timed out.
+        time.sleep(0.1)
+        self.assertEqual(
+            results, [(3, 30), (2, 20), (1, 10), (0, 0), (4, 40)])
+        self.assertEqual(timeouts, [5])
+        self.assertEqual(len(correlator), 0)
+
+        async def query():
+            future = correlator.future((4, 0))
+            n.send_msg('/rc_set', 4, 0, 1.5)
+            return await asyncio.wait_for(future, 1)
+
+        loop = asyncio.new_event_loop()
+        msg = loop.run_until_complete(query())
+        loop.close()
+        self.assertEqual(msg, ['/rc_set', 4, 0, 1.5])
+
+    def test_sync_manager(self):
+        # /sync is echoed back as /synced from the same address, the
+        # reply to the first one is lost.
+        n = NetAddr("127.0.0.1", NetAddr.lang_port());
+        manager = nad._sync_manager(n)
+        self.assertIs(manager, nad._sync_manager(NetAddr(*n._target)))
+        ids = []
+
+        def reply(msg, *_):
+            ids.append(msg[1])
+            if len(ids) > 1:
+                n.send_msg('/synced', msg[1])
+
+        resp = OscFunc(reply, '/sync')
+        done = []
+
+        def make_routine(i):
+            def routine():
+                yield from n.sync()
+                done.append(i)
+            return routine
+
+        for i in range(10):
+            Routine(make_routine(i)).play()
+        time.sleep(0.2)
+        self.assertEqual(sorted(done), list(range(10)))
+        self.assertEqual(len(ids), 10)
+        self.assertEqual(len(manager), 0)
+
+        # Barrier, all clumps are sent before waiting.
+        del ids[:]
+        elements = [['/sync_noop', i] for i in range(5000)]
+        nclumps = len(n._sync_clumps(elements))
+        self.assertGreater(nclumps, 1)
+
+        def routine():
+            yield from n.sync_many(elements)
+            done.append(len(ids))
+
+        Routine(routine).play()
+        time.sleep(0.2)
+        resp.free()
+        self.assertEqual(done[-1], nclumps)
+        self.assertEqual(len(manager), 0)
+
+        # Equal addrs share the manager but /sync goes by the caller's path.
+        m = NetAddr(*n._target)
+        sent = []
+        m.send_bundle = lambda *args: sent.append(args)
+
+        def routine():
+            yield from m.sync()
+            done.append('m')
+
+        Routine(routine).play()
+        time.sleep(0.1)
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(sent[0][-1][0], '/sync')
+        manager._recv(['/synced', sent[0][-1][1]])
+        time.sleep(0.1)
+        self.assertEqual(done[-1], 'm')
+        self.assertEqual(len(manager), 0)
+
+    def test_tcp_dispatcher_threads(self):
+        # Replies are dispatched by main's interface, TCP interfaces
+        # don't leave dispatcher threads behind.
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        conns = []
+        accept_thread = threading.Thread(
+            target=lambda: [conns.append(server.accept()[0]) for _ in range(5)],
+            daemon=True)
+        accept_thread.start()
+
+        def count():
+            return sum(
+                t.name == '_OscDispatcher' for t in threading.enumerate())
+
+        before = count()
+        n = NetAddr('127.0.0.1', server.getsockname()[1])
+        try:
+            for i in range(5):
+                connected = threading.Event()
+                n.connect(lambda *_: connected.set(), local_port=57400 + i * 10)
+                self.assertTrue(connected.wait(2))
+                n.disconnect()
+            time.sleep(0.1)
+            self.assertEqual(count(), before)
+        finally:
+            accept_thread.join(1)
+            for conn in conns:
+                conn.close()
+            server.close()
+
+    def test_dispatch(self):
+        n = NetAddr("127.0.0.1", NetAddr.lang_port());
+        results = []
+
+        def fail(*_):
+            raise Exception('test error, ignore')
+
+        def func(msg, time, *_):
+            results.append((msg[1], time, main.main_tt._m_seconds))
+
+        main.add_osc_recv_func(fail)
+        o = OscFunc(func, '/dispatch')
+        for i in range(10):
+            n.send_msg('/dispatch', i)
+        time.sleep(0.1)
+        main.remove_osc_recv_func(fail)
+        o.free()
+        self.assertEqual([r[0] for r in results], list(range(10)))
+        for _, recv_time, logical_time in results:
+            self.assertEqual(recv_time, logical_time)
+
     def test_bndl_msg_recv_time(self):
         n = NetAddr("127.0.0.1", 57120);
 
@@ -57,5 +296,76 @@ class OscFuncTestCase(unittest.TestCase):
         # o.free;
 
 
+class AsyncioInterfaceTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+
+    def test_udp(self):
+        interface = osci.OscAsyncioUdpInterface(57300, 10, self.loop)
+        results = []
+        ports = []
+
+        def func(msg, time, addr, recv_port):
+            results.append(msg[1])
+            ports.append(recv_port)
+
+        interface.add_recv_func(func)
+        interface.start()
+        target = ('127.0.0.1', interface.port)
+        for i in range(100):  # Sent before the endpoint is created.
+            interface.send_msg(target, '/async', i)
+        self.assertTrue(interface.open_udp_port(57305))
+        interface.send_msg(('127.0.0.1', 57305), '/async', 100)
+        time.sleep(0.1)
+        sock = interface.socket
+        interface.stop()
+        time.sleep(0.1)
+        self.assertEqual(sorted(results), list(range(101)))
+        self.assertEqual(interface.stats()['received'], 100)
+        self.assertEqual(interface.stats(57305)['received'], 1)
+        self.assertEqual(ports[results.index(100)], 57305)
+        self.assertEqual(ports.count(interface.port), 100)
+        self.assertFalse(interface.running())
+        self.assertEqual(sock.fileno(), -1)
+
+    def test_tcp(self):
+        # Echo server, replies are received by main's interface.
+        async def echo(reader, writer):
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                writer.write(data)
+            writer.close()
+
+        server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(echo, '127.0.0.1', 0), self.loop).result()
+        port = server.sockets[0].getsockname()[1]
+        results = []
+        func = lambda msg, *_: results.append(msg[1])
+        main.add_osc_recv_func(func)
+        interface = osci.OscAsyncioTcpInterface(57310, 10, self.loop)
+        interface.bind()
+        interface.connect(('127.0.0.1', port))
+        self.assertTrue(interface.is_connected)
+        for i in range(10):
+            interface.send_msg(None, '/tcp_async', i)
+        time.sleep(0.1)
+        interface.disconnect()
+        server.close()
+        main.remove_osc_recv_func(func)
+        self.assertEqual(results, list(range(10)))
+        self.assertFalse(interface.is_connected)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,167 @@
+
+import unittest
+import struct
+import socket
+import threading
+import time
+
+from sc3.base import _osclib as oli
+
+
+class OscMessageBuilderTestCase(unittest.TestCase):
+    def build(self, address, *args):
+        builder = oli.OscMessageBuilder(address)
+        for arg in args:
+            builder.add_arg(arg)
+        return builder.build()
+
+    def test_dgram(self):
+        msg = self.build(
+            '/b_setn', 1, 0, 3, 0.5, 0.25, -1.0, 'abcd', b'\x01\x02',
+            True, None, 2)
+        expected = (
+            oli.write_string('/b_setn') + oli.write_string(',iiifffsbTNi') +
+            struct.pack('>3i3f', 1, 0, 3, 0.5, 0.25, -1.0) +
+            oli.write_string('abcd') + oli.write_blob(b'\x01\x02') +
+            struct.pack('>i', 2))
+        self.assertEqual(msg.dgram, expected)
+        self.assertEqual(msg.size, len(expected))
+
+    def test_parse_built(self):
+        args = [1, 2.5, 'x', True, False, b'abc', [1, 'y']]
+        msg = self.build('/msg', *args)
+        self.assertEqual(msg.address, '/msg')
+        self.assertEqual(msg.params, oli.OscMessage(msg.dgram).params)
+        self.assertEqual(msg.params, args)
+
+    def test_no_args(self):
+        msg = self.build('/status')
+        self.assertEqual(msg.dgram, b'/status\x00,\x00\x00\x00')
+        self.assertEqual(msg.params, [])
+
+    def test_errors(self):
+        self.assertRaises(oli.OscMessageBuildError, self.build, '')
+        self.assertRaises(oli.OscMessageBuildError, self.build, '/m', b'')
+        self.assertRaises(oli.OscMessageBuildError, self.build, '/m', 2 ** 40)
+        builder = oli.OscMessageBuilder('/m')
+        builder.add_arg(1.5, builder.ARG_TYPE_INT)
+        self.assertRaises(oli.OscMessageBuildError, builder.build)
+
+    def test_bundle(self):
+        msg1 = self.build('/a', 1)
+        msg2 = self.build('/b', 2.0)
+        builder = oli.OscBundleBuilder(oli.IMMEDIATELY)
+        builder.add_content(msg1)
+        builder.add_content(msg2)
+        bndl = builder.build()
+        self.assertEqual(bndl.num_contents, 2)
+        self.assertEqual(
+            [(m.address, m.params) for m in bndl],
+            [('/a', [1]), ('/b', [2.0])])
+        self.assertEqual(oli.OscBundle(bndl.dgram).timetag, bndl.timetag)
+
+
+class OscMessageDecodeTestCase(unittest.TestCase):
+    def dgram(self, type_tag, data):
+        return (
+            oli.write_string('/msg') + oli.write_string(',' + type_tag) + data)
+
+    def test_float_run(self):
+        values = [float(i) for i in range(1600)]
+        data = struct.pack('>3i1600f', 1, 0, 1600, *values)
+        msg = oli.OscMessage(self.dgram('iii' + 'f' * 1600, data))
+        self.assertEqual(msg.params, [1, 0, 1600, *values])
+
+    def test_types(self):
+        data = (
+            struct.pack('>idQ', -3, 0.1, 7) + oli.write_string('abc') +
+            oli.write_blob(b'xyzzy') + struct.pack('>If', 0xff, 0.5) +
+            oli.write_midi((1, 2, 3, 4)))
+        msg = oli.OscMessage(self.dgram('idtsb[T[rF]f]m', data))
+        self.assertEqual(msg.params, [
+            -3, 0.1, 7, 'abc', b'xyzzy', [True, [0xff, False], 0.5],
+            (1, 2, 3, 4)])
+
+    def test_short_float(self):
+        # Missing padding of the last float is accepted.
+        data = struct.pack('>if', 1, 0.5)
+        msg = oli.OscMessage(self.dgram('if', data[:-1]))
+        self.assertEqual(msg.params, [1, 0.5])
+        self.assertRaises(
+            oli.OscMessageParseError, oli.OscMessage,
+            self.dgram('if', data[:-4]))
+
+    def test_errors(self):
+        self.assertRaises(
+            oli.OscMessageParseError, oli.OscMessage,
+            self.dgram('i]', struct.pack('>i', 1)))
+        self.assertRaises(
+            oli.OscMessageParseError, oli.OscMessage,
+            self.dgram('[i', struct.pack('>i', 1)))
+        self.assertRaises(
+            oli.OscMessageParseError, oli.OscMessage,
+            self.dgram('s', b'abcd'))
+
+
+class OscMessageTemplateTestCase(unittest.TestCase):
+    def test_build(self):
+        args = ['default', 1001, 0, 1, 'freq', 440.0, 'amp', 0.1, 'out', 0]
+        builder = oli.OscMessageBuilder('/s_new')
+        for arg in args:
+            builder.add_arg(arg)
+        template = oli.OscMessageTemplate('/s_new', 'siiisfsfsi')
+        self.assertEqual(template.build(*args).dgram, builder.build().dgram)
+        template = oli.OscMessageTemplate('/n_set', 'ifd')
+        msg = template.build(1000, 0.5, 0.25)
+        self.assertEqual(msg.params, [1000, 0.5, 0.25])
+
+    def test_errors(self):
+        self.assertRaises(ValueError, oli.OscMessageTemplate, '/m', 'ib')
+        template = oli.OscMessageTemplate('/m', 'is')
+        self.assertRaises(oli.OscMessageBuildError, template.build, 1)
+        self.assertRaises(oli.OscMessageBuildError, template.build, 1, 2)
+        self.assertRaises(oli.OscMessageBuildError, template.build, 'a', 'b')
+
+
+class OscStreamReaderTestCase(unittest.TestCase):
+    def test_feed(self):
+        msgs = [oli.write_string(f'/m{i}') + b',\x00\x00\x00' for i in range(3)]
+        msgs.append(oli.write_string('/b_setn') + b'\x00' * 5000)
+        stream = b''.join(len(m).to_bytes(4, 'big') + m for m in msgs)
+        for chunk_size in (1, 3, 7, 4096, len(stream)):
+            reader = oli.OscStreamReader()
+            packets = []
+            for i in range(0, len(stream), chunk_size):
+                packets.extend(reader.feed(stream[i:i + chunk_size]))
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(packets, msgs)
+        reader = oli.OscStreamReader()
+        self.assertRaises(
+            oli.OscParseError, reader.feed, (-1).to_bytes(4, 'big', signed=True))
+
+
+class OSCUDPServerTestCase(unittest.TestCase):
+    def test_max_batch(self):
+        batches = []
+        server = oli.OSCUDPServer(
+            ('127.0.0.1', 0), lambda batch, port: batches.append(len(batch)))
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        msg = oli.OscMessageBuilder('/m').build().dgram
+        try:
+            for _ in range(200):  # Pending before the first select.
+                sock.sendto(msg, ('127.0.0.1', server._port))
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            time.sleep(0.1)
+            server.shutdown()
+            thread.join()
+        finally:
+            sock.close()
+            server.server_close()
+        self.assertEqual(sum(batches), 200)
+        self.assertLessEqual(max(batches), server.MAX_BATCH)
+        self.assertEqual(server.stats()['received'], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+
+import unittest
+
+import sys
+import subprocess
+import textwrap
+
+
+class SharedClockThreadTestCase(unittest.TestCase):
+    # The library can be initialized once per process.
+
+    def run_script(self, script):
+        proc = subprocess.run(
+            [sys.executable, '-c', textwrap.dedent(script)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, timeout=60)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertNotIn('Traceback', proc.stderr)
+        return proc.stdout.splitlines()
+
+    def test_clocks(self):
+        out = self.run_script('''
+            import threading
+            import time
+            import sc3
+            sc3.init(shared_clock_thread=True)
+            from sc3.base.clock import SystemClock, TempoClock, ClockNotRunning
+            from sc3.base.stream import Routine
+
+            counts = {'sys': 0, 'a': 0, 'b': 0}
+            done = {name: threading.Event() for name in counts}
+
+            def make_routine(name, n, dur):
+                def routine():
+                    for _ in range(n):
+                        counts[name] += 1
+                        yield dur
+                    done[name].set()
+                return routine
+
+            a = TempoClock(10)
+            b = TempoClock(10)
+            Routine(make_routine('sys', 10, 0.02)).play(SystemClock)
+            Routine(make_routine('a', 10, 1)).play(a)
+            Routine(make_routine('b', 5, 1)).play(b)
+            time.sleep(0.1)
+            b.tempo = 5  # Re-adds b to the dispatcher's queue, later.
+            a.tempo = 20
+            for event in done.values():
+                print(event.wait(5))
+            print(counts)
+            print(sum(t.name.startswith('TempoClock') for t in threading.enumerate()))
+
+            # clear and stop.
+            a.sched(100, lambda: print('cleared'))
+            a.clear()
+            b.stop()
+            try:
+                b.sched(0, lambda: print('stopped'))
+            except ClockNotRunning:
+                print('not running')
+            ran = threading.Event()
+            a.sched(1, lambda: ran.set())
+            SystemClock.sched(0.01, lambda: print('system'))
+            print(ran.wait(1))
+            time.sleep(0.1)
+        ''')
+        self.assertEqual(out[:3], ['True'] * 3)
+        self.assertEqual(out[3], "{'sys': 10, 'a': 10, 'b': 5}")
+        self.assertEqual(out[4], '0')  # No clock threads.
+        self.assertEqual(out[5:], ['not running', 'system', 'True'])
+
+    def test_tempo_change(self):
+        # Tempo changes re-add clocks to the dispatcher's queue while
+        # other deadlines are due.
+        out = self.run_script('''
+            import random
+            import time
+            import sc3
+            sc3.init(shared_clock_thread=True)
+            from sc3.base.clock import TempoClock
+
+            counts = [0] * 4
+
+            def make_task(i):
+                def task():
+                    counts[i] += 1
+                    return 0.01
+                return task
+
+            clocks = [TempoClock(1) for _ in counts]
+            for i, clock in enumerate(clocks):
+                clock.sched(i * 0.0025, make_task(i))
+            for _ in range(50):
+                time.sleep(0.005)
+                random.choice(clocks).tempo = random.uniform(0.5, 2)
+            before = list(counts)
+            time.sleep(0.1)
+            print(all(n > m for n, m in zip(counts, before)))
+        ''')
+        self.assertEqual(out, ['True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
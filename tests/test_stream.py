@@ -1,8 +1,11 @@
 
 import unittest
+import time
 
 import sc3
-from sc3.base.stream import routine, StopStream, AlwaysYield, YieldAndReset
+from sc3.base.stream import (
+    routine, Routine, LightRoutine, StopStream, AlwaysYield, YieldAndReset)
+from sc3.base.clock import TempoClock
 
 sc3.init()
 
@@ -105,5 +108,64 @@ class RoutineTestCase(unittest.TestCase):
     # TODO ...
 
 
+class LightRoutineTestCase(unittest.TestCase):
+    def test_states(self):
+        def gen(inval):
+            for i in range(2):
+                inval = yield inval
+            raise YieldAndReset('reset')
+
+        for cls in (Routine, LightRoutine):
+            rout = cls(gen)
+            states = []
+            values = []
+            for i in range(4):
+                values.append(next(rout))
+                states.append(rout.state)
+            rout.stop()
+            states.append(rout.state)
+            self.assertRaises(StopStream, next, rout)
+            rout.reset()
+            values.append(rout.next(10))
+            with self.subTest(cls=cls):
+                self.assertEqual(values, [None, None, 'reset', None, 10])
+                self.assertEqual(states, [
+                    rout.State.Suspended, rout.State.Suspended,
+                    rout.State.Init, rout.State.Suspended, rout.State.Done])
+
+    def test_common_function(self):
+        def func():
+            pass
+
+        def always():
+            raise AlwaysYield(123)
+
+        rout = LightRoutine(func)
+        self.assertIs(next(rout), None)
+        self.assertEqual(rout.state, rout.State.Done)
+        self.assertIs(next(rout), None)
+        rout = LightRoutine(always)
+        self.assertEqual([next(rout) for _ in range(2)], [123, 123])
+        self.assertRaises(TypeError, LightRoutine, 1)
+
+    def test_play(self):
+        clock = TempoClock(100)
+        log = []
+
+        def func():
+            for i in range(3):
+                log.append(i)
+                yield 1
+
+        routs = [LightRoutine(func) for _ in range(3)]
+        for rout in routs:
+            rout.play(clock)
+        time.sleep(0.1)
+        clock.stop()
+        self.assertEqual(sorted(log), [0, 0, 0, 1, 1, 1, 2, 2, 2])
+        for rout in routs:
+            self.assertEqual(rout.state, rout.State.Done)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+
+import unittest
+
+import random
+
+from sc3.base._taskq import TaskQueue, TimingWheel
+
+
+class TaskQueueTestCase(unittest.TestCase):
+    def test_order(self):
+        q = TaskQueue()
+        for i, prio in enumerate([3, 1, 2, 1, 0]):
+            q.add(prio, f'task{i}')
+        self.assertEqual(len(q), 5)
+        self.assertEqual(q.peek(), (0, 'task4'))
+        self.assertEqual(q.peek(False), (3, 'task0'))
+        # Same prio entries keep insertion order.
+        res = [q.pop() for _ in range(5)]
+        self.assertEqual(res, [
+            (0, 'task4'), (1, 'task1'), (1, 'task3'), (2, 'task2'),
+            (3, 'task0')])
+        self.assertTrue(q.empty())
+        self.assertRaises(KeyError, q.pop)
+        self.assertRaises(KeyError, q.peek)
+
+    def test_remove(self):
+        q = TaskQueue()
+        q.add(1, 'a')
+        q.add(2, 'b')
+        q.add(3, 'c')
+        q.remove('a')
+        self.assertEqual(q.peek(), (2, 'b'))  # Root is always valid.
+        q.remove('c')
+        self.assertEqual(q.peek(False), (2, 'b'))
+        q.remove('x')  # Not found.
+        q.add(0, 'b')  # Update prio.
+        self.assertEqual(list(q), [(0, 'b')])
+        q.remove('b')
+        self.assertTrue(q.empty())
+        self.assertRaises(KeyError, q.peek)
+
+    def test_compaction(self):
+        q = TaskQueue()
+        n = 1000
+        for i in range(n):
+            q.add(i, i)
+        for i in range(n):
+            if i % 4:
+                q.remove(i)
+        self.assertEqual(len(q), n // 4)
+        self.assertLess(len(q._queue), n // 2)
+        self.assertEqual([t for _, t in q], list(range(0, n, 4)))
+
+    def test_pop_due(self):
+        q = TaskQueue()
+        for i in range(10):
+            q.add(i * 0.5, i)
+        q.remove(1)
+        self.assertEqual(q.pop_due(2), [(0, 0), (1.0, 2), (1.5, 3), (2.0, 4)])
+        self.assertEqual(q.peek(), (2.5, 5))
+        self.assertEqual(q.pop_due(-1), [])
+        self.assertEqual(len(q.pop_due(float('inf'))), 5)
+        self.assertTrue(q.empty())
+
+    def test_pop_due_removed_root(self):
+        # A removed entry left at the root by pop_due is discarded.
+        q = TaskQueue()
+        q.add(1, 'a')
+        q.add(2, 'b')
+        q.add(3, 'c')
+        q.remove('b')
+        self.assertEqual(q.pop_due(1.5), [(1, 'a')])
+        self.assertEqual(q.peek(), (3, 'c'))
+        self.assertEqual(q.pop(), (3, 'c'))
+        self.assertTrue(q.empty())
+
+
+class TimingWheelTestCase(unittest.TestCase):
+    def test_order(self):
+        q = TimingWheel(0.01)
+        for i, prio in enumerate([0.031, 0.001, 0.002, 0.001, 0.0]):
+            q.add(prio, f'task{i}')
+        self.assertEqual(q.peek(), (0.0, 'task4'))
+        self.assertEqual(q.peek(False), (0.031, 'task0'))
+        q.add(0.0015, 'task5')  # Within the current sorted slot.
+        res = [q.pop()[1] for _ in range(6)]
+        self.assertEqual(
+            res, ['task4', 'task1', 'task3', 'task5', 'task2', 'task0'])
+        self.assertTrue(q.empty())
+        self.assertRaises(KeyError, q.pop)
+        self.assertRaises(KeyError, q.peek)
+
+    def test_same_as_heap(self):
+        rgen = random.Random(1)
+        q1 = TaskQueue()
+        q2 = TimingWheel(0.05)
+        for i in range(2000):
+            prio = round(rgen.uniform(-1, 10), 2)
+            q1.add(prio, i)
+            q2.add(prio, i)
+        for i in range(0, 2000, 3):
+            q1.remove(i)
+            q2.remove(i)
+        self.assertEqual(len(q1), len(q2))
+        self.assertEqual(list(q1), list(q2))
+        while not q1.empty():
+            prio, task = q1.pop()
+            self.assertEqual(q2.peek(), (prio, task))
+            self.assertEqual(q2.pop(), (prio, task))
+            if task < 10000 and task % 5 == 0:
+                q1.add(prio + 0.5, task + 10000)
+                q2.add(prio + 0.5, task + 10000)
+        self.assertTrue(q2.empty())
+
+    def test_pop_due(self):
+        q = TimingWheel(1)
+        for i in range(10):
+            q.add(i * 0.5, i)
+        q.remove(1)
+        self.assertEqual(q.pop_due(2), [(0, 0), (1.0, 2), (1.5, 3), (2.0, 4)])
+        self.assertEqual(q.peek(), (2.5, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+import sys
+import subprocess
+import textwrap
+
+
+class TimingWheelClockTestCase(unittest.TestCase):
+    # The library can be initialized once per process. Clocks run with a
+    # TimingWheel must run tasks in the same order as with the heap.
+
+    def run_script(self, script):
+        proc = subprocess.run(
+            [sys.executable, '-c', textwrap.dedent(script)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, timeout=60)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertNotIn('Traceback', proc.stderr)
+        return proc.stdout.splitlines()
+
+    def run_clocks(self, init, rt=True):
+        return self.run_script(f'''
+            import contextlib
+            import threading
+            import sc3
+            sc3.init({init})
+            from sc3.base.main import main
+            from sc3.base.clock import SystemClock, TempoClock
+            from sc3.base.stream import Routine
+
+            clock = TempoClock(100)
+            log = []
+            done = threading.Semaphore(0)
+            # Same slot, same beat and across slots at resolution 0.01.
+            durs = {{
+                'a': 0.5, 'b': 0.25, 'c': 1, 'd': 0.007, 'e': 0.25, 'f': 0.004}}
+
+            def make_routine(name, dur):
+                def routine():
+                    for _ in range(6):
+                        log.append(f'{{clock.beats - start:.3f}} {{name}}')
+                        yield dur
+                    done.release()
+                return routine
+
+            def system_routine():
+                for i in range(6):
+                    yield 0.003
+                log.append(f'system {{i + 1}}')
+                done.release()
+
+            if {rt}:
+                queues = (SystemClock._task_queue, clock._task_queue)
+                print(*(type(q).__name__ for q in queues))
+            else:
+                print(type(main._clock_scheduler.queue).__name__)
+            start = round(clock.beats) + 1
+            lock = clock._sched_cond if {rt} else contextlib.nullcontext()
+            with lock:
+                for name, dur in durs.items():
+                    clock.sched_abs(start, Routine(make_routine(name, dur)))
+            if not {rt}:
+                main.run_all()
+            for _ in durs:
+                done.acquire()
+            Routine(system_routine).play(SystemClock)
+            if not {rt}:
+                main.run_all()
+            done.acquire()
+            clock.stop()
+            print(*log, sep='\\n')
+        ''')
+
+    def test_rt(self):
+        heap = self.run_clocks('')
+        wheel = self.run_clocks('timing_wheel=0.01')
+        self.assertEqual(heap[0], 'TaskQueue TaskQueue')
+        self.assertEqual(wheel[0], 'TimingWheel TimingWheel')
+        self.assertEqual(len(wheel), 38)
+        self.assertEqual(wheel[-1], 'system 6')
+        self.assertEqual(wheel[1:], heap[1:])
+
+    def test_nrt(self):
+        heap = self.run_clocks("'nrt', sync_nrt=True", False)
+        wheel = self.run_clocks(
+            "'nrt', sync_nrt=True, timing_wheel=0.01", False)
+        self.assertEqual(heap[0], 'TaskQueue')
+        self.assertEqual(wheel[0], 'TimingWheel')
+        self.assertEqual(len(wheel), 38)
+        self.assertEqual(wheel[-1], 'system 6')
+        self.assertEqual(wheel[1:], heap[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()